@@ -0,0 +1,216 @@
+# Created on 18 Oct 2026
+# This file measures the solver by playing many seeded games without a window
+
+"""
+Plays seeded games of mines with the solver across a pool of processes and reports how it did
+
+For every configuration of size and mines the same N seeds are played, so runs of different versions
+of the solver play the same boards. The report holds the win rate, games per second, moves per game and
+the p50 / p95 / p99 latency of Solver.solve_next_step and Solver.best_click. It is printed as a table or
+as json with --json.
+
+A move is one call to solve_next_step that changed the board or one guess.
+
+With --stats every solver records its work with Solver.enable_stats and the report adds the total
+counters and the seconds spent in each analysis stage for every configuration.
+
+Constants:
+    * bench.DEFAULT_CONFIGS
+
+Public objects:
+    * Function bench.play
+    * Function bench.run
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+import game
+import patterns
+import solver
+
+DEFAULT_CONFIGS = ((8, 10), (16, 40), (25, 99))
+
+# pattern table of the worker process. loaded once and shared by every game the process plays
+_pattern_table: patterns.PatternTable = None
+
+
+# loads the pattern table of a worker process
+def _init_worker(pattern_path: str):
+    global _pattern_table
+    if pattern_path is None:
+        _pattern_table = patterns.PatternTable()
+    else:
+        _pattern_table = patterns.PatternTable.load(pattern_path)
+
+
+# plays one seeded game with the solver the way Solver.solve does
+# returns whether it was won, the number of moves and guesses, and the latency of every solver call in seconds
+# also returns the solver stats if stats is true
+def play(size: int, mines: int, seed: int, pattern_table: patterns.PatternTable = None, stats: bool = False) -> dict:
+    g = game.Game()
+    g.set_size(size)
+    g.set_mines(mines)
+    g.set_seed(seed)
+    g.begin()
+
+    analysis = solver.Solver(g, pattern_table)
+    if stats:
+        analysis.enable_stats()
+
+    next_step_times: [float] = []
+    best_click_times: [float] = []
+    moves = 0
+    guesses = 0
+    while not g.game_done():
+        start = time.perf_counter()
+        success = analysis.solve_next_step(g)
+        next_step_times.append(time.perf_counter() - start)
+
+        if success:
+            moves += 1
+            continue
+
+        start = time.perf_counter()
+        try:
+            x, y, left_click = analysis.best_click(g)
+        except solver.AnalysisError:
+            x, y = analysis.random_tile()
+            left_click = True
+        best_click_times.append(time.perf_counter() - start)
+
+        if left_click:
+            g.left_mouse_button(x, y)
+        else:
+            g.right_mouse_button(x, y)
+        moves += 1
+        guesses += 1
+
+    return {"won": g.victory(), "moves": moves, "guesses": guesses,
+            "solve_next_step": next_step_times, "best_click": best_click_times, "stats": analysis.stats()}
+
+
+# plays a game in a worker process
+def _play_task(task: (int, int, int, bool)) -> dict:
+    size, mines, seed, stats = task
+    return play(size, mines, seed, _pattern_table, stats)
+
+
+# returns the p50, p95 and p99 of the given seconds in milliseconds, using the nearest rank
+def _percentiles(times: [float]) -> dict:
+    result = {"count": len(times), "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    if len(times) == 0:
+        return result
+
+    ordered = sorted(times)
+    for percentile in (50, 95, 99):
+        result["p" + str(percentile)] = ordered[int(percentile / 100 * (len(ordered) - 1))] * 1000
+
+    return result
+
+
+# returns the solver stats of many games added together
+def _total_stats(all_stats: [dict]) -> dict:
+    total = {}
+    for stats in all_stats:
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                stage_totals = total.setdefault(key, {})
+                for stage, amount in value.items():
+                    stage_totals[stage] = stage_totals.get(stage, 0) + amount
+            else:
+                total[key] = total.get(key, 0) + value
+
+    return total
+
+
+# plays games seeds seed to seed + games - 1 for every (size, mines) configuration across a pool of processes
+# returns the report as a json compatible dict
+# the solver stats of every configuration are added if stats is true
+def run(configs: [(int, int)] = DEFAULT_CONFIGS, games: int = 100, seed: int = 0, processes: int = None,
+        pattern_path: str = patterns.DEFAULT_PATH, stats: bool = False) -> dict:
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    report = {"games": games, "seed": seed, "processes": processes, "configs": []}
+
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(pattern_path,)) as pool:
+        for size, mines in configs:
+            tasks = [(size, mines, seed + k, stats) for k in range(games)]
+
+            start = time.perf_counter()
+            results = pool.map(_play_task, tasks, chunksize=max(1, games // (processes * 4)))
+            seconds = time.perf_counter() - start
+
+            wins = sum(result["won"] for result in results)
+            report["configs"].append({
+                "size": size,
+                "mines": mines,
+                "games": games,
+                "wins": wins,
+                "win_rate": wins / games,
+                "seconds": seconds,
+                "games_per_second": games / seconds,
+                "moves_per_game": sum(result["moves"] for result in results) / games,
+                "guesses_per_game": sum(result["guesses"] for result in results) / games,
+                "solve_next_step_ms": _percentiles([t for result in results for t in result["solve_next_step"]]),
+                "best_click_ms": _percentiles([t for result in results for t in result["best_click"]]),
+            })
+
+            if stats:
+                report["configs"][-1]["stats"] = _total_stats([result["stats"] for result in results])
+
+    return report
+
+
+# prints a report as a table
+def _print_report(report: dict):
+    print("games: " + str(report["games"]) + ", seeds from " + str(report["seed"]) + ", processes: "
+          + str(report["processes"]))
+    print(f"{'board':>12} {'win rate':>9} {'games/s':>9} {'moves':>7} {'guesses':>8}"
+          f" {'next step p50/p95/p99 ms':>26} {'best click p50/p95/p99 ms':>26}")
+
+    for config in report["configs"]:
+        board = str(config["size"]) + "x" + str(config["size"]) + "/" + str(config["mines"])
+        next_step = config["solve_next_step_ms"]
+        best_click = config["best_click_ms"]
+        print(f"{board:>12} {config['win_rate']:>9.1%} {config['games_per_second']:>9.1f}"
+              f" {config['moves_per_game']:>7.1f} {config['guesses_per_game']:>8.2f}"
+              f" {next_step['p50']:>8.2f} {next_step['p95']:>8.2f} {next_step['p99']:>8.2f}"
+              f" {best_click['p50']:>8.2f} {best_click['p95']:>8.2f} {best_click['p99']:>8.2f}")
+
+        if "stats" in config:
+            seconds = config["stats"]["seconds"]
+            total = sum(seconds.values())
+            print(f"{'':>12} time in stages: " + ", ".join(
+                stage + " " + f"{0 if total == 0 else amount / total:.0%}" for stage, amount in seconds.items()))
+
+
+# returns a (size, mines) configuration parsed from text of the form size,mines
+def _config(text: str) -> (int, int):
+    size, mines = text.split(",")
+    return int(size), int(mines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the solver on seeded games")
+    parser.add_argument("--games", type=int, default=100, help="games played for each configuration")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game of each configuration")
+    parser.add_argument("--config", type=_config, action="append",
+                        help="size,mines of a configuration to play. may be given more than once")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes. defaults to the cpu count")
+    parser.add_argument("--no-patterns", action="store_true",
+                        help="start every worker with an empty pattern table instead of the saved one")
+    parser.add_argument("--stats", action="store_true", help="add the counters and stage times of the solver")
+    parser.add_argument("--json", action="store_true", help="print the report as json")
+    args = parser.parse_args()
+
+    configs = args.config if args.config is not None else DEFAULT_CONFIGS
+    pattern_path = None if args.no_patterns else patterns.DEFAULT_PATH
+    result = run(configs, args.games, args.seed, args.processes, pattern_path, args.stats)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result)
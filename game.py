@@ -15,6 +15,7 @@ Exceptions:
     * game.TilePositionError
 """
 
+import array
 import random
 import tile
 from enum import Enum, auto
@@ -115,18 +116,38 @@ self.get_mines(self) -> int: returns the number of mines
 
 self.get_flags(self) -> int: returns the number of flags placed
 
+self.get_seed(self) -> int: returns the seed that places the mines or None
+
+self.get_layout(self) -> [(int, int)]: returns the positions the mines are placed at or None if they are placed at random
+
 self.set_mines(self, m: int): if game is not ongoing set the number of mines in the game
 
 self.set_size(self, s: int): if the game is not ongoing sets the size of the grid and calls self.reset()
 
+self.set_seed(self, seed: int): sets the seed that places the mines. None places them differently every game
+
+self.set_layout(self, positions: [(int, int)]): places the mines at the given positions instead. None goes back to random
+
 self.get_tile_value(self, x: int, y: int) -> int: returns the tile value at the given position if the tile is visible
 
 self.get_tile_state(self, x: int, y: int) -> tile.State: returns the state of a tile at a given position
 
+self.get_state_view(self) -> memoryview: returns a read-only view of every tile state code (tile.State.value)
+
+self.get_value_view(self) -> memoryview: returns a read-only view of every visible tile value (0 if not visible)
+
 self.left_mouse_button(self, x: int, y: int): reveals the tile at the given position
 
 self.right_mouse_button(self, x: int, y: int): cycles the state of a covered tile
+
+self.apply_moves(self, moves: [(int, int, bool)]): applies (x, y, left) clicks in order and checks for a win once
+
+self.chord(self, x: int, y: int): reveals the covered neighbours of a visible number once it has as many flags around it
     """
+    # methods that a movelog.Recorder replaces on the instance to record the clicks
+    # copies of a recorded game use the methods of the class and are not recorded
+    RECORDED_METHODS = ("left_mouse_button", "right_mouse_button", "apply_moves", "reset")
+
     def __init__(self, testing: bool = False):
         # state variable that keeps track of the game
         self._state = State.beforeStart
@@ -141,9 +162,18 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
         # true if board has been clicked once
         self._first_click = False
 
+        # seed of the random numbers that place the mines. None places them differently every game
+        self._seed: int = None
+
+        # positions of the mines if they are not placed randomly
+        self._layout: [(int, int)] = None
+
         # flag set to True if this game is used for testing
         self._testing = testing
 
+        # true while a batch of moves is applied. defers the win check to the end of the batch
+        self._batch = False
+
         # grid that will be used to store the game board
         self._grid: [[tile.Tile]] = []
         for i in range(self._size):
@@ -151,6 +181,22 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
             for j in range(self._size):
                 self._grid[i].append(tile.Tile())
 
+        # flat copies of the visible board indexed as x * size + y
+        self._gen_views()
+
+    # views cannot be copied or pickled so they are made again from the copied arrays
+    # the methods a movelog.Recorder replaces are not copied
+    def __getstate__(self):
+        state = {name: value for name, value in self.__dict__.items() if name not in Game.RECORDED_METHODS}
+        del state["_state_view"]
+        del state["_value_view"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._state_view = memoryview(self._state_codes).toreadonly()
+        self._value_view = memoryview(self._visible_values).toreadonly()
+
     # begin the game
     def begin(self):
         if self._mines > self._size * self._size - 9:
@@ -186,6 +232,14 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
     def get_flags(self) -> int:
         return self._flags
 
+    # returns the seed that places the mines or None
+    def get_seed(self) -> int:
+        return self._seed
+
+    # returns the positions the mines are placed at or None if they are placed at random
+    def get_layout(self) -> [(int, int)]:
+        return None if self._layout is None else list(self._layout)
+
     # sets the number of mines in the game if it is a valid game state
     def set_mines(self, m: int):
         if m <= 0:
@@ -194,6 +248,30 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
         if self._state is not State.ongoing:
             self._mines = m
 
+    # sets the seed that places the mines. the same seed, size, mines and first click give the same board
+    # None places the mines differently every game
+    def set_seed(self, seed: int):
+        self._seed = seed
+
+    # places the mines at the given positions instead of at random if it is a valid game state
+    # the first click is not protected from these mines. None goes back to placing them at random
+    # must be called after set_size
+    def set_layout(self, positions: [(int, int)]):
+        if self._state is State.ongoing:
+            return
+
+        if positions is None:
+            self._layout = None
+            return
+
+        positions = list(dict.fromkeys((x, y) for x, y in positions))
+        for x, y in positions:
+            if x < 0 or y < 0 or x >= self._size or y >= self._size:
+                raise TilePositionError("Mine position out of range", self._size, (x, y))
+
+        self.set_mines(len(positions))
+        self._layout = positions
+
     # sets the size of the board if it is a valid game state
     # updates the size of self._grid and calls self.reset()
     def set_size(self, s: int):
@@ -211,6 +289,7 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
                 for j in range(self._size):
                     self._grid[i].append(tile.Tile())
 
+            self._gen_views()
             self.reset()
 
     # returns the tile value at a given position if it is visible
@@ -230,6 +309,17 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
 
         return self._grid[x][y].state
 
+    # returns a read-only view of every tile state code indexed as x * size + y
+    # the view follows the game as it changes and is replaced when the size of the board changes
+    def get_state_view(self) -> memoryview:
+        return self._state_view
+
+    # returns a read-only view of every visible tile value indexed as x * size + y
+    # tiles that are not visible read as 0
+    # the view follows the game as it changes and is replaced when the size of the board changes
+    def get_value_view(self) -> memoryview:
+        return self._value_view
+
     # reveals the tile at the specified x, y coordinate
     def left_mouse_button(self, x: int, y: int):
         if x < 0 or y < 0 or x >= self._size or y >= self._size:
@@ -256,9 +346,9 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
             if self._grid[x][y].is_blank():
                 self._reveal_adjacent_blanks(x, y)
             else:
-                self._grid[x][y].state = tile.State.visible
+                self._set_tile_state(x, y, tile.State.visible)
 
-            if self._check_win():
+            if not self._batch and self._check_win():
                 self._state = State.victory
                 self._flag_mines()
 
@@ -266,16 +356,16 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
             if self._grid[x][y].is_blank():
                 self._reveal_adjacent_blanks(x, y)
 
-                if self._check_win():
+                if not self._batch and self._check_win():
                     self._state = State.victory
                     self._flag_mines()
             else:
-                self._grid[x][y].state = tile.State.visible
+                self._set_tile_state(x, y, tile.State.visible)
 
                 if self._grid[x][y].is_mine():
                     self._state = State.loss
                     self._reveal_mines()
-                elif self._check_win():
+                elif not self._batch and self._check_win():
                     self._state = State.victory
                     self._flag_mines()
 
@@ -292,13 +382,55 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
             return
 
         if self._grid[x][y].state is tile.State.covered:
-            self._grid[x][y].state = tile.State.flag
+            self._set_tile_state(x, y, tile.State.flag)
             self._flags += 1
         elif self._grid[x][y].state is tile.State.flag:
-            self._grid[x][y].state = tile.State.unknown
+            self._set_tile_state(x, y, tile.State.unknown)
             self._flags -= 1
         elif self._grid[x][y].state is tile.State.unknown:
-            self._grid[x][y].state = tile.State.covered
+            self._set_tile_state(x, y, tile.State.covered)
+
+    # reveals the covered neighbours of a visible number once it has as many flags around it
+    # does nothing otherwise. a misplaced flag makes this reveal a mine and lose the game
+    def chord(self, x: int, y: int):
+        if x < 0 or y < 0 or x >= self._size or y >= self._size:
+            raise TilePositionError("Access to Tile out of range", self._size, (x, y))
+
+        if self._state != State.ongoing:
+            return
+
+        centre = self._grid[x][y]
+        if centre.state is not tile.State.visible or centre.get_value() <= 0:
+            return
+
+        flags = 0
+        covered: [(int, int, bool)] = []
+        for i in range(max(0, x - 1), min(self._size, x + 2)):
+            for j in range(max(0, y - 1), min(self._size, y + 2)):
+                if self._grid[i][j].state is tile.State.flag:
+                    flags += 1
+                elif self._grid[i][j].state is tile.State.covered:
+                    covered.append((i, j, True))
+
+        if flags == centre.get_value():
+            self.apply_moves(covered)
+
+    # applies a batch of (x, y, left) moves as left or right clicks in order
+    # the win check is done once after the whole batch
+    def apply_moves(self, moves: [(int, int, bool)]):
+        self._batch = True
+        try:
+            for x, y, left in moves:
+                if left:
+                    self.left_mouse_button(x, y)
+                else:
+                    self.right_mouse_button(x, y)
+        finally:
+            self._batch = False
+
+        if self._state is State.ongoing and self._first_click and self._check_win():
+            self._state = State.victory
+            self._flag_mines()
 
     # clear the grid
     def _clear(self):
@@ -307,15 +439,45 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
                 element.set_value(tile.BLANK)
                 element.state = tile.State.covered
 
+        for index in range(len(self._state_codes)):
+            self._state_codes[index] = tile.State.covered.value
+            self._visible_values[index] = tile.BLANK
+
+    # creates the flat state and value arrays for the current size and their read-only views
+    def _gen_views(self):
+        tiles = self._size * self._size
+        self._state_codes = bytearray([tile.State.covered.value]) * tiles
+        self._visible_values = array.array('b', bytes(tiles))
+
+        self._state_view = memoryview(self._state_codes).toreadonly()
+        self._value_view = memoryview(self._visible_values).toreadonly()
+
+    # sets the state of a tile and keeps the flat views up to date
+    def _set_tile_state(self, x: int, y: int, state: tile.State):
+        element = self._grid[x][y]
+        element.state = state
+
+        index = x * self._size + y
+        self._state_codes[index] = state.value
+        if state is tile.State.visible:
+            self._visible_values[index] = element.get_value()
+        else:
+            self._visible_values[index] = tile.BLANK
+
     # populates the grid with mines
-    # Does not generate mines on the init x and y tile or immediately beside it
+    # Does not generate mines on the init x and y tile or immediately beside it unless a layout was set
     def _populate(self, init_x: int, init_y: int):
         mines = self._mines
 
         if mines > self._size * self._size - 9:
             raise MineError("Too many mines for this size of board", self._size, self._mines)
 
-        random.seed()
+        if self._layout is not None:
+            for x, y in self._layout:
+                self._grid[x][y].set_value(tile.MINE)
+            return
+
+        rng = random.Random(self._seed)
 
         # populate possible positions
         positions: [(int, int)] = []
@@ -328,7 +490,7 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
                     positions.append((x, y))
 
         while mines > 0:
-            x, y = random.choice(positions)
+            x, y = rng.choice(positions)
             positions.remove((x, y))
 
             self._grid[x][y].set_value(tile.MINE)
@@ -378,7 +540,7 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
                 self._flags -= 1
 
             # set this blank to visible
-            self._grid[x_pos][y_pos].state = tile.State.visible
+            self._set_tile_state(x_pos, y_pos, tile.State.visible)
 
             for i in range(x_pos - 1, x_pos + 2):
                 for j in range(y_pos - 1, y_pos + 2):
@@ -393,7 +555,7 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
 
                             # make all non-blank adjacent tiles visible
                             if not self._grid[i][j].is_blank():
-                                self._grid[i][j].state = tile.State.visible
+                                self._set_tile_state(i, j, tile.State.visible)
 
     # checks if the game was won
     def _check_win(self) -> bool:
@@ -409,18 +571,18 @@ self.right_mouse_button(self, x: int, y: int): cycles the state of a covered til
     # reveals the mines when the game is lost
     def _reveal_mines(self):
         if self._state is State.loss:
-            for col in self._grid:
-                for element in col:
-                    if element.is_mine():
-                        element.state = tile.State.visible
+            for x in range(self._size):
+                for y in range(self._size):
+                    if self._grid[x][y].is_mine():
+                        self._set_tile_state(x, y, tile.State.visible)
 
     # flags the mines when the game is won
     def _flag_mines(self):
         if self._state is State.victory:
-            for col in self._grid:
-                for element in col:
-                    if element.is_mine():
-                        element.state = tile.State.flag
+            for x in range(self._size):
+                for y in range(self._size):
+                    if self._grid[x][y].is_mine():
+                        self._set_tile_state(x, y, tile.State.flag)
 
             self._flags = self._mines
 
@@ -9,18 +9,58 @@ Public objects:
     * Class gui.Gui
 """
 
+import collections
+import copy
+import importlib
+import os
+import queue
+import threading
+import time
+import traceback
+import types
 import pygame
 import tile
 import game
-import solver
+import observation
+import patterns
+
+# the solver module is only imported by Gui._load_solver when the solver is first used and kept on the Gui
+
+# fonts and images shared by every Gui, keyed by path and size for fonts and by path for images
+_fonts: {(str, int): pygame.font.Font} = {}
+_sprites: {str: pygame.Surface} = {}
+
+
+# returns the font at the given path and size, loading it the first time it is used
+def _load_font(path: str, size: int) -> pygame.font.Font:
+    font = _fonts.get((path, size))
+    if font is None:
+        font = pygame.font.Font(path, size)
+        _fonts[(path, size)] = font
+
+    return font
+
+
+# returns the image at the given path, loading it the first time it is used
+def _load_sprite(path: str) -> pygame.Surface:
+    sprite = _sprites.get(path)
+    if sprite is None:
+        sprite = pygame.image.load(path)
+        _sprites[path] = sprite
+
+    return sprite
 
 
 class Gui:
     """
 This class controls the GUI to the mines game
+Gui(headless=True) draws onto the offscreen surface self.screen without opening a window
 
 # Start the gui
 self.start(self):
+
+# returns frame rate and frame time statistics of the recent frames
+self.frame_stats(self) -> dict:
     """
 
     CANVAS_SIZE = 900
@@ -28,6 +68,41 @@ self.start(self):
     PADDING = 10
     SOLVER_DELAY = 100
 
+    # viewport. tiles are drawn between the size that fits the board onto the canvas and MAX_TILE_SIZE pixels
+    # boards that would need tiles smaller than MIN_TILE_SIZE pixels are scrolled instead of squeezed
+    MIN_TILE_SIZE = 12
+    MAX_TILE_SIZE = 90
+    ZOOM_STEP = 1.25
+    SCROLL_STEP = 3  # tiles scrolled by each press of an arrow key
+    MINIMAP_SIZE = 170
+
+    # solver speeds as the name and the delay between moves in ms. a delay of 0 is turbo mode
+    # turbo mode applies as many moves as fit into TURBO_BUDGET ms every frame
+    SOLVER_SPEEDS = (("Normal", SOLVER_DELAY), ("Fast", 25), ("Turbo", 0))
+    TURBO_BUDGET = 8
+
+    # ms of moves that the solver worker plays ahead on its snapshot of the board per analysis
+    SOLVER_LOOKAHEAD = 50
+
+    # event posted by the solver worker with the moves it found
+    SOLVER_RESULT = pygame.USEREVENT + 1
+
+    # event posted by the heatmap worker with the mine probabilities it found
+    HEATMAP_RESULT = pygame.USEREVENT + 2
+
+    # the probability heatmap is drawn in HEATMAP_LEVELS shades from safe to mine
+    HEATMAP_LEVELS = 11
+    HEATMAP_ALPHA = 120
+
+    # frame pacing
+    MAX_FPS = 60
+    SOLVING_FPS = 30
+    IDLE_TIMEOUT = 1000  # ms to wait for an event when nothing is animating
+    FRAME_STATS_SIZE = 240  # number of recent frames kept for the frame statistics
+
+    # drawing stages timed by the performance HUD
+    DRAW_STAGES = ("canvas", "minefield", "command bar")
+
     # colours
     BLACK = (0, 0, 0)
     WHITE = (255, 255, 255)
@@ -46,7 +121,15 @@ self.start(self):
     UNKNOWN = '?'
     MINE = '\u2737'
 
-    def __init__(self):
+    # fonts
+    SERIF_FONT = "assets/fonts/FreeSerif.ttf"
+    SANS_FONT = "assets/fonts/FreeSans.ttf"
+    SERIF_BOLD_ITALIC_FONT = "assets/fonts/FreeSerifBoldItalic.ttf"
+
+    def __init__(self, headless: bool = False):
+        # true when the gui draws onto an offscreen surface instead of a window
+        self.headless = headless
+
         # size of the grid
         self.size = 16
 
@@ -56,17 +139,33 @@ self.start(self):
         # game clock
         self.clock = pygame.time.Clock()
 
+        # the dummy video driver lets pygame run on machines without a display
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+        # Initialize the parts of pygame that are used. sound and joysticks are never started
+        pygame.display.init()
+        pygame.font.init()
+
         # screen
-        self.screen = pygame.display.set_mode((Gui.CANVAS_SIZE + Gui.COMMANDS_BAR_SIZE + 2 * Gui.PADDING,
-                                               Gui.CANVAS_SIZE + 2 * Gui.PADDING))
+        window_size = (Gui.CANVAS_SIZE + Gui.COMMANDS_BAR_SIZE + 2 * Gui.PADDING, Gui.CANVAS_SIZE + 2 * Gui.PADDING)
+        if headless:
+            self.screen = pygame.Surface(window_size)
+        else:
+            self.screen = pygame.display.set_mode(window_size)
+            pygame.display.set_caption("'Mines' made by mattlourenco27 on Github")
+            # Icon made by Creaticca Creative Agency from www.flaticon.com
+            pygame.display.set_icon(_load_sprite("./assets/sprites/icon.png"))
 
         # Initialize the mines game
         self.game = game.Game()
         self.game.set_size(self.size)
         self.game.set_mines(self.mines)
 
-        # Initialize the solver module
-        self.solver = solver.Solver(self.game)
+        # the solver module and the learned local patterns shared by every solver analysis
+        # both are loaded the first time the solver is used
+        self.solver_module: types.ModuleType = None
+        self.pattern_table: patterns.PatternTable = None
 
         # true when the Gui is using the solver module
         self.solving = False
@@ -74,6 +173,40 @@ self.start(self):
         # tile that was last edited by the solver
         self.lastSolvedTile: (int, int) = (-1, -1)
 
+        # moves proven by the last solver analysis that have not been applied yet
+        self.solver_moves: collections.deque = collections.deque()
+
+        # counts changes to the board. results of analyses of older boards are discarded
+        self.board_generation = 0
+
+        # true while the solver worker is analysing the current board
+        self.solver_pending = False
+
+        # index of the selected speed in Gui.SOLVER_SPEEDS
+        self.solver_speed = 0
+
+        # snapshots of the board waiting to be analysed by the solver worker
+        self.solver_requests: queue.Queue = queue.Queue()
+
+        # the solver runs in a worker thread so that the window keeps drawing during long analyses
+        # the worker is started with the solver
+        self.solver_thread: threading.Thread = None
+
+        # true when the mine probabilities of the frontier are drawn over the minefield
+        self.show_heatmap = False
+
+        # heatmap level of each frontier tile keyed by tile index, and the board generation it was found for
+        self.heatmap: {int: int} = {}
+        self.heatmap_generation = -1
+
+        # true while the heatmap worker is analysing the current board
+        self.heatmap_pending = False
+
+        # the heatmap is found in its own worker so that it never delays the solver
+        # the worker is started the first time the heatmap is shown
+        self.heatmap_requests: queue.Queue = queue.Queue()
+        self.heatmap_thread: threading.Thread = None
+
         # the last mine tile where the left mouse was down
         self.last_left_down = (-1, -1)
 
@@ -83,13 +216,73 @@ self.start(self):
         # tile that was pressed when the game was lost
         self.failed_tile = (-1, -1)
 
-        # Initialize pygame
-        pygame.init()
+        # rendered text of the command bar keyed by font, size, message and colour
+        self.text_cache: {(str, int, str, (int, int, int)): pygame.Surface} = {}
+
+        # pre-rendered minefield characters keyed by character and colour
+        # each entry holds the surface and the offset from the tile centre to its top left corner
+        self.glyph_atlas: {(str, (int, int, int)): (pygame.Surface, int, int)} = {}
+
+        # tile size that the glyph atlas was rendered for
+        self.glyph_atlas_size = -1
+
+        # translucent squares of each heatmap level at the size of a tile
+        self.heatmap_overlays: [pygame.Surface] = []
+
+        # width of a tile in pixels and the pixel offset of the top left corner of the canvas into the board
+        self.tile_size: float = self._min_tile_size()
+        self.view_x = 0
+        self.view_y = 0
+
+        # pre-rendered window background and the grid lines of the tiles in the viewport
+        self.background: pygame.Surface = None
+
+        # board size, tile size and view offset that the background was rendered for
+        self.background_view = None
+
+        # true when the next frame must redraw the whole window
+        self.full_redraw = True
+
+        # board state, hovered tile, solver highlight and failed tile as they were last drawn
+        self.drawn_states: bytes = None
+        self.drawn_values: bytes = None
+        self.drawn_hover = (-1, -1)
+        self.drawn_highlight = (-1, -1)
+        self.drawn_failed_tile = (-1, -1)
+        self.drawn_heatmap: {int: int} = {}
+
+        # flags and hovered button of the command bar as they were last drawn
+        self.drawn_command_bar = None
+
+        # board state and viewport shown by the minimap as they were last drawn
+        self.drawn_minimap = None
+
+        # time spent handling events and drawing each of the recent frames in seconds
+        self.frame_times: collections.deque = collections.deque(maxlen=Gui.FRAME_STATS_SIZE)
+
+        # time at which each of the recent frames was drawn
+        self.frame_stamps: collections.deque = collections.deque(maxlen=Gui.FRAME_STATS_SIZE)
+
+        # total seconds spent working and waiting for events since the game loop started
+        self.busy_time = 0.0
+        self.idle_time = 0.0
+
+        # print the frame statistics when the window is closed
+        self.report_frame_stats = False
+
+        # true when the performance HUD is drawn under the command bar
+        self.show_hud = False
+
+        # draw time in seconds of each drawing stage in the recent frames. only recorded while the HUD is shown
+        self.stage_times: {str: collections.deque} = {
+            stage: collections.deque(maxlen=Gui.FRAME_STATS_SIZE) for stage in Gui.DRAW_STAGES}
+
+        # seconds that the last solver analysis took to find its first moves and the stage that found them
+        self.solver_latency: float = None
+        self.solver_stage: str = None
 
-        pygame.display.set_caption("'Mines' made by mattlourenco27 on Github")
-        # Icon made by Creaticca Creative Agency from www.flaticon.com
-        icon = pygame.image.load("./assets/sprites/icon.png")
-        pygame.display.set_icon(icon)
+        # start time and time of each step of the startup. printed after the first frame when set
+        self.startup_marks: [(str, float)] = None
 
     # Start the gui
     def start(self):
@@ -103,6 +296,7 @@ self.start(self):
     def restart(self, size, mines):
         self.solving = False
         self.lastSolvedTile = (-1, -1)
+        self.solver_moves.clear()
         pygame.time.set_timer(pygame.USEREVENT, 0) # turn off the timer
         self.game.reset()
         self.game.set_size(size)
@@ -110,102 +304,342 @@ self.start(self):
         self.game.set_mines(mines)
         self.mines = mines
         self.failed_tile = (-1, -1)
-        self.solver = solver.Solver(self.game)
+        self.tile_size = self._min_tile_size()
+        self.view_x = 0
+        self.view_y = 0
+        self.full_redraw = True
+        self.board_generation += 1
+        self.solver_pending = False
+        self.heatmap = {}
+        self.heatmap_pending = False
+        # heatmaps of the last game that are still being found are discarded
+        self.heatmap_generation = self.board_generation - 1
         self.game.begin()
 
-    # draw the canvas where the game of mines will show
-    def _draw_base_canvas(self):
+    # draw the canvas where the game of mines will show onto the given surface
+    # only the grid lines of the tiles in the viewport are drawn
+    def _draw_base_canvas(self, surface: pygame.Surface):
         background = pygame.Rect(Gui.PADDING, Gui.PADDING, Gui.CANVAS_SIZE, Gui.CANVAS_SIZE)
-        pygame.draw.rect(self.screen, Gui.WHITE, background)
+        pygame.draw.rect(surface, Gui.WHITE, background)
 
         colour = Gui.BLACK
 
+        first_x, last_x, first_y, last_y = self._visible_tiles()
+        right = Gui.PADDING + min(Gui.CANVAS_SIZE, int(self.size * self.tile_size) - self.view_x)
+        bottom = Gui.PADDING + min(Gui.CANVAS_SIZE, int(self.size * self.tile_size) - self.view_y)
+
         # Draw the row dividers
-        channel_width: float = Gui.CANVAS_SIZE / self.size
         line_width: int = 1
-        for row_divider in range(0, self.size + 1):
-            pygame.draw.line(self.screen, colour,
-                             (Gui.PADDING, Gui.PADDING + int(row_divider * channel_width)),
-                             (Gui.PADDING + Gui.CANVAS_SIZE, Gui.PADDING + int(row_divider * channel_width)),
-                             line_width)
+        for row_divider in range(first_y, last_y + 1):
+            top = Gui.PADDING + int(row_divider * self.tile_size) - self.view_y
+            pygame.draw.line(surface, colour, (Gui.PADDING, top), (right, top), line_width)
 
         # Draw the column dividers
-        for col_divider in range(0, self.size + 1):
-            pygame.draw.line(self.screen, colour,
-                             (Gui.PADDING + int(col_divider * channel_width), Gui.PADDING),
-                             (Gui.PADDING + int(col_divider * channel_width), Gui.PADDING + Gui.CANVAS_SIZE),
-                             line_width)
+        for col_divider in range(first_x, last_x + 1):
+            left = Gui.PADDING + int(col_divider * self.tile_size) - self.view_x
+            pygame.draw.line(surface, colour, (left, Gui.PADDING), (left, bottom), line_width)
+
+    # returns a rendered line of text, rendering it the first time it is used
+    def _text(self, path: str, size: int, message: str, colour) -> pygame.Surface:
+        key = (path, size, message, colour)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = _load_font(path, size).render(message, True, colour)
+            self.text_cache[key] = surface
+
+        return surface
+
+    # returns the colour that a tile number is drawn in
+    @staticmethod
+    def _number_colour(value: int) -> (int, int, int, int):
+        colour = pygame.Color(0, 0, 0)
+        colour.hsla = (((value - 1) * 200) % 360, 70, 40, 100)
+        return tuple(colour)
+
+    # pre-renders every character of the minefield in every colour it is drawn with at the current zoom
+    def _build_glyph_atlas(self):
+        font_size = int(self.tile_size * 0.6)
+        text = _load_font(Gui.SERIF_FONT, font_size)
+
+        glyphs = []
+        for character in (Gui.COVERED, Gui.FLAG, Gui.UNKNOWN, Gui.MINE):
+            for colour in (Gui.BLACK, Gui.MID_GRAY, Gui.RED):
+                glyphs.append((character, colour))
+        for value in range(1, 9):
+            glyphs.append((str(value), Gui._number_colour(value)))
+
+        self.glyph_atlas.clear()
+        for character, colour in glyphs:
+            surface = text.render(character, True, colour)
+            self.glyph_atlas[(character, colour)] = (surface, surface.get_width() // 2, surface.get_height() // 2)
+
+        self.glyph_atlas_size = self.tile_size
+
+        # shades from green for safe tiles to red for mines
+        self.heatmap_overlays = []
+        for level in range(Gui.HEATMAP_LEVELS):
+            share = level / (Gui.HEATMAP_LEVELS - 1)
+            colour = [int(Gui.GREEN[k] + (Gui.RED[k] - Gui.GREEN[k]) * share) for k in range(3)]
+            overlay = pygame.Surface((int(self.tile_size) + 1, int(self.tile_size) + 1), pygame.SRCALPHA)
+            overlay.fill(colour + [Gui.HEATMAP_ALPHA])
+            self.heatmap_overlays.append(overlay)
+
+    # renders the window background and the grid lines for the current viewport
+    def _build_background(self):
+        if self.background is None:
+            self.background = pygame.Surface(self.screen.get_size())
+        self.background.fill(Gui.LIGHT_GRAY)
+
+        # grid lines of partly visible tiles at the edges of the viewport must not draw over the command bar
+        # the last grid line of a board that fits the canvas is one pixel past it
+        self.background.set_clip(pygame.Rect(Gui.PADDING, Gui.PADDING, Gui.CANVAS_SIZE + 1, Gui.CANVAS_SIZE + 1))
+        self._timed("canvas", self._draw_base_canvas, self.background)
+        self.background.set_clip(None)
+
+        self.background_view = self._view()
+
+    # returns the area of the screen that the minefield is drawn in
+    @staticmethod
+    def _canvas_rect() -> pygame.Rect:
+        return pygame.Rect(Gui.PADDING, Gui.PADDING, Gui.CANVAS_SIZE, Gui.CANVAS_SIZE)
+
+    # returns the board size, tile size and view offset that decide where each tile is drawn
+    def _view(self) -> (int, float, int, int):
+        return self.size, self.tile_size, self.view_x, self.view_y
+
+    # returns the smallest tile size in pixels that the board can be zoomed out to
+    def _min_tile_size(self) -> float:
+        return max(Gui.CANVAS_SIZE / self.size, Gui.MIN_TILE_SIZE)
+
+    # returns true if the whole board fits onto the canvas
+    def _board_fits(self) -> bool:
+        return int(self.size * self.tile_size) <= Gui.CANVAS_SIZE
+
+    # returns the first and last columns and rows of tiles that are at least partly in the viewport
+    # the last column and row are exclusive
+    def _visible_tiles(self) -> (int, int, int, int):
+        first_x = int(self.view_x / self.tile_size)
+        first_y = int(self.view_y / self.tile_size)
+        last_x = min(self.size, int((self.view_x + Gui.CANVAS_SIZE) / self.tile_size) + 1)
+        last_y = min(self.size, int((self.view_y + Gui.CANVAS_SIZE) / self.tile_size) + 1)
+
+        return first_x, last_x, first_y, last_y
+
+    # returns the tile under a point on the screen or (-1, -1)
+    def _tile_at(self, mouse_pos) -> (int, int):
+        if not Gui._canvas_rect().collidepoint(mouse_pos):
+            return -1, -1
+
+        x = int((mouse_pos[0] - Gui.PADDING + self.view_x) / self.tile_size)
+        y = int((mouse_pos[1] - Gui.PADDING + self.view_y) / self.tile_size)
+        if x >= self.size or y >= self.size:
+            return -1, -1
+
+        return x, y
+
+    # moves the viewport by the given number of pixels, keeping it on the board
+    def _scroll(self, dx: int, dy: int):
+        limit = max(0, int(self.size * self.tile_size) - Gui.CANVAS_SIZE)
+        self.view_x = min(max(self.view_x + dx, 0), limit)
+        self.view_y = min(max(self.view_y + dy, 0), limit)
+
+    # centres the viewport on a point of the board given in tiles
+    def _centre_view(self, x: float, y: float):
+        self._scroll(int(x * self.tile_size) - Gui.CANVAS_SIZE // 2 - self.view_x,
+                     int(y * self.tile_size) - Gui.CANVAS_SIZE // 2 - self.view_y)
+
+    # multiplies the tile size by factor, keeping the point of the board under the anchor on the screen still
+    def _zoom(self, factor: float, anchor):
+        minimum = self._min_tile_size()
+        tile_size = min(max(self.tile_size * factor, minimum), max(Gui.MAX_TILE_SIZE, minimum))
+
+        # point of the board under the anchor in tiles
+        offset_x = anchor[0] - Gui.PADDING
+        offset_y = anchor[1] - Gui.PADDING
+        x = (offset_x + self.view_x) / self.tile_size
+        y = (offset_y + self.view_y) / self.tile_size
+
+        self.tile_size = tile_size
+        self.view_x = 0
+        self.view_y = 0
+        self._scroll(int(x * tile_size) - offset_x, int(y * tile_size) - offset_y)
+
+    # returns the area of the screen where the minimap is drawn
+    @staticmethod
+    def _minimap_rect() -> pygame.Rect:
+        return pygame.Rect(Gui.CANVAS_SIZE + 2 * Gui.PADDING + 15, Gui.PADDING + 610,
+                           Gui.MINIMAP_SIZE, Gui.MINIMAP_SIZE)
+
+    # draws the whole board shrunk into the minimap with the outline of the viewport
+    # the board is downsampled from a one byte per tile buffer so the cost does not depend on the zoom
+    def _draw_minimap(self, states: bytes):
+        rect = Gui._minimap_rect()
+
+        # the state buffer is x major and images are row major
+        rows = b''.join([states[y::self.size] for y in range(self.size)])
+        board = pygame.image.fromstring(rows, (self.size, self.size), 'P')
+        board.set_palette([Gui.BLACK, Gui.MID_GRAY, Gui.RED, Gui.GRAY_BLUE, Gui.WHITE])
+        self.screen.blit(pygame.transform.scale(board, rect.size), rect)
+
+        scale = Gui.MINIMAP_SIZE / (self.size * self.tile_size)
+        viewport = pygame.Rect(rect.left + int(self.view_x * scale), rect.top + int(self.view_y * scale),
+                               int(Gui.CANVAS_SIZE * scale), int(Gui.CANVAS_SIZE * scale))
+        pygame.draw.rect(self.screen, Gui.NAVY_BLUE, viewport.clip(rect), 2)
+        pygame.draw.rect(self.screen, Gui.BLACK, rect, 1)
+
+    # returns the area of a tile including the grid lines around it
+    def _tile_rect(self, x: int, y: int) -> pygame.Rect:
+        left = Gui.PADDING + int(x * self.tile_size) - self.view_x
+        top = Gui.PADDING + int(y * self.tile_size) - self.view_y
+
+        return pygame.Rect(left, top, Gui.PADDING + int((x + 1) * self.tile_size) - self.view_x - left + 1,
+                           Gui.PADDING + int((y + 1) * self.tile_size) - self.view_y - top + 1)
 
     # draw the minefield that the game is played on
-    def _draw_minefield(self, mouse_pos):
-        channel_width = Gui.CANVAS_SIZE / self.size
-        text = pygame.font.Font("assets/fonts/FreeSerif.ttf", int(channel_width * 0.6))
-
-        mouse_x = (mouse_pos[0] - Gui.PADDING)
-        mouse_y = (mouse_pos[1] - Gui.PADDING)
-
-        if mouse_x < 0:
-            mouse_x = -1
-        else:
-            mouse_x = int(mouse_x / channel_width)
-
-        if mouse_y < 0:
-            mouse_y = -1
-        else:
-            mouse_y = int(mouse_y / channel_width)
-
-        for x in range(self.size):
-            for y in range(self.size):
-                tile_state = self.game.get_tile_state(x, y)
+    # only the tiles in the viewport that changed since the last frame are drawn
+    # returns the areas of the screen that were drawn
+    def _draw_minefield(self, mouse_pos) -> [pygame.Rect]:
+        if self.glyph_atlas_size != self.tile_size:
+            self._build_glyph_atlas()
+
+        # read the whole board once per frame
+        states = self.game.get_state_view()
+        values = self.game.get_value_view()
+
+        hover = (-1, -1)
+        if not self.game.game_done():
+            hover = self._tile_at(mouse_pos)
+
+        highlight = (-1, -1)
+        if self.solving:
+            highlight = self.lastSolvedTile
+
+        # the values are compared as raw bytes since they are stored as bytes
+        raw_values = values.cast('B')
+
+        first_x, last_x, first_y, last_y = self._visible_tiles()
+
+        # find the tiles in the viewport that look different from the last frame
+        dirty_tiles = set()
+        redraw_all = self.drawn_states is None or len(self.drawn_states) != len(states)
+        if redraw_all:
+            for x in range(first_x, last_x):
+                dirty_tiles.update(range(x * self.size + first_y, x * self.size + last_y))
+        elif states != self.drawn_states or raw_values != self.drawn_values:
+            for x in range(first_x, last_x):
+                start = x * self.size + first_y
+                end = x * self.size + last_y
+                row_changed = states[start:end] != self.drawn_states[start:end]
+                if row_changed or raw_values[start:end] != self.drawn_values[start:end]:
+                    for index in range(start, end):
+                        if states[index] != self.drawn_states[index] or raw_values[index] != self.drawn_values[index]:
+                            dirty_tiles.add(index)
+
+        for old, new in ((self.drawn_hover, hover), (self.drawn_highlight, highlight),
+                         (self.drawn_failed_tile, self.failed_tile)):
+            if old != new:
+                for position in (old, new):
+                    # positions from before a change of board size may be off the board
+                    if first_x <= position[0] < last_x and first_y <= position[1] < last_y:
+                        dirty_tiles.add(position[0] * self.size + position[1])
+
+        heatmap: {int: int} = {}
+        if self.show_heatmap:
+            heatmap = self.heatmap
+
+        # a new heatmap only changes the tiles whose level changed
+        if heatmap is not self.drawn_heatmap:
+            for index, _ in heatmap.items() ^ self.drawn_heatmap.items():
+                if first_x <= index // self.size < last_x and first_y <= index % self.size < last_y:
+                    dirty_tiles.add(index)
+
+        self.drawn_states = bytes(states)
+        self.drawn_values = bytes(raw_values)
+        self.drawn_hover = hover
+        self.drawn_highlight = highlight
+        self.drawn_failed_tile = self.failed_tile
+        self.drawn_heatmap = heatmap
+
+        # tiles at the edges of the viewport are cut off at the canvas
+        canvas = Gui._canvas_rect()
+        self.screen.set_clip(canvas)
+
+        dirty_rects: [pygame.Rect] = []
+        for index in sorted(dirty_tiles):
+            x, y = divmod(index, self.size)
+
+            # restore the background and the grid lines under the tile
+            # the whole background was just drawn when every tile is redrawn
+            rect = self._tile_rect(x, y)
+            if not redraw_all:
+                self.screen.blit(self.background, rect, rect)
+            dirty_rects.append(rect.clip(canvas))
+
+            tile_state = tile.State(states[index])
+
+            # determine the colour fo the tile
+            if (x, y) == hover and tile_state is not tile.State.visible:
+                colour = Gui.MID_GRAY
+            elif (x, y) == self.failed_tile:
+                colour = Gui.RED
+            else:
+                colour = Gui.BLACK
+
+            # determine the character to print based on the tile state and value
+            character = Gui.BLANK
+            if tile_state is tile.State.covered:
+                character = Gui.COVERED
+            elif tile_state is tile.State.visible:
+                value = values[index]
+
+                if value == -1:
+                    character = Gui.MINE
+                elif value != 0:
+                    character = str(value)
+
+                    # change colour based on the value
+                    colour = Gui._number_colour(value)
+            elif tile_state is tile.State.flag:
+                character = Gui.FLAG
+            elif tile_state is tile.State.unknown:
+                character = Gui.UNKNOWN
+
+            # blank tiles have nothing to draw
+            if character != Gui.BLANK:
+                surface, half_width, half_height = self.glyph_atlas[(character, colour)]
+                self.screen.blit(surface, (Gui.PADDING + int((x + 0.5) * self.tile_size) - self.view_x - half_width,
+                                           Gui.PADDING + int((y + 0.5) * self.tile_size) - self.view_y - half_height))
+
+            # shade covered tiles by their chance of being a mine
+            if tile_state is tile.State.covered and index in heatmap:
+                self.screen.blit(self.heatmap_overlays[heatmap[index]], (rect.left + 1, rect.top + 1),
+                                 pygame.Rect(0, 0, rect.width - 2, rect.height - 2))
+
+            # draw last edited tile by the solver
+            if (x, y) == highlight:
+                colour = pygame.Color(0, 255, 0, 150)
+                rect = pygame.Rect(Gui.PADDING + x * self.tile_size - self.view_x,
+                                   Gui.PADDING + y * self.tile_size - self.view_y, self.tile_size, self.tile_size)
+
+                # Transparent surface
+                overlay = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+                overlay.fill(colour)
+
+                self.screen.blit(overlay, rect)
+
+        self.screen.set_clip(None)
+
+        return dirty_rects
+
+    # returns the index of the command bar button under the mouse or -1
+    def _hovered_button(self, mouse_pos) -> int:
+        rect = pygame.Rect(Gui.CANVAS_SIZE + 2 * Gui.PADDING + 15, Gui.PADDING + 85, 170, 50)
+        for button in range(7):
+            if rect.collidepoint(mouse_pos):
+                return button
+            rect = rect.move(0, 75)
 
-                # determine the colour fo the tile
-                if x == mouse_x and y == mouse_y and tile_state is not tile.State.visible and not self.game.game_done():
-                    colour = Gui.MID_GRAY
-                elif (x, y) == self.failed_tile:
-                    colour = Gui.RED
-                else:
-                    colour = Gui.BLACK
-
-                # determine the character to print based on the tile state and value
-                if tile_state is tile.State.covered:
-                    character = Gui.COVERED
-                elif tile_state is tile.State.visible:
-                    value = self.game.get_tile_value(x, y)
-
-                    if value == 0:
-                        character = Gui.BLANK
-                    elif value == -1:
-                        character = Gui.MINE
-                    else:
-                        character = str(value)
-
-                        # change colour based on the value
-                        colour = pygame.Color(0, 0, 0)
-                        colour.hsla = (((value - 1) * 200) % 360, 70, 40, 100)
-                elif tile_state is tile.State.flag:
-                    character = Gui.FLAG
-                elif tile_state is tile.State.unknown:
-                    character = Gui.UNKNOWN
-
-                text_surface = text.render(character, True, colour)
-                text_rect = text_surface.get_rect()
-                text_rect.center = (Gui.PADDING + int((x + 0.5) * channel_width),
-                                    Gui.PADDING + int((y + 0.5) * channel_width))
-                self.screen.blit(text_surface, text_rect)
-
-        # draw last edited tile by the solver
-        if self.solving and self.lastSolvedTile != (-1, -1):
-            x, y = self.lastSolvedTile
-            colour = pygame.Color(0, 255, 0, 150)
-            channel_width = Gui.CANVAS_SIZE / self.size
-            rect = pygame.Rect(Gui.PADDING + x * channel_width, Gui.PADDING + y * channel_width,
-                               channel_width, channel_width)
-
-            # Transparent surface
-            overlay = pygame.Surface((channel_width, channel_width), pygame.SRCALPHA)
-            overlay.fill(colour)
-
-            self.screen.blit(overlay, rect)
+        return -1
 
     # draw the command bar with buttons to click
     def _draw_command_bar(self, mouse_pos):
@@ -213,17 +647,13 @@ self.start(self):
         y_off = Gui.PADDING # Y offset to the command bar
 
         # indicate the number of flags placed
-        text = pygame.font.Font("assets/fonts/FreeSerif.ttf", 40)
         message = str(self.game.get_flags()) + " / " + str(self.mines) + " " + Gui.FLAG
         rect = pygame.Rect(x_off + 15, y_off + 10, 170, 50)
-        text_surface = text.render(message, True, Gui.BLACK)
+        text_surface = self._text(Gui.SERIF_FONT, 40, message, Gui.BLACK)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
 
-        # Set up text for buttons
-        text = pygame.font.Font("assets/fonts/FreeSans.ttf", 20)
-
         # Reset button
         rect = rect.move(0, 75)
         if rect.collidepoint(mouse_pos):
@@ -231,7 +661,7 @@ self.start(self):
         else:
             pygame.draw.rect(self.screen, Gui.WHITE, rect)
         pygame.draw.rect(self.screen, Gui.BLACK, rect, 5)
-        text_surface = text.render("Reset", True, Gui.BLACK)
+        text_surface = self._text(Gui.SANS_FONT, 20, "Reset", Gui.BLACK)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
@@ -243,7 +673,7 @@ self.start(self):
         else:
             pygame.draw.rect(self.screen, Gui.WHITE, rect)
         pygame.draw.rect(self.screen, Gui.BLACK, rect, 5)
-        text_surface = text.render("8x8 10 mines", True, Gui.BLACK)
+        text_surface = self._text(Gui.SANS_FONT, 20, "8x8 10 mines", Gui.BLACK)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
@@ -255,7 +685,7 @@ self.start(self):
         else:
             pygame.draw.rect(self.screen, Gui.WHITE, rect)
         pygame.draw.rect(self.screen, Gui.BLACK, rect, 5)
-        text_surface = text.render("16x16 40 mines", True, Gui.BLACK)
+        text_surface = self._text(Gui.SANS_FONT, 20, "16x16 40 mines", Gui.BLACK)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
@@ -267,7 +697,7 @@ self.start(self):
         else:
             pygame.draw.rect(self.screen, Gui.WHITE, rect)
         pygame.draw.rect(self.screen, Gui.BLACK, rect, 5)
-        text_surface = text.render("25x25 99 mines", True, Gui.BLACK)
+        text_surface = self._text(Gui.SANS_FONT, 20, "25x25 99 mines", Gui.BLACK)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
@@ -279,7 +709,7 @@ self.start(self):
         else:
             pygame.draw.rect(self.screen, Gui.WHITE, rect)
         pygame.draw.rect(self.screen, Gui.BLACK, rect, 5)
-        text_surface = text.render("Auto-Solve", True, Gui.BLACK)
+        text_surface = self._text(Gui.SANS_FONT, 20, "Auto-Solve", Gui.BLACK)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
@@ -291,7 +721,20 @@ self.start(self):
         else:
             pygame.draw.rect(self.screen, Gui.WHITE, rect)
         pygame.draw.rect(self.screen, Gui.BLACK, rect, 5)
-        text_surface = text.render("Pause Solver", True, Gui.BLACK)
+        text_surface = self._text(Gui.SANS_FONT, 20, "Pause Solver", Gui.BLACK)
+        text_rect = text_surface.get_rect()
+        text_rect.center = rect.center
+        self.screen.blit(text_surface, text_rect)
+
+        # solver speed button
+        rect = rect.move(0, 75)
+        if rect.collidepoint(mouse_pos):
+            pygame.draw.rect(self.screen, Gui.MID_LIGHT_GRAY, rect)
+        else:
+            pygame.draw.rect(self.screen, Gui.WHITE, rect)
+        pygame.draw.rect(self.screen, Gui.BLACK, rect, 5)
+        message = "Speed: " + Gui.SOLVER_SPEEDS[self.solver_speed][0]
+        text_surface = self._text(Gui.SANS_FONT, 20, message, Gui.BLACK)
         text_rect = text_surface.get_rect()
         text_rect.center = rect.center
         self.screen.blit(text_surface, text_rect)
@@ -301,59 +744,173 @@ self.start(self):
         message = "Victory"
         colour = Gui.GREEN
 
-        text = pygame.font.Font("assets/fonts/FreeSerifBoldItalic.ttf", 127)
-        text_surface = text.render(message, True, colour)
+        text_surface = self._text(Gui.SERIF_BOLD_ITALIC_FONT, 127, message, colour)
         text_rect = text_surface.get_rect()
         text_rect.center = (int((Gui.PADDING + Gui.CANVAS_SIZE) * 0.5), int((Gui.PADDING + Gui.CANVAS_SIZE) * 0.5))
         self.screen.blit(text_surface, text_rect)
 
-    # draws the mines game and the command bar
-    def _draw_screen(self, mouse_pos):
-        self.screen.fill(Gui.LIGHT_GRAY)
+    # calls function with args and records its run time under the given drawing stage while the HUD is shown
+    def _timed(self, stage: str, function, *args):
+        if not self.show_hud:
+            return function(*args)
+
+        start = time.perf_counter()
+        result = function(*args)
+        self.stage_times[stage].append(time.perf_counter() - start)
+
+        return result
 
-        self._draw_base_canvas()
-        self._draw_minefield(mouse_pos)
-        self._draw_command_bar(mouse_pos)
+    # returns the area of the screen where the performance HUD is drawn
+    @staticmethod
+    def _hud_rect() -> pygame.Rect:
+        return pygame.Rect(Gui.CANVAS_SIZE + 2 * Gui.PADDING + 15, Gui.PADDING + 790, 170, 105)
 
-        if self.game.victory():
+    # draws the frame rate, frame time percentiles, draw time of each stage and the last solver analysis
+    # the text changes every frame so it is rendered without the text cache
+    def _draw_hud(self):
+        rect = Gui._hud_rect()
+        self.screen.blit(self.background, rect, rect)
+
+        stats = self.frame_stats()
+        lines = [f"{stats['fps']:.1f} fps, {stats['busy']:.0%} busy",
+                 f"frame {stats['p50_ms']:.1f} / {stats['p95_ms']:.1f} / {stats['p99_ms']:.1f} ms"]
+
+        for stage in Gui.DRAW_STAGES:
+            times = self.stage_times[stage]
+            if len(times) > 0:
+                lines.append(f"{stage} {sum(times) / len(times) * 1000:.2f} ms")
+            else:
+                lines.append(stage + " -")
+
+        if self.solver_latency is not None:
+            lines.append(f"solver {self.solver_latency * 1000:.1f} ms, {self.solver_stage}")
+        else:
+            lines.append("solver -")
+
+        text = _load_font(Gui.SANS_FONT, 14)
+        top = rect.top
+        for line in lines:
+            self.screen.blit(text.render(line, True, Gui.BLACK), (rect.left, top))
+            top += 17
+
+    # draws the parts of the mines game and the command bar that changed since the last frame
+    def _draw_screen(self, mouse_pos):
+        # scrolling and zooming move every tile so the whole window is redrawn
+        if self.background_view != self._view():
+            self._build_background()
+            self.full_redraw = True
+
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            self.drawn_states = None
+            self.drawn_command_bar = None
+            self.drawn_minimap = None
+
+        dirty_rects = self._timed("minefield", self._draw_minefield, mouse_pos)
+
+        # the victory text covers the tiles so it is redrawn with the whole screen
+        if self.game.victory() and len(dirty_rects) > 0 and not self.full_redraw:
+            self.full_redraw = True
+            self._draw_screen(mouse_pos)
+            return
+
+        command_bar = (self.game.get_flags(), self.mines, self.solver_speed, self._hovered_button(mouse_pos))
+        if command_bar != self.drawn_command_bar:
+            rect = pygame.Rect(Gui.CANVAS_SIZE + Gui.PADDING, 0, Gui.COMMANDS_BAR_SIZE + Gui.PADDING,
+                               Gui.CANVAS_SIZE + 2 * Gui.PADDING)
+            self.screen.blit(self.background, rect, rect)
+            self._timed("command bar", self._draw_command_bar, mouse_pos)
+            dirty_rects.append(rect)
+            self.drawn_command_bar = command_bar
+            self.drawn_minimap = None
+
+        # the minimap is only shown while part of the board is out of view
+        minimap = (self.drawn_states, self._view())
+        if not self._board_fits() and minimap != self.drawn_minimap:
+            self._draw_minimap(self.drawn_states)
+            dirty_rects.append(Gui._minimap_rect())
+            self.drawn_minimap = minimap
+
+        # the HUD changes with every frame
+        if self.show_hud:
+            self._draw_hud()
+            dirty_rects.append(Gui._hud_rect())
+
+        if self.game.victory() and self.full_redraw:
             self._draw_win()
 
-        pygame.display.update()
+        # offscreen frames are read straight from the screen surface
+        if self.headless:
+            pass
+        elif self.full_redraw:
+            pygame.display.update()
+        elif len(dirty_rects) > 0:
+            pygame.display.update(dirty_rects)
 
-    # handles the pygame events 60 times per second
+        self.full_redraw = False
+
+    # handles one pygame event. the game loop blocks on pygame.event.wait and passes every event it gathers here
     def _event_handler(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        if event.type == pygame.VIDEOEXPOSE:
+            # the window contents were lost
+            self.full_redraw = True
+        elif event.type == pygame.MOUSEBUTTONDOWN:
             # mouse position at the current event
             mouse_pos = pygame.mouse.get_pos()
 
             # check if mouse intersects the minefield
-            rect = pygame.Rect(Gui.PADDING, Gui.PADDING, Gui.CANVAS_SIZE, Gui.CANVAS_SIZE)
-
-            if rect.collidepoint(mouse_pos) and not self.solving:
-                channel_width = Gui.CANVAS_SIZE / self.size
-                mouse_x = int((mouse_pos[0] - Gui.PADDING) / channel_width)
-                mouse_y = int((mouse_pos[1] - Gui.PADDING) / channel_width)
+            mouse_x, mouse_y = self._tile_at(mouse_pos)
 
+            if mouse_x != -1 and not self.solving:
                 if pygame.mouse.get_pressed()[0]:
                     self.last_left_down = (mouse_x, mouse_y)
                 elif pygame.mouse.get_pressed()[2]:
                     self.last_right_down = (mouse_x, mouse_y)
 
+            # clicking the minimap moves the viewport there
+            if not self._board_fits() and Gui._minimap_rect().collidepoint(mouse_pos) and event.button == 1:
+                self._minimap_handler(mouse_pos)
+        elif event.type == pygame.MOUSEMOTION:
+            if event.buttons[1]:
+                # drag the board with the middle mouse button
+                self._scroll(-event.rel[0], -event.rel[1])
+            elif event.buttons[0] and not self._board_fits() and Gui._minimap_rect().collidepoint(event.pos):
+                self._minimap_handler(event.pos)
+        elif event.type == pygame.MOUSEWHEEL:
+            # zoom in and out around the mouse
+            mouse_pos = pygame.mouse.get_pos()
+            if Gui._canvas_rect().collidepoint(mouse_pos) and event.y != 0:
+                self._zoom(Gui.ZOOM_STEP ** event.y, mouse_pos)
+        elif event.type == pygame.KEYDOWN:
+            step = int(Gui.SCROLL_STEP * self.tile_size)
+            if event.key == pygame.K_LEFT:
+                self._scroll(-step, 0)
+            elif event.key == pygame.K_RIGHT:
+                self._scroll(step, 0)
+            elif event.key == pygame.K_UP:
+                self._scroll(0, -step)
+            elif event.key == pygame.K_DOWN:
+                self._scroll(0, step)
+            elif event.key == pygame.K_HOME:
+                # zoom all the way out
+                self._zoom(0, (Gui.PADDING, Gui.PADDING))
+            elif event.key == pygame.K_p:
+                self.show_heatmap = not self.show_heatmap
+            elif event.key == pygame.K_h:
+                self.show_hud = not self.show_hud
+                self.full_redraw = True
         elif event.type == pygame.MOUSEBUTTONUP:
             # mouse position at the current event
             mouse_pos = pygame.mouse.get_pos()
 
             # check if mouse intersects the minefield
-            rect = pygame.Rect(Gui.PADDING, Gui.PADDING, Gui.CANVAS_SIZE, Gui.CANVAS_SIZE)
-
-            if rect.collidepoint(mouse_pos) and not self.solving:
-                channel_width = Gui.CANVAS_SIZE / self.size
-                mouse_x = int((mouse_pos[0] - Gui.PADDING) / channel_width)
-                mouse_y = int((mouse_pos[1] - Gui.PADDING) / channel_width)
+            mouse_x, mouse_y = self._tile_at(mouse_pos)
 
+            if mouse_x != -1 and not self.solving:
                 if not pygame.mouse.get_pressed()[0] and self.last_left_down != (-1, -1):
                     if (mouse_x, mouse_y) == self.last_left_down:
                         self.game.left_mouse_button(mouse_x, mouse_y)
+                        self.board_generation += 1
 
                     self.last_left_down = (-1, -1)
 
@@ -362,6 +919,7 @@ self.start(self):
                 elif not pygame.mouse.get_pressed()[2] and self.last_right_down != (-1, -1):
                     if (mouse_x, mouse_y) == self.last_right_down:
                         self.game.right_mouse_button(mouse_x, mouse_y)
+                        self.board_generation += 1
 
                     self.last_right_down = (-1, -1)
             # check if the mouse is over the command bar
@@ -371,24 +929,173 @@ self.start(self):
                 self._mouse_command_handler(mouse_pos)
         elif event.type == pygame.USEREVENT:
             if not self.game.game_done():
-                # event to edit one tile during the solving sequence
-                pygame.time.set_timer(pygame.USEREVENT, 0)  # pause the timer
-                try:
-                    x, y, left_click = self.solver.best_click(self.game)
-                except solver.AnalysisError:
-                    left_click = True
-                    x, y = self.solver.random_tile()
-                self.lastSolvedTile = (x, y)
-                if left_click:
-                    self.game.left_mouse_button(x, y)
-                else:
-                    self.game.right_mouse_button(x, y)
+                # event to edit tiles during the solving sequence
+                # one tile per event, or as many as fit in the frame budget in turbo mode
+                deadline = time.perf_counter() + Gui.TURBO_BUDGET / 1000
+                while not self.game.game_done():
+                    move = self._next_solver_move()
+
+                    if move is None:
+                        if not self.solver_pending:
+                            # ask the worker for the moves on a snapshot of the board
+                            self.solver_pending = True
+                            self.solver_requests.put((self.board_generation, copy.deepcopy(self.game)))
+                        break
+
+                    x, y, left_click = move
+                    self.lastSolvedTile = (x, y)
+                    if left_click:
+                        self.game.left_mouse_button(x, y)
+                    else:
+                        self.game.right_mouse_button(x, y)
+                    self.board_generation += 1
 
-                pygame.time.set_timer(pygame.USEREVENT, Gui.SOLVER_DELAY) # continue the timer
+                    if not self._turbo() or time.perf_counter() > deadline:
+                        break
             else:
                 self.solving = False
                 self.lastSolvedTile = (-1, -1)
+                self.solver_moves.clear()
                 pygame.time.set_timer(pygame.USEREVENT, 0)  # turn off the timer
+        elif event.type == Gui.HEATMAP_RESULT:
+            # a heatmap of an older board is still shown until the next one arrives
+            self.heatmap_pending = False
+            if event.generation > self.heatmap_generation:
+                self.heatmap = event.heatmap
+                self.heatmap_generation = event.generation
+        elif event.type == Gui.SOLVER_RESULT:
+            # discard results for a board that has changed since the snapshot was taken
+            if event.generation == self.board_generation and self.solving:
+                self.solver_pending = False
+                self.solver_moves.extend(event.moves)
+                self.solver_latency = event.latency
+                self.solver_stage = event.stage
+
+                # pause the solver instead of asking again for the board that it failed on
+                if event.stage == "error":
+                    self.solving = False
+                    pygame.time.set_timer(pygame.USEREVENT, 0)
+                    self.lastSolvedTile = (-1, -1)
+
+    # returns true if the solver is set to turbo mode
+    def _turbo(self) -> bool:
+        return Gui.SOLVER_SPEEDS[self.solver_speed][1] == 0
+
+    # starts or restarts the solver timer at the selected speed
+    def _start_solver_timer(self):
+        delay = Gui.SOLVER_SPEEDS[self.solver_speed][1]
+        if delay == 0:
+            delay = int(1000 / Gui.SOLVING_FPS)
+
+        pygame.time.set_timer(pygame.USEREVENT, delay)
+
+    # returns the next queued solver move that is still needed or None
+    def _next_solver_move(self) -> (int, int, bool):
+        while len(self.solver_moves) > 0:
+            x, y, left_click = self.solver_moves.popleft()
+
+            # skip moves that earlier moves already made
+            if self.game.get_tile_state(x, y) is tile.State.covered:
+                return x, y, left_click
+
+        return None
+
+    # analyses snapshots of the board in a worker thread and posts the moves found as events
+    # an analysis that fails is printed and posted with no moves and the stage "error"
+    def _solver_worker(self):
+        while True:
+            generation, snapshot = self.solver_requests.get()
+            try:
+                moves, latency, stage = Gui._solver_moves(self.solver_module, snapshot, self.pattern_table,
+                                                          Gui.SOLVER_LOOKAHEAD / 1000)
+            except Exception:
+                traceback.print_exc()
+                moves, latency, stage = [], None, "error"
+
+            pygame.event.post(pygame.event.Event(Gui.SOLVER_RESULT, generation=generation, moves=moves,
+                                                 latency=latency, stage=stage))
+
+    # asks the heatmap worker for the mine probabilities of the current board if they are shown and out of date
+    # only one board is analysed at a time, boards that change during an analysis are analysed afterwards
+    def _request_heatmap(self):
+        if not self.show_heatmap or self.heatmap_pending or self.heatmap_generation == self.board_generation:
+            return
+
+        if self.heatmap_thread is None:
+            self._load_solver()
+            self.heatmap_thread = threading.Thread(target=self._heatmap_worker, daemon=True)
+            self.heatmap_thread.start()
+
+        # finished boards have no heatmap. the others are analysed from an observation, which is cheaper to copy
+        snapshot = None
+        if not self.game.game_done():
+            snapshot = observation.Observation.of(self.game)
+
+        self.heatmap_pending = True
+        self.heatmap_requests.put((self.board_generation, snapshot))
+
+    # finds the mine probabilities of snapshots of the board in a worker thread and posts them as events
+    # an analysis that fails is printed and posted as an empty heatmap
+    def _heatmap_worker(self):
+        while True:
+            generation, snapshot = self.heatmap_requests.get()
+            try:
+                heatmap = Gui._heatmap(self.solver_module, snapshot)
+            except Exception:
+                traceback.print_exc()
+                heatmap = {}
+
+            pygame.event.post(pygame.event.Event(Gui.HEATMAP_RESULT, generation=generation, heatmap=heatmap))
+
+    # returns the heatmap level of each frontier tile of an observed board keyed by tile index
+    # returns no levels if there is no observation
+    @staticmethod
+    def _heatmap(solver_module: types.ModuleType, g: observation.Observation) -> {int: int}:
+        if g is None:
+            return {}
+
+        size = g.get_size()
+        tiles, percentages = solver_module.Solver(g)._do_prob_wave(g, return_data=True)
+
+        heatmap: {int: int} = {}
+        for (x, y), percent in zip(tiles, percentages):
+            heatmap[x * size + y] = round(percent / 100 * (Gui.HEATMAP_LEVELS - 1))
+
+        return heatmap
+
+    # returns the moves that the solver makes on a snapshot of the board, the seconds that the first analysis
+    # took and the solver stage that found its moves
+    # the moves are played on the snapshot so that the solver can keep going until the time budget
+    # in seconds runs out. the same moves have the same results on the real board
+    @staticmethod
+    def _solver_moves(solver_module: types.ModuleType, g: game.Game, pattern_table: patterns.PatternTable,
+                      budget: float) -> ([(int, int, bool)], float, str):
+        start = time.perf_counter()
+        deadline = start + budget
+        analysis = solver_module.Solver(g, pattern_table)
+
+        latency: float = None
+        stage: str = None
+        moves: [(int, int, bool)] = []
+        while not g.game_done():
+            batch = [(move.x, move.y, move.left) for move in analysis.next_moves(g)]
+            if len(batch) == 0:
+                break
+
+            if latency is None:
+                latency = time.perf_counter() - start
+                stage = analysis.last_stage
+
+            # mines are placed on the first click, so the snapshot only matches the real board after it
+            first_click = tile.State.visible.value not in g.get_state_view().tobytes()
+
+            g.apply_moves(batch)
+            moves += batch
+
+            if first_click or time.perf_counter() > deadline:
+                break
+
+        return moves, latency, stage
 
     def _mouse_command_handler(self, mouse_pos):
         x_off = Gui.CANVAS_SIZE + 2 * Gui.PADDING  # X offset to the command bar
@@ -400,6 +1107,7 @@ self.start(self):
         _25x25_rect = _16x16_rect.move(0, 75)
         solve_rect = _25x25_rect.move(0, 75)
         pause_solver_rect = solve_rect.move(0, 75)
+        speed_rect = pause_solver_rect.move(0, 75)
 
         if reset_rect.collidepoint(mouse_pos):
             self.restart(self.size, self.mines)
@@ -410,27 +1118,126 @@ self.start(self):
         elif _25x25_rect.collidepoint(mouse_pos):
             self.restart(25, 99)
         elif solve_rect.collidepoint(mouse_pos):
+            self._load_solver()
             self.solving = True
-            pygame.time.set_timer(pygame.USEREVENT, Gui.SOLVER_DELAY)
+            self._start_solver_timer()
         elif pause_solver_rect.collidepoint(mouse_pos):
             self.solving = False
             pygame.time.set_timer(pygame.USEREVENT, 0) # pause timer
             self.lastSolvedTile = (-1, -1)
+            self.solver_moves.clear()
+            self.board_generation += 1
+            self.solver_pending = False
+        elif speed_rect.collidepoint(mouse_pos):
+            self.solver_speed = (self.solver_speed + 1) % len(Gui.SOLVER_SPEEDS)
+            if self.solving:
+                self._start_solver_timer()
+
+    # centres the viewport on the point of the board under the mouse on the minimap
+    def _minimap_handler(self, mouse_pos):
+        rect = Gui._minimap_rect()
+        scale = self.size / Gui.MINIMAP_SIZE
+        self._centre_view((mouse_pos[0] - rect.left) * scale, (mouse_pos[1] - rect.top) * scale)
+
+    # returns frame rate and frame time statistics of the recent frames
+    # busy is the fraction of the time since the loop started that was spent working instead of waiting
+    def frame_stats(self) -> dict:
+        stats = {"frames": len(self.frame_times), "fps": 0.0, "mean_ms": 0.0, "max_ms": 0.0,
+                 "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "busy": 0.0}
+
+        if len(self.frame_times) > 0:
+            stats["mean_ms"] = sum(self.frame_times) / len(self.frame_times) * 1000
+            stats["max_ms"] = max(self.frame_times) * 1000
+
+            # nearest rank percentiles
+            ordered = sorted(self.frame_times)
+            for percentile in (50, 95, 99):
+                stats["p" + str(percentile) + "_ms"] = ordered[int(percentile / 100 * (len(ordered) - 1))] * 1000
+        if len(self.frame_stamps) > 1 and self.frame_stamps[-1] > self.frame_stamps[0]:
+            stats["fps"] = (len(self.frame_stamps) - 1) / (self.frame_stamps[-1] - self.frame_stamps[0])
+        if self.busy_time + self.idle_time > 0:
+            stats["busy"] = self.busy_time / (self.busy_time + self.idle_time)
+
+        return stats
+
+    # prints the time each step of the startup took once the first frame is drawn
+    def _report_startup(self, first_frame: float):
+        self.startup_marks.append(("first frame", first_frame))
+
+        steps = []
+        for (_, previous), (name, mark) in zip(self.startup_marks, self.startup_marks[1:]):
+            steps.append(f"{name} {(mark - previous) * 1000:.1f} ms")
+        total = (first_frame - self.startup_marks[0][1]) * 1000
+        print("Time to first frame: " + f"{total:.1f} ms (" + ", ".join(steps) + ")")
+
+        self.startup_marks = None
+
+    # imports the solver, loads the pattern table and starts the solver worker the first time the solver is used
+    # playing without the solver never pays for them
+    def _load_solver(self):
+        if self.solver_thread is not None:
+            return
+
+        self.solver_module = importlib.import_module("solver")
+        self.pattern_table = patterns.PatternTable.load()
+        self.solver_thread = threading.Thread(target=self._solver_worker, daemon=True)
+        self.solver_thread.start()
 
     # game loop that controls the buttons, game, and solver as well as drawing the screen
+    # blocks until an event arrives and only draws a frame when something may have changed
     def _game_loop(self):
         running = True
         while running:
-            for event in pygame.event.get():
+            # wait for the next event. the solver timer wakes the loop while it is running
+            timeout = Gui.IDLE_TIMEOUT
+            if self.solving:
+                timeout = int(1000 / Gui.SOLVING_FPS)
+
+            wait_start = time.perf_counter()
+            if self.full_redraw:
+                # a frame is waiting to be drawn
+                event = pygame.event.poll()
+            else:
+                event = pygame.event.wait(timeout)
+            frame_start = time.perf_counter()
+            self.idle_time += frame_start - wait_start
+
+            events = pygame.event.get()
+            if event.type != pygame.NOEVENT:
+                events.insert(0, event)
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     # Exit the game
+                    if self.pattern_table is not None and self.pattern_table.dirty:
+                        self.pattern_table.save()
+                    if self.report_frame_stats:
+                        print(self.frame_stats())
                     pygame.quit()
                     quit()
                 else:
                     self._event_handler(event)
 
-            mouse_pos = (10000, 10000)
-            if pygame.mouse.get_focused():
-                mouse_pos = pygame.mouse.get_pos()
-            self._draw_screen(mouse_pos)
-            self.clock.tick(60)
+            self._request_heatmap()
+
+            if len(events) > 0 or self.full_redraw:
+                mouse_pos = (10000, 10000)
+                if pygame.mouse.get_focused():
+                    mouse_pos = pygame.mouse.get_pos()
+                self._draw_screen(mouse_pos)
+
+                frame_end = time.perf_counter()
+                if self.startup_marks is not None:
+                    self._report_startup(frame_end)
+                self.frame_times.append(frame_end - frame_start)
+                self.frame_stamps.append(frame_end)
+                self.busy_time += frame_end - frame_start
+
+                # limit the frame rate, slower while the solver is running
+                if self.solving:
+                    self.clock.tick(Gui.SOLVING_FPS)
+                else:
+                    self.clock.tick(Gui.MAX_FPS)
+                self.idle_time += time.perf_counter() - frame_end
+            else:
+                self.busy_time += time.perf_counter() - frame_start
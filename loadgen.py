@@ -0,0 +1,315 @@
+# Created on 18 Oct 2026
+# This file puts load on a game server and reports how fast it answered
+
+"""
+Plays many games at once against a game server and reports its throughput, errors and latency
+
+Every client keeps one connection and plays seeded games one after another until the time is up.
+The clients are numbered across all processes and each one plays its own range of seeds, so no two clients
+play the same game.
+Each client also plays the same seeded game locally with game.Game. Its moves are chosen on that copy, by
+solver.Solver or at random, and every reply of the server is checked against it. A reply that does not
+match the local game is counted as a 'mismatch' error.
+
+Requests are spread evenly over time so that all clients together send the target rate. Clients are split
+across processes so that choosing moves does not delay the requests of other clients.
+
+The report holds the requests per second, the games played and won and, for every operation,
+the number of requests, the error rate and the p50 / p95 / p99 latency in milliseconds.
+
+Public objects:
+    * Function loadgen.run
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+import game
+import observation
+import server
+import solver
+import tile
+
+OPERATIONS = ("create", "click", "flag", "state", "close")
+
+# seeds between the first games of two clients. client k plays the games seed + k * _CLIENT_SEEDS and up
+_CLIENT_SEEDS = 1000003
+
+
+class _ConnectionLost(Exception):
+    # raised when the server closes the connection of a client
+    pass
+
+
+class _Pacer:
+    # spaces out requests so that they are sent at a target rate. a rate of 0 does not wait
+
+    def __init__(self, rate: float):
+        self._interval = 0 if rate <= 0 else 1 / rate
+        self._next = time.perf_counter()
+
+    # waits for the next free slot
+    async def wait(self):
+        if self._interval == 0:
+            return
+
+        now = time.perf_counter()
+        slot = max(now, self._next)
+        self._next = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class _Client:
+    # plays games over one connection and records the latency and result of every request
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, pacer: _Pacer, results: dict):
+        self._reader = reader
+        self._writer = writer
+        self._pacer = pacer
+        self._results = results
+
+    # sends a request and returns its reply, or None if it failed
+    async def request(self, op: str, **fields) -> dict:
+        await self._pacer.wait()
+
+        start = time.perf_counter()
+        self._writer.write(json.dumps({"op": op, **fields}).encode() + b"\n")
+        await self._writer.drain()
+        line = await self._reader.readline()
+        elapsed = time.perf_counter() - start
+
+        if not line:
+            raise _ConnectionLost()
+
+        reply = json.loads(line)
+        self._results["latency"].setdefault(op, []).append(elapsed)
+        if not reply["ok"]:
+            self._error(op)
+            return None
+
+        return reply
+
+    # counts an error of an operation
+    def _error(self, op: str):
+        self._results["errors"][op] = self._results["errors"].get(op, 0) + 1
+
+    # returns true if every change in a reply matches the local game
+    def _matches(self, g: game.Game, reply: dict) -> bool:
+        size = g.get_size()
+        states = g.get_state_view()
+        values = g.get_value_view()
+        for x, y, char in reply["changes"]:
+            index = x * size + y
+            if observation.tile_char(states[index], values[index]) != char:
+                return False
+
+        return reply["status"] == ("victory" if g.victory() else "loss" if g.game_done() else "ongoing")
+
+    # plays a seeded game on the server and locally
+    # moves are chosen by the solver, or at random if strategy is 'random'
+    async def play(self, size: int, mines: int, seed: int, strategy: str, rng: random.Random):
+        reply = await self.request("create", size=size, mines=mines, seed=seed)
+        if reply is None:
+            return
+        session = reply["session"]
+
+        g = game.Game()
+        g.set_size(size)
+        g.set_mines(mines)
+        g.set_seed(seed)
+        g.begin()
+
+        analysis = solver.Solver(g) if strategy == "solver" else None
+        while not g.game_done():
+            if analysis is not None:
+                moves = [(move.x, move.y, move.left) for move in analysis.next_moves(g)]
+            else:
+                covered = [index for index, state in enumerate(g.get_state_view()) if state == tile.State.covered.value]
+                moves = [divmod(rng.choice(covered), size) + (True,)] if len(covered) > 0 else []
+
+            if len(moves) == 0:
+                break
+
+            for x, y, left in moves:
+                if g.game_done() or g.get_tile_state(x, y) is not tile.State.covered:
+                    continue
+
+                if left:
+                    g.left_mouse_button(x, y)
+                else:
+                    g.right_mouse_button(x, y)
+
+                op = "click" if left else "flag"
+                reply = await self.request(op, session=session, x=x, y=y)
+                if reply is not None and not self._matches(g, reply):
+                    self._error("mismatch")
+
+        reply = await self.request("state", session=session)
+        if reply is not None and reply["rows"] != observation.Observation.of(g).to_rows():
+            self._error("mismatch")
+
+        await self.request("close", session=session)
+
+        self._results["games"] += 1
+        self._results["wins"] += g.victory()
+
+
+# plays games with every client of one process until the deadline
+# the clients of the process are first_client to first_client + clients - 1 of all the processes
+async def _run_clients(endpoint: (str, int, str), clients: int, rate: float, duration: float, size: int,
+                       mines: int, strategy: str, seed: int, first_client: int) -> dict:
+    results = {"latency": {}, "errors": {}, "games": 0, "wins": 0}
+    pacer = _Pacer(rate)
+    deadline = time.perf_counter() + duration
+    host, port, path = endpoint
+
+    async def run_client(number: int):
+        try:
+            if path is not None:
+                reader, writer = await asyncio.open_unix_connection(path)
+            else:
+                reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            results["errors"]["connect"] = results["errors"].get("connect", 0) + 1
+            return
+
+        client = _Client(reader, writer, pacer, results)
+        rng = random.Random(seed + first_client + number)
+        game_seed = seed + (first_client + number) * _CLIENT_SEEDS
+        try:
+            while time.perf_counter() < deadline:
+                await client.play(size, mines, game_seed, strategy, rng)
+                game_seed += 1
+        except (_ConnectionLost, ConnectionError):
+            results["errors"]["connection"] = results["errors"].get("connection", 0) + 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*[run_client(number) for number in range(clients)])
+    return results
+
+
+# runs the clients of one process
+def _run_process(task: tuple) -> dict:
+    return asyncio.run(_run_clients(*task))
+
+
+# returns the p50, p95 and p99 of the given seconds in milliseconds, using the nearest rank
+def _percentiles(times: [float]) -> dict:
+    result = {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    if len(times) == 0:
+        return result
+
+    ordered = sorted(times)
+    for percentile in (50, 95, 99):
+        result["p" + str(percentile)] = ordered[int(percentile / 100 * (len(ordered) - 1))] * 1000
+
+    return result
+
+
+# puts load on the server at the endpoint (host, port, unix socket path or None) for the given seconds
+# rate is the target number of requests per second of all clients together. 0 sends them as fast as possible
+# returns the report as a json compatible dict
+def run(endpoint: (str, int, str), clients: int = 100, rate: float = 0, duration: float = 10, size: int = 16,
+        mines: int = 40, strategy: str = "solver", processes: int = None, seed: int = 0) -> dict:
+    if processes is None:
+        processes = min(clients, multiprocessing.cpu_count())
+
+    # clients and rate are split as evenly as possible between the processes
+    tasks = []
+    first_client = 0
+    for number in range(processes):
+        count = clients // processes + (number < clients % processes)
+        if count > 0:
+            tasks.append((endpoint, count, rate * count / clients, duration, size, mines, strategy,
+                          seed, first_client))
+        first_client += count
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(len(tasks)) as pool:
+        results = pool.map(_run_process, tasks)
+    seconds = time.perf_counter() - start
+
+    latency: {str: [float]} = {}
+    errors: {str: int} = {}
+    for result in results:
+        for op, times in result["latency"].items():
+            latency.setdefault(op, []).extend(times)
+        for op, count in result["errors"].items():
+            errors[op] = errors.get(op, 0) + count
+
+    requests = sum(len(times) for times in latency.values())
+    report = {
+        "clients": clients,
+        "processes": len(tasks),
+        "strategy": strategy,
+        "size": size,
+        "mines": mines,
+        "target_rate": rate,
+        "seconds": seconds,
+        "requests": requests,
+        "requests_per_second": requests / seconds,
+        "games": sum(result["games"] for result in results),
+        "wins": sum(result["wins"] for result in results),
+        "errors": errors,
+        "operations": {},
+    }
+
+    for op in OPERATIONS:
+        times = latency.get(op, [])
+        report["operations"][op] = {
+            "requests": len(times),
+            "errors": errors.get(op, 0),
+            "error_rate": 0.0 if len(times) == 0 else errors.get(op, 0) / len(times),
+            **_percentiles(times),
+        }
+
+    return report
+
+
+# prints a report as a table
+def _print_report(report: dict):
+    print(str(report["clients"]) + " clients in " + str(report["processes"]) + " processes played "
+          + str(report["games"]) + " " + report["strategy"] + " games of " + str(report["size"]) + "x"
+          + str(report["size"]) + "/" + str(report["mines"]) + " and won " + str(report["wins"]))
+    print(f"{report['requests']} requests in {report['seconds']:.1f} s: {report['requests_per_second']:.0f} per second")
+
+    other_errors = {op: count for op, count in report["errors"].items() if op not in OPERATIONS}
+    if len(other_errors) > 0:
+        print("errors: " + ", ".join(op + " " + str(count) for op, count in other_errors.items()))
+
+    print(f"{'operation':>10} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for op, stats in report["operations"].items():
+        print(f"{op:>10} {stats['requests']:>9} {stats['error_rate']:>7.2%}"
+              f" {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Put load on a game server and report its latency")
+    parser.add_argument("--host", default="127.0.0.1", help="address of the server")
+    parser.add_argument("--port", type=int, default=server.DEFAULT_PORT, help="tcp port of the server")
+    parser.add_argument("--unix", default=None, metavar="PATH", help="connect to a unix socket instead of tcp")
+    parser.add_argument("--clients", type=int, default=100, help="clients playing at once")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="target requests per second of all clients. 0 sends them as fast as possible")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to keep starting games for")
+    parser.add_argument("--size", type=int, default=16, help="size of the boards")
+    parser.add_argument("--mines", type=int, default=40, help="mines on each board")
+    parser.add_argument("--strategy", choices=("solver", "random"), default="solver",
+                        help="choose moves with the solver or at random")
+    parser.add_argument("--processes", type=int, default=None, help="processes running the clients")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--json", action="store_true", help="print the report as json")
+    args = parser.parse_args()
+
+    result = run((args.host, args.port, args.unix), args.clients, args.rate, args.duration, args.size,
+                 args.mines, args.strategy, args.processes, args.seed)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result)
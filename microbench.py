@@ -0,0 +1,238 @@
+# Created on 18 Oct 2026
+# This file times the hot paths of the game and solver and checks them against a saved baseline
+
+"""
+Times the hot paths of the game and solver on fixed boards and compares them to a saved baseline
+
+Every benchmark builds its board from a fixed seed so that each run times the same work.
+A benchmark is timed REPEAT times and its fastest time is kept, since slower runs only measure noise.
+Running with --save stores the times as the baseline. Later runs fail with exit code 1 if any
+benchmark is slower than its baseline by more than the tolerance.
+
+Baselines depend on the machine so they are not shared through the repository.
+
+Constants:
+    * microbench.DEFAULT_PATH
+    * microbench.DEFAULT_TOLERANCE = 0.25
+    * microbench.REPEAT = 30
+
+Public objects:
+    * Function microbench.run
+    * Function microbench.compare
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import game
+import solver
+
+DEFAULT_PATH = "assets/benchmarks/baseline.json"
+DEFAULT_TOLERANCE = 0.25
+REPEAT = 30
+
+# seeds of the fixture boards
+_OPENED_SEED = 39
+_FRONTIER_SEED = 40
+_OPEN_SEED = 3
+
+_FORMAT_VERSION = 2
+
+
+# returns a seeded 16x16 game after its first click and a solver that has not seen the click
+def _opened_game(seed: int = _OPENED_SEED) -> (game.Game, solver.Solver):
+    g = game.Game()
+    g.set_size(16)
+    g.set_mines(40)
+    g.set_seed(seed)
+    g.begin()
+
+    analysis = solver.Solver(g)
+    g.left_mouse_button(8, 8)
+    return g, analysis
+
+
+# returns a seeded 16x16 game solved by the logic rules and the pattern table as far as they go and its solver
+# the probability analysis of the frontier left over proves some of its tiles
+def _frontier_game() -> (game.Game, solver.Solver):
+    g, analysis = _opened_game(_FRONTIER_SEED)
+    analysis._update_grid(g)
+    while analysis._do_logic_batch(g) or analysis._do_pattern_wave(g):
+        pass
+
+    return g, analysis
+
+
+# returns a seeded 30x30 game with its mines placed and every tile covered, and a blank tile to reveal
+def _open_board() -> (game.Game, (int, int)):
+    g = game.Game()
+    g.set_size(30)
+    g.set_mines(20)
+    g.set_seed(_OPEN_SEED)
+    g.begin()
+
+    g._populate(15, 15)
+    g._update_all_tiles()
+    g._first_click = True
+    return g, (15, 15)
+
+
+# each setup returns a function that does the timed work once and the number of times to call it per repeat
+# work that changes the board gets a fresh fixture every repeat
+
+def _setup_permute(items: int, length: int):
+    return lambda: solver._permute(items, length), 20
+
+
+def _setup_update_grid():
+    g, analysis = _opened_game()
+    return lambda: analysis._update_grid(g), 1
+
+
+def _setup_logic_wave():
+    g, analysis = _opened_game()
+    analysis._update_grid(g)
+    return lambda: analysis._do_logic_wave(g, False, (8, 8)), 1
+
+
+def _setup_prob_wave():
+    g, analysis = _frontier_game()
+    return lambda: analysis._do_prob_wave(g), 1
+
+
+def _setup_reveal():
+    g, (x, y) = _open_board()
+    return lambda: g._reveal_adjacent_blanks(x, y), 1
+
+
+def _setup_check_win():
+    g, _ = _open_board()
+    return g._check_win, 20
+
+
+# returns the benchmarks as (name, setup) pairs
+def _benchmarks() -> [(str, callable)]:
+    benchmarks = []
+    for items, length in ((1, 8), (2, 8), (3, 8), (4, 8), (3, 12), (5, 12)):
+        benchmarks.append(("permute " + str(items) + "/" + str(length),
+                           lambda items=items, length=length: _setup_permute(items, length)))
+
+    benchmarks += [
+        ("update grid 16x16", _setup_update_grid),
+        ("logic wave 16x16", _setup_logic_wave),
+        ("prob wave 16x16", _setup_prob_wave),
+        ("reveal blanks 30x30", _setup_reveal),
+        ("check win 30x30", _setup_check_win),
+    ]
+
+    return benchmarks
+
+
+# times every benchmark whose name contains the filter
+# returns {name: fastest time of one call in seconds}
+def run(repeat: int = REPEAT, name_filter: str = "") -> {str: float}:
+    results = {}
+    for name, setup in _benchmarks():
+        if name_filter not in name:
+            continue
+
+        best = None
+        for _ in range(repeat):
+            # collections during the timed calls would be charged to whichever benchmark triggered them
+            gc.collect()
+            gc.disable()
+            work, number = setup()
+
+            start = time.perf_counter()
+            for _ in range(number):
+                work()
+            elapsed = (time.perf_counter() - start) / number
+            gc.enable()
+
+            if best is None or elapsed < best:
+                best = elapsed
+
+        results[name] = best
+
+    return results
+
+
+# compares results to a baseline
+# returns [(name, seconds, baseline seconds or None, ratio or None, is_regression)]
+def compare(results: {str: float}, baseline: {str: float}, tolerance: float = DEFAULT_TOLERANCE) \
+        -> [(str, float, float, float, bool)]:
+    rows = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, seconds, None, None, False))
+            continue
+
+        ratio = seconds / base
+        rows.append((name, seconds, base, ratio, ratio > 1 + tolerance))
+
+    return rows
+
+
+# returns the saved baseline, or an empty baseline if there is none
+def _load_baseline(path: str) -> {str: float}:
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as file:
+        data = json.load(file)
+
+    if data.get("version") != _FORMAT_VERSION:
+        return {}
+
+    return data["results"]
+
+
+# saves results as the baseline, keeping the baseline of benchmarks that were not run
+def _save_baseline(path: str, results: {str: float}):
+    baseline = _load_baseline(path)
+    baseline.update(results)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, 'w') as file:
+        json.dump({"version": _FORMAT_VERSION, "results": baseline}, file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the hot paths of the game and solver")
+    parser.add_argument("filter", nargs="?", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_PATH, help="file holding the baseline")
+    parser.add_argument("--save", action="store_true", help="save this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="fraction a benchmark may be slower than its baseline before the run fails")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="times each benchmark is timed")
+    parser.add_argument("--json", action="store_true", help="print the comparison as json")
+    args = parser.parse_args()
+
+    result = run(args.repeat, args.filter)
+    rows = compare(result, _load_baseline(args.baseline), args.tolerance)
+
+    if args.json:
+        print(json.dumps([{"name": name, "us": seconds * 1e6,
+                           "baseline_us": None if base is None else base * 1e6,
+                           "ratio": ratio, "regression": regression}
+                          for name, seconds, base, ratio, regression in rows], indent=2))
+    else:
+        print(f"{'benchmark':<22} {'time us':>10} {'baseline us':>12} {'ratio':>7}")
+        for name, seconds, base, ratio, regression in rows:
+            if base is None:
+                print(f"{name:<22} {seconds * 1e6:>10.1f} {'-':>12} {'-':>7}")
+            else:
+                print(f"{name:<22} {seconds * 1e6:>10.1f} {base * 1e6:>12.1f} {ratio:>7.2f}"
+                      + ("  SLOWER" if regression else ""))
+
+    if args.save:
+        _save_baseline(args.baseline, result)
+    elif any(row[4] for row in rows):
+        sys.exit(1)
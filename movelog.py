@@ -0,0 +1,373 @@
+# Created on 18 Oct 2026
+# This file records the moves of games of mines in a compact binary log and replays them
+
+"""
+Records every click on a game.Game in an append-only binary log and rebuilds the game after any move
+
+A Recorder wraps the clicks of one game and appends them to a log file. Many games can be appended to the
+same log one after another. A game that has no seed is given one by the recorder before its first click so
+that its board can be placed again. A Replayer reads a log and returns the game after any step of any
+recorded game. It keeps a copy of the game every checkpoint_interval steps, so a step is found by replaying
+from the nearest checkpoint instead of from the start of the game.
+
+Log format (a stream of little endian u16 codes):
+    * game header: 0xFFFF, size, mines, number of layout mines, the seed as a signed 64 bit integer
+      (4 codes), then the x * size + y index of every layout mine
+    * click: (x * size + y) * 2 + 1 for a left click or (x * size + y) * 2 for a right click
+    * batch: 0xFFFE, number of clicks, then the clicks of one game.Game.apply_moves call (chords are batches)
+
+A log is 16 bytes per game plus 2 bytes per click. A log cut short by a crash is read up to its last whole
+click.
+
+Public objects:
+    * Class movelog.Recorder
+    * Class movelog.GameRecord
+    * Class movelog.Replayer
+
+Exceptions:
+    * movelog.MoveLogError
+"""
+
+import argparse
+import array
+import pickle
+import random
+import struct
+import sys
+import game
+import observation
+import tile
+
+_GAME = 0xFFFF
+_BATCH = 0xFFFE
+
+# header after the game code: size, mines, number of layout mines and the seed
+_HEADER = struct.Struct("<HHHq")
+_HEADER_CODES = _HEADER.size // 2
+
+_COVERED: int = tile.State.covered.value
+
+
+class MoveLogError(game.Error):
+    """
+Raised when a game cannot be recorded or a log cannot be replayed
+
+Attributes:
+    message -- explanation of the error
+    """
+    def __init__(self, message):
+        self.message = message
+
+
+# returns true if no tile of the game has been revealed or marked
+def _untouched(g: game.Game) -> bool:
+    states = g.get_state_view()
+    return states.tobytes().count(_COVERED) == len(states)
+
+
+class Recorder:
+    """
+This class appends every click on a game to a log file
+
+constructor parameters -> g: game.Game, path: str
+the game must not have been clicked yet. it may be reset and played again any number of times
+
+# writes the clicks that are still buffered to the file
+self.flush(self):
+
+# stops recording the game and closes the file
+self.close(self):
+    """
+
+    def __init__(self, g: game.Game, path: str):
+        if not _untouched(g):
+            raise MoveLogError("A game must be recorded from before its first click")
+
+        self.game = g
+        self._file = open(path, "ab")
+
+        # true until the header of the current game is written
+        self._pending = True
+
+        # true if the recorder gave the current game its seed
+        self._seeded = False
+
+        # codes of the clicks of an apply_moves call that is running
+        self._batch: [int] = None
+
+        # the clicks of the game are recorded by replacing the methods in game.Game.RECORDED_METHODS on the instance
+        self._left = g.left_mouse_button
+        self._right = g.right_mouse_button
+        self._apply_moves = g.apply_moves
+        self._reset = g.reset
+        g.left_mouse_button = self._left_mouse_button
+        g.right_mouse_button = self._right_mouse_button
+        g.apply_moves = self._apply_moves_batch
+        g.reset = self._reset_game
+
+    # writes the clicks that are still buffered to the file
+    def flush(self):
+        self._file.flush()
+
+    # stops recording the game and closes the file
+    def close(self):
+        for name in game.Game.RECORDED_METHODS:
+            if name in vars(self.game):
+                delattr(self.game, name)
+
+        self._file.close()
+
+    # records a left click
+    def _left_mouse_button(self, x: int, y: int):
+        self._click(self._left, x, y, 1)
+
+    # records a right click
+    def _right_mouse_button(self, x: int, y: int):
+        self._click(self._right, x, y, 0)
+
+    # plays a click and writes its code once the game has started
+    def _click(self, click, x: int, y: int, left: int):
+        if self._batch is not None:
+            click(x, y)
+            self._batch.append((x * self.game.get_size() + y) * 2 + left)
+            return
+
+        self._seed()
+        click(x, y)
+        if self._started():
+            self._file.write(struct.pack("<H", (x * self.game.get_size() + y) * 2 + left))
+
+    # records the clicks of a batch together so that the win is checked once when they are replayed
+    def _apply_moves_batch(self, moves: [(int, int, bool)]):
+        self._seed()
+        self._batch = []
+        try:
+            self._apply_moves(moves)
+        finally:
+            codes = self._batch
+            self._batch = None
+
+            if len(codes) > 0 and self._started():
+                self._file.write(struct.pack("<HH", _BATCH, len(codes)) + array.array('H', codes).tobytes())
+
+    # starts a new game in the log at the next click
+    def _reset_game(self):
+        self._reset()
+        if self._seeded:
+            self.game.set_seed(None)
+        self._seeded = False
+        self._pending = True
+
+    # gives the game a seed before its board is placed if it has none
+    def _seed(self):
+        if self._pending and self.game.get_seed() is None:
+            self.game.set_seed(random.getrandbits(63))
+            self._seeded = True
+
+    # writes the header of the game when a click first changes its board. returns true once it is written
+    def _started(self) -> bool:
+        if not self._pending:
+            return True
+
+        g = self.game
+        if _untouched(g):
+            # clicks on a game that has not begun do nothing
+            return False
+
+        seed = g.get_seed()
+        if not -2 ** 63 <= seed < 2 ** 63:
+            raise MoveLogError("Seed " + str(seed) + " does not fit in 64 bits")
+
+        layout = [x * g.get_size() + y for x, y in g.get_layout() or []]
+
+        self._file.write(struct.pack("<H", _GAME) + _HEADER.pack(g.get_size(), g.get_mines(), len(layout), seed)
+                         + array.array('H', layout).tobytes())
+        self._pending = False
+        return True
+
+
+class GameRecord:
+    """
+This class holds one recorded game
+
+# size, mines, seed and layout (mine positions or None) the board was placed with
+self.size: int
+self.mines: int
+self.seed: int
+self.layout: [(int, int)]
+
+# the clicks of every step. a step is one click or the clicks of one apply_moves call
+self.steps: [[(int, int, bool)]]
+
+# true for the steps that were an apply_moves call
+self.batches: [bool]
+
+# returns a new game set up like the recorded one before its first click
+self.new_game(self) -> game.Game:
+
+# applies a step to a game
+self.apply(self, g: game.Game, step: int):
+    """
+
+    def __init__(self, size: int, mines: int, seed: int, layout: [(int, int)]):
+        self.size = size
+        self.mines = mines
+        self.seed = seed
+        self.layout = layout
+        self.steps: [[(int, int, bool)]] = []
+        self.batches: [bool] = []
+
+    # returns a new game set up like the recorded one before its first click
+    def new_game(self) -> game.Game:
+        g = game.Game()
+        g.set_size(self.size)
+        g.set_mines(self.mines)
+        g.set_seed(self.seed)
+        if self.layout is not None:
+            g.set_layout(self.layout)
+        g.begin()
+        return g
+
+    # applies a step to a game
+    def apply(self, g: game.Game, step: int):
+        if self.batches[step]:
+            g.apply_moves(self.steps[step])
+            return
+
+        x, y, left = self.steps[step][0]
+        if left:
+            g.left_mouse_button(x, y)
+        else:
+            g.right_mouse_button(x, y)
+
+
+class Replayer:
+    """
+This class reads a log and rebuilds its games after any step
+
+constructor parameters -> path: str, checkpoint_interval: int = 32
+
+# returns the number of games in the log
+self.games(self) -> int:
+
+# returns a recorded game
+self.record(self, index: int) -> GameRecord:
+
+# returns a new game as it was after the given number of steps of a recorded game
+# None or a number past the end gives the game after its last step
+self.game_at(self, index: int, step: int = None) -> game.Game:
+
+# number of bytes and clicks read from the log
+self.bytes: int
+self.clicks: int
+    """
+
+    def __init__(self, path: str, checkpoint_interval: int = 32):
+        if checkpoint_interval < 1:
+            raise MoveLogError("The checkpoint interval must be at least 1")
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        self.checkpoint_interval = checkpoint_interval
+        self.bytes: int = len(data)
+        self.clicks: int = 0
+        self._records: [GameRecord] = []
+
+        # pickled copies of each game every checkpoint_interval steps
+        self._checkpoints: {int: [bytes]} = {}
+
+        self._read(data[:len(data) // 2 * 2])
+
+    # returns the number of games in the log
+    def games(self) -> int:
+        return len(self._records)
+
+    # returns a recorded game
+    def record(self, index: int) -> GameRecord:
+        return self._records[index]
+
+    # returns a new game as it was after the given number of steps of a recorded game
+    def game_at(self, index: int, step: int = None) -> game.Game:
+        record = self._records[index]
+        if step is None or step > len(record.steps):
+            step = len(record.steps)
+        if step < 0:
+            raise MoveLogError("Step " + str(step) + " is before the start of the game")
+
+        checkpoints = self._checkpoints.setdefault(index, [])
+        if len(checkpoints) == 0:
+            checkpoints.append(pickle.dumps(record.new_game()))
+
+        # the game is replayed from the nearest checkpoint and new checkpoints are kept on the way
+        current = min(step // self.checkpoint_interval, len(checkpoints) - 1) * self.checkpoint_interval
+        g = pickle.loads(checkpoints[current // self.checkpoint_interval])
+        while current < step:
+            record.apply(g, current)
+            current += 1
+            if current % self.checkpoint_interval == 0 and current // self.checkpoint_interval == len(checkpoints):
+                checkpoints.append(pickle.dumps(g))
+
+        return g
+
+    # reads the games of a log. a game, batch or click cut short at the end is left out
+    def _read(self, data: bytes):
+        codes = array.array('H', data)
+        if sys.byteorder == "big":
+            codes.byteswap()
+
+        record: GameRecord = None
+        position = 0
+        while position < len(codes):
+            code = codes[position]
+            if code == _GAME:
+                if position + 1 + _HEADER_CODES > len(codes):
+                    break
+                size, mines, count, seed = _HEADER.unpack_from(data, 2 * (position + 1))
+                position += 1 + _HEADER_CODES
+                if position + count > len(codes):
+                    break
+
+                layout = [divmod(index, size) for index in codes[position:position + count]] if count > 0 else None
+                position += count
+                record = GameRecord(size, mines, seed, layout)
+                self._records.append(record)
+                continue
+
+            if record is None:
+                raise MoveLogError("The log does not start with a game")
+
+            if code == _BATCH:
+                if position + 2 > len(codes) or position + 2 + codes[position + 1] > len(codes):
+                    break
+                batch = codes[position + 2:position + 2 + codes[position + 1]]
+                position += 2 + len(batch)
+                record.steps.append([(*divmod(value >> 1, record.size), bool(value & 1)) for value in batch])
+                record.batches.append(True)
+                self.clicks += len(batch)
+                continue
+
+            record.steps.append([(*divmod(code >> 1, record.size), bool(code & 1))])
+            record.batches.append(False)
+            self.clicks += 1
+            position += 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise a move log or show a game after any step")
+    parser.add_argument("log", help="path of the move log")
+    parser.add_argument("--game", type=int, default=None, help="index of the game to show")
+    parser.add_argument("--step", type=int, default=None, help="number of steps to replay. the last one by default")
+    args = parser.parse_args()
+
+    replayer = Replayer(args.log)
+    if args.game is None:
+        won = sum(replayer.game_at(index).victory() for index in range(replayer.games()))
+        print(str(replayer.games()) + " games (" + str(won) + " won), " + str(replayer.clicks) + " clicks in "
+              + str(replayer.bytes) + " bytes")
+    else:
+        recorded = replayer.record(args.game)
+        g = replayer.game_at(args.game, args.step)
+        print("game " + str(args.game) + ": " + str(recorded.size) + "x" + str(recorded.size) + "/"
+              + str(recorded.mines) + " seed " + str(recorded.seed) + ", " + str(len(recorded.steps)) + " steps")
+        print("\n".join(observation.Observation.of(g).to_rows()))
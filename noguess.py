@@ -0,0 +1,208 @@
+# Created on 18 Oct 2026
+# This file generates boards of mines that can be solved from the first click without guessing
+
+"""
+Generates boards of mines that the solver clears from the first click using only moves it can prove
+
+Candidate boards are seeded games whose mines are placed by game.Game itself, so the first click at the
+centre of the board and everything next to it is always safe. Each candidate is played with the moves that
+Solver.next_moves proves, from the logic rules, the pattern table and the exact probability analysis.
+A candidate is rejected as soon as the solver has no proven move left, so boards that need a guess early
+are thrown away early. Candidates are checked across a pool of processes in rounds, and generation stops
+after the round that finds enough boards.
+
+Boards are kept in seed order, so the same seed, configuration and count always give the same boards.
+Each board is a json compatible dict {"size", "mines", "seed", "first_click": [x, y], "layout": [[x, y], ...]}
+that can also be given to the solver batch mode.
+
+The report holds the boards returned, the candidates checked, the share of candidates that needed no guess,
+and the no-guess boards and candidates checked per second of every configuration.
+
+Constants:
+    * noguess.DEFAULT_CONFIGS
+
+Public objects:
+    * Function noguess.no_guess_layout
+    * Function noguess.generate
+    * Function noguess.run
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+import game
+import patterns
+import solver
+import tile
+
+DEFAULT_CONFIGS = ((8, 10), (16, 40), (25, 99))
+
+# candidates checked by each process in a round
+_ROUND_CHUNK = 16
+
+# pattern table of the worker process. loaded once and shared by every candidate the process checks
+_pattern_table: patterns.PatternTable = None
+
+
+# loads the pattern table of a worker process
+def _init_worker(pattern_path: str):
+    global _pattern_table
+    if pattern_path is None:
+        _pattern_table = patterns.PatternTable()
+    else:
+        _pattern_table = patterns.PatternTable.load(pattern_path)
+
+
+# returns the mine positions of a seeded board if the solver clears it from a click at the centre using only
+# proven moves, or None as soon as it needs a guess
+def no_guess_layout(size: int, mines: int, seed: int, pattern_table: patterns.PatternTable = None) -> [(int, int)]:
+    g = game.Game()
+    g.set_size(size)
+    g.set_mines(mines)
+    g.set_seed(seed)
+    g.begin()
+
+    analysis = solver.Solver(g, pattern_table)
+    g.left_mouse_button(size // 2, size // 2)
+
+    while not g.game_done():
+        moves = analysis.next_moves(g)
+        if len(moves) == 0 or moves[0].certainty < 100:
+            return None
+
+        g.apply_moves([(move.x, move.y, move.left) for move in moves])
+
+    if not g.victory():
+        return None
+
+    # every mine is flagged once the game is won
+    states = g.get_state_view()
+    return [divmod(index, size) for index in range(len(states)) if states[index] == tile.State.flag.value]
+
+
+# checks one candidate in a worker process
+def _check_task(task: (int, int, int)) -> (int, [(int, int)]):
+    size, mines, seed = task
+    return seed, no_guess_layout(size, mines, seed, _pattern_table)
+
+
+# returns the board dict of a layout found for a seed
+def _board(size: int, mines: int, seed: int, layout: [(int, int)]) -> dict:
+    return {"size": size, "mines": mines, "seed": seed, "first_click": [size // 2, size // 2],
+            "layout": [list(position) for position in layout]}
+
+
+# checks candidates with seeds from seed up across the pool until count boards are found or max_candidates
+# have been checked. returns the first count boards in seed order, the number of candidates checked and the
+# number of them that needed no guess, which counts the boards of the last round past count too
+def _generate(pool: multiprocessing.Pool, processes: int, size: int, mines: int, count: int, seed: int,
+              max_candidates: int) -> ([dict], int, int):
+    boards: [dict] = []
+    checked = 0
+    accepted = 0
+    while len(boards) < count and checked < max_candidates:
+        round_size = min(processes * _ROUND_CHUNK, max_candidates - checked)
+        tasks = [(size, mines, seed + checked + k) for k in range(round_size)]
+        for board_seed, layout in pool.imap(_check_task, tasks, chunksize=_ROUND_CHUNK):
+            if layout is None:
+                continue
+            accepted += 1
+            if len(boards) < count:
+                boards.append(_board(size, mines, board_seed, layout))
+        checked += round_size
+
+    return boards, checked, accepted
+
+
+# returns count no-guess boards of the given size and mines, found from seed up across a pool of processes
+# fewer are returned if max_candidates seeds are checked first
+def generate(size: int, mines: int, count: int, seed: int = 0, processes: int = None,
+             pattern_path: str = patterns.DEFAULT_PATH, max_candidates: int = 100000) -> [dict]:
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(pattern_path,)) as pool:
+        return _generate(pool, processes, size, mines, count, seed, max_candidates)[0]
+
+
+# generates count boards for every (size, mines) configuration
+# returns the report as a json compatible dict. the boards are added if boards is true
+def run(configs: [(int, int)] = DEFAULT_CONFIGS, count: int = 100, seed: int = 0, processes: int = None,
+        pattern_path: str = patterns.DEFAULT_PATH, max_candidates: int = 100000, boards: bool = False) -> dict:
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    report = {"count": count, "seed": seed, "processes": processes, "configs": []}
+
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(pattern_path,)) as pool:
+        for size, mines in configs:
+            start = time.perf_counter()
+            found, checked, accepted = _generate(pool, processes, size, mines, count, seed, max_candidates)
+            seconds = time.perf_counter() - start
+
+            report["configs"].append({
+                "size": size,
+                "mines": mines,
+                "boards": len(found),
+                "candidates": checked,
+                "acceptance": accepted / checked if checked > 0 else 0.0,
+                "seconds": seconds,
+                "boards_per_second": accepted / seconds,
+                "candidates_per_second": checked / seconds,
+            })
+
+            if boards:
+                report["configs"][-1]["layouts"] = found
+
+    return report
+
+
+# prints a report as a table
+def _print_report(report: dict):
+    print("boards: " + str(report["count"]) + " per configuration, seeds from " + str(report["seed"])
+          + ", processes: " + str(report["processes"]))
+    print(f"{'board':>12} {'found':>7} {'checked':>9} {'kept':>7} {'seconds':>9} {'boards/s':>9} {'checked/s':>10}")
+
+    for config in report["configs"]:
+        board = str(config["size"]) + "x" + str(config["size"]) + "/" + str(config["mines"])
+        print(f"{board:>12} {config['boards']:>7} {config['candidates']:>9} {config['acceptance']:>7.1%}"
+              f" {config['seconds']:>9.2f} {config['boards_per_second']:>9.1f} {config['candidates_per_second']:>10.1f}")
+
+
+# returns a (size, mines) configuration parsed from text of the form size,mines
+def _config(text: str) -> (int, int):
+    size, mines = text.split(",")
+    return int(size), int(mines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate boards that can be solved without guessing")
+    parser.add_argument("--count", type=int, default=100, help="boards to find for each configuration")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first candidate of each configuration")
+    parser.add_argument("--config", type=_config, action="append",
+                        help="size,mines of a configuration to generate. may be given more than once")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes. defaults to the cpu count")
+    parser.add_argument("--max-candidates", type=int, default=100000,
+                        help="candidates to check for each configuration before giving up")
+    parser.add_argument("--no-patterns", action="store_true",
+                        help="start every worker with an empty pattern table instead of the saved one")
+    parser.add_argument("--output", default=None, metavar="PATH", help="write the boards to a file as json lines")
+    parser.add_argument("--json", action="store_true", help="print the report as json")
+    args = parser.parse_args()
+
+    configs = args.config if args.config is not None else DEFAULT_CONFIGS
+    pattern_path = None if args.no_patterns else patterns.DEFAULT_PATH
+    result = run(configs, args.count, args.seed, args.processes, pattern_path, args.max_candidates,
+                 args.output is not None)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            for config in result["configs"]:
+                for board in config.pop("layouts"):
+                    file.write(json.dumps(board) + "\n")
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result)
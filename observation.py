@@ -0,0 +1,194 @@
+# Created on 18 Oct 2026
+# This file describes what is known about a board of mines without the game behind it
+
+"""
+Defines the Observation class that holds the known tiles of a board and its number of mines
+
+An observation can be given to a solver.Solver in place of a game.Game to analyse boards from logs,
+other front-ends or screenshots. Tiles are indexed as x * size + y like the views of a game.
+
+Row format (one string per row from the top, one character per tile from the left):
+    * '#' covered tile
+    * 'F' flagged tile
+    * '?' tile marked unknown
+    * '.' or '0' blank visible tile
+    * '1' - '8' visible number
+    * '*' visible mine
+
+Public objects:
+    * Class observation.Observation
+    * Function observation.tile_char
+
+Exceptions:
+    * observation.ObservationError
+"""
+
+import array
+import game
+import tile
+
+_COVERED: int = tile.State.covered.value
+_FLAG: int = tile.State.flag.value
+_UNKNOWN: int = tile.State.unknown.value
+_VISIBLE: int = tile.State.visible.value
+
+# state code of every row character that is not a number
+_ROW_STATES = {'#': _COVERED, 'F': _FLAG, '?': _UNKNOWN, '.': _VISIBLE}
+
+# row character of every state code that is not visible
+_STATE_CHARS = {_COVERED: '#', _FLAG: 'F', _UNKNOWN: '?'}
+
+
+# returns the row character of a tile with the given state code and visible value
+def tile_char(state: int, value: int) -> str:
+    if state != _VISIBLE:
+        return _STATE_CHARS[state]
+    if value == tile.BLANK:
+        return '.'
+    if value == tile.MINE:
+        return '*'
+    return str(value)
+
+
+class ObservationError(game.Error):
+    """
+Raised when an observation does not describe a square board
+
+Attributes:
+    message -- explanation of the error
+    """
+    def __init__(self, message):
+        self.message = message
+
+
+class Observation:
+    """
+This class holds the known tiles of a board of mines and its number of mines
+
+constructor parameters -> size: int, mines: int, states: bytes, values: bytes
+states holds the tile.State value of every tile and values the signed number of every visible tile
+
+# returns an observation of the game as it is now
+Observation.of(g: game.Game) -> Observation:
+
+# returns an observation of the visible numbers and flags of a board
+# values[x][y] is the number of a visible tile or None if it is not visible. flags[x][y] is true for a flag
+Observation.from_known(values: [[int]], flags: [[bool]], mines: int) -> Observation:
+
+# returns an observation read from rows of text
+Observation.from_rows(rows: [str], mines: int) -> Observation:
+
+# returns the observation as rows of text
+self.to_rows(self) -> [str]:
+
+self.get_size(self) -> int: returns the size of the board
+
+self.get_mines(self) -> int: returns the number of mines
+
+self.get_flags(self) -> int: returns the number of flags placed
+
+self.get_state_view(self) -> memoryview: returns a read-only view of every tile state code (tile.State.value)
+
+self.get_value_view(self) -> memoryview: returns a read-only view of every visible tile value (0 if not visible)
+    """
+
+    def __init__(self, size: int, mines: int, states: bytes, values: bytes):
+        if len(states) != size * size or len(values) != size * size:
+            raise ObservationError("An observation of a board of size " + str(size) + " needs "
+                                   + str(size * size) + " states and values")
+
+        self._size = size
+        self._mines = mines
+        self._states = bytes(states)
+        self._values = array.array('b', bytes(values))
+        self._flags = self._states.count(_FLAG)
+
+        self._state_view = memoryview(self._states)
+        self._value_view = memoryview(self._values).toreadonly()
+
+    # returns an observation of the game as it is now
+    @staticmethod
+    def of(g: game.Game):
+        return Observation(g.get_size(), g.get_mines(), g.get_state_view(), g.get_value_view().cast('B'))
+
+    # returns an observation of the visible numbers and flags of a board
+    # values[x][y] is the number of a visible tile or None if it is not visible. flags[x][y] is true for a flag
+    @staticmethod
+    def from_known(values: [[int]], flags: [[bool]], mines: int):
+        size = len(values)
+        if len(flags) != size or any(len(column) != size for column in values) \
+                or any(len(column) != size for column in flags):
+            raise ObservationError("Values and flags must both be square and the same size")
+
+        states = bytearray(size * size)
+        numbers = array.array('b', bytes(size * size))
+        for x in range(size):
+            for y in range(size):
+                index = x * size + y
+                if values[x][y] is not None:
+                    states[index] = _VISIBLE
+                    numbers[index] = values[x][y]
+                elif flags[x][y]:
+                    states[index] = _FLAG
+                else:
+                    states[index] = _COVERED
+
+        return Observation(size, mines, states, numbers.tobytes())
+
+    # returns an observation read from rows of text
+    @staticmethod
+    def from_rows(rows: [str], mines: int):
+        size = len(rows)
+        if any(len(row) != size for row in rows):
+            raise ObservationError("Every row must have one character for each of the " + str(size) + " rows")
+
+        states = bytearray(size * size)
+        numbers = bytearray(size * size)
+        for y in range(size):
+            for x in range(size):
+                char = rows[y][x]
+                index = x * size + y
+                if char in _ROW_STATES:
+                    states[index] = _ROW_STATES[char]
+                elif '0' <= char <= '8':
+                    states[index] = _VISIBLE
+                    numbers[index] = int(char)
+                elif char == '*':
+                    states[index] = _VISIBLE
+                    numbers[index] = tile.MINE & 0xFF
+                else:
+                    raise ObservationError("Unknown tile " + repr(char) + " at " + str((x, y)))
+
+        return Observation(size, mines, states, numbers)
+
+    # returns the observation as rows of text
+    def to_rows(self) -> [str]:
+        rows = []
+        for y in range(self._size):
+            row = []
+            for x in range(self._size):
+                index = x * self._size + y
+                row.append(tile_char(self._states[index], self._values[index]))
+            rows.append(''.join(row))
+
+        return rows
+
+    # returns the size of the board
+    def get_size(self) -> int:
+        return self._size
+
+    # returns the number of mines
+    def get_mines(self) -> int:
+        return self._mines
+
+    # returns the number of flags placed
+    def get_flags(self) -> int:
+        return self._flags
+
+    # returns a read-only view of every tile state code (tile.State.value) indexed as x * size + y
+    def get_state_view(self) -> memoryview:
+        return self._state_view
+
+    # returns a read-only view of every visible tile value indexed as x * size + y
+    def get_value_view(self) -> memoryview:
+        return self._value_view
@@ -0,0 +1,271 @@
+# Created on 18 Oct 2026
+# This file defines a lookup table of local board patterns and the moves they force
+
+"""
+Defines the PatternTable class that maps small windows of a known board to the moves they force
+
+A window is a WINDOW x WINDOW square of the known board centred on a frontier tile.
+Windows are reduced under the 8 rotations and reflections of the square so that every
+orientation of a pattern shares a single entry. Entries are learned the first time a
+window is seen and can be saved to and loaded from disk. Only windows that force a move
+are kept as entries. Windows that force nothing are remembered in a bounded set that is
+never saved, so the table only grows with useful patterns.
+
+Window encoding (one character per tile, x major):
+    * 'c' covered tile
+    * 'f' flagged tile
+    * 'x' tile that cannot be a mine and has no useful number (off the board or an outer visible tile)
+    * '0' - '8' visible tile in the inner ring of the window
+
+Constants:
+    * patterns.WINDOW = 5
+    * patterns.DEFAULT_PATH
+
+Public objects:
+    * Class patterns.PatternTable
+"""
+
+import json
+import os
+
+WINDOW = 5
+DEFAULT_PATH = "assets/patterns/table.json"
+
+COVERED = 'c'
+FLAG = 'f'
+BLOCKED = 'x'
+
+_FORMAT_VERSION = 1
+
+# canonical windows that force no move remembered before the set is cleared
+_EMPTY_LIMIT = 65536
+
+
+# returns the window index of the tile at the given window coordinates
+def _index(a: int, b: int) -> int:
+    return a * WINDOW + b
+
+
+# builds the 8 symmetries of the window as index permutations
+# permutation[i] is the index in the original window that lands on index i
+def _gen_symmetries() -> [(int,)]:
+    last = WINDOW - 1
+    transforms = [
+        lambda a, b: (a, b),
+        lambda a, b: (last - a, b),
+        lambda a, b: (a, last - b),
+        lambda a, b: (last - a, last - b),
+        lambda a, b: (b, a),
+        lambda a, b: (last - b, a),
+        lambda a, b: (b, last - a),
+        lambda a, b: (last - b, last - a),
+    ]
+
+    symmetries = []
+    for transform in transforms:
+        permutation = []
+        for a in range(WINDOW):
+            for b in range(WINDOW):
+                permutation.append(_index(*transform(a, b)))
+        symmetries.append(tuple(permutation))
+
+    return symmetries
+
+
+_SYMMETRIES = _gen_symmetries()
+
+# window indices of the tiles whose numbers are fully contained in the window
+_INNER = tuple(_index(a, b) for a in range(1, WINDOW - 1) for b in range(1, WINDOW - 1))
+
+# window indices adjacent to each window index
+_ADJACENT = tuple(
+    tuple(_index(i, j)
+          for i in range(a - 1, a + 2)
+          for j in range(b - 1, b + 2)
+          if 0 <= i < WINDOW and 0 <= j < WINDOW and not (i == a and j == b))
+    for a in range(WINDOW) for b in range(WINDOW)
+)
+
+
+# returns the canonical form of a window and the permutation that produced it
+def _canonicalize(window: str) -> (str, (int,)):
+    best_key = None
+    best_permutation = None
+    for permutation in _SYMMETRIES:
+        key = ''.join([window[i] for i in permutation])
+        if best_key is None or key < best_key:
+            best_key = key
+            best_permutation = permutation
+
+    return best_key, best_permutation
+
+
+# finds every tile of a canonical window that is a mine in all or none of its arrangements
+# only the numbers in the inner ring are used since all of their neighbours are in the window
+# returns a list of (window index, is_mine) pairs
+def _deduce(key: str) -> [(int, bool)]:
+    # constraints are [remaining mines, covered tiles] for each inner number
+    constraints = []
+    for centre in _INNER:
+        if not key[centre].isdigit():
+            continue
+
+        remaining = int(key[centre])
+        covered = []
+        for neighbour in _ADJACENT[centre]:
+            if key[neighbour] == FLAG:
+                remaining -= 1
+            elif key[neighbour] == COVERED:
+                covered.append(neighbour)
+
+        if remaining < 0 or remaining > len(covered):
+            return []
+        if len(covered) > 0:
+            constraints.append((remaining, covered))
+
+    if len(constraints) == 0:
+        return []
+
+    variables = []
+    for _, covered in constraints:
+        for item in covered:
+            if item not in variables:
+                variables.append(item)
+
+    # constraints that each variable takes part in
+    membership = {item: [] for item in variables}
+    for c in range(len(constraints)):
+        for item in constraints[c][1]:
+            membership[item].append(c)
+
+    # mines placed and tiles left to assign in each constraint
+    placed = [0] * len(constraints)
+    unassigned = [len(covered) for _, covered in constraints]
+
+    seen_mine = [False] * len(variables)
+    seen_safe = [False] * len(variables)
+    assignment = [False] * len(variables)
+
+    def assign(index: int):
+        if index == len(variables):
+            for v in range(len(variables)):
+                if assignment[v]:
+                    seen_mine[v] = True
+                else:
+                    seen_safe[v] = True
+            return
+
+        for is_mine in (False, True):
+            valid = True
+            for c in membership[variables[index]]:
+                placed[c] += is_mine
+                unassigned[c] -= 1
+            for c in membership[variables[index]]:
+                remaining = constraints[c][0]
+                if placed[c] > remaining or placed[c] + unassigned[c] < remaining:
+                    valid = False
+                    break
+
+            if valid:
+                assignment[index] = is_mine
+                assign(index + 1)
+
+            for c in membership[variables[index]]:
+                placed[c] -= is_mine
+                unassigned[c] += 1
+
+    assign(0)
+
+    forced = []
+    for v in range(len(variables)):
+        if seen_mine[v] != seen_safe[v]:
+            forced.append((variables[v], seen_mine[v]))
+
+    return forced
+
+
+class PatternTable:
+    """
+This class stores the moves forced by canonical windows of the known board
+
+# returns the moves forced by a window as (window index, is_mine) pairs in the given window's orientation
+self.lookup(self, window: str) -> [(int, bool)]:
+
+# writes the table to disk as json
+self.save(self, path: str = DEFAULT_PATH):
+
+# returns a table read from disk, or an empty table if the file does not exist
+PatternTable.load(path: str = DEFAULT_PATH) -> PatternTable:
+    """
+
+    def __init__(self):
+        # canonical window -> list of (window index, is_mine) in canonical orientation
+        # only windows that force at least one move are entries
+        self._table: {str: [(int, bool)]} = {}
+
+        # canonical windows that force no move. cleared once it holds _EMPTY_LIMIT windows
+        self._empty: {str} = set()
+
+        # true if entries were learned since the table was loaded or saved
+        self.dirty = False
+
+    def __len__(self):
+        return len(self._table)
+
+    # returns the moves forced by a window as (window index, is_mine) pairs in the given window's orientation
+    def lookup(self, window: str) -> [(int, bool)]:
+        key, permutation = _canonicalize(window)
+
+        moves = self._table.get(key)
+        if moves is None:
+            if key in self._empty:
+                return []
+
+            moves = _deduce(key)
+            if len(moves) == 0:
+                if len(self._empty) >= _EMPTY_LIMIT:
+                    self._empty.clear()
+                self._empty.add(key)
+                return []
+
+            self._table[key] = moves
+            self.dirty = True
+
+        return [(permutation[i], is_mine) for i, is_mine in moves]
+
+    # writes the table to disk as json
+    def save(self, path: str = DEFAULT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # copy the entries first so that a solver in another thread can keep learning
+        entries = list(self._table.items())
+
+        with open(path, 'w') as file:
+            json.dump({"version": _FORMAT_VERSION, "window": WINDOW,
+                       "patterns": {key: [[i, is_mine] for i, is_mine in moves] for key, moves in entries}}, file)
+
+        self.dirty = False
+
+    # returns a table read from disk, or an empty table if the file does not exist
+    @staticmethod
+    def load(path: str = DEFAULT_PATH):
+        table = PatternTable()
+
+        if not os.path.exists(path):
+            return table
+
+        with open(path) as file:
+            data = json.load(file)
+
+        # tables saved with a different format are relearned
+        if data.get("version") != _FORMAT_VERSION or data.get("window") != WINDOW:
+            return table
+
+        # tables saved before empty windows were left out still hold them
+        for key, moves in data["patterns"].items():
+            if len(moves) > 0:
+                table._table[key] = [(i, is_mine) for i, is_mine in moves]
+
+        return table
@@ -0,0 +1,388 @@
+# Created on 18 Oct 2026
+# This file replays games of mines without a window and exports the frames as animations
+
+"""
+Replays a recorded or solver driven game of mines with the Gui drawing code on an offscreen surface
+and streams the frames to a file as fast as they can be drawn
+
+Frames are written as an animated GIF when the output ends in .gif, otherwise as a raw dump of
+RGB24 frames that can be read by other tools (for example ffmpeg -f rawvideo -pix_fmt rgb24).
+
+Recordings are json objects of the form {"size": int, "mines": int, "seed": int, "moves": [[x, y, left], ...]}
+
+Public objects:
+    * Class record.GifWriter
+    * Class record.RawWriter
+    * Function record.solver_moves
+    * Function record.replay
+    * Function record.load_recording
+    * Function record.save_recording
+"""
+
+import argparse
+import json
+import random
+import struct
+import pygame
+import game
+import gui
+import patterns
+import solver
+import tile
+
+# levels of red, green and blue in the colour cube of the GIF palette
+_RED_LEVELS = 6
+_GREEN_LEVELS = 7
+_BLUE_LEVELS = 6
+
+
+# returns a translation table from a colour channel to its level in the colour cube times step
+def _channel_table(levels: int, step: int) -> bytes:
+    return bytes(round(value * (levels - 1) / 255) * step for value in range(256))
+
+
+_RED_TABLE = _channel_table(_RED_LEVELS, _GREEN_LEVELS * _BLUE_LEVELS)
+_GREEN_TABLE = _channel_table(_GREEN_LEVELS, _BLUE_LEVELS)
+_BLUE_TABLE = _channel_table(_BLUE_LEVELS, 1)
+
+
+# returns the 256 colour GIF palette. the first entries are the colour cube the frames are reduced to
+def _palette() -> bytes:
+    palette = bytearray()
+    for red in range(_RED_LEVELS):
+        for green in range(_GREEN_LEVELS):
+            for blue in range(_BLUE_LEVELS):
+                palette += bytes((red * 255 // (_RED_LEVELS - 1), green * 255 // (_GREEN_LEVELS - 1),
+                                  blue * 255 // (_BLUE_LEVELS - 1)))
+
+    return bytes(palette) + bytes(768 - len(palette))
+
+
+# returns the palette index of every pixel of a surface in row major order
+# the three channels are looked up in whole and added as big integers since no sum is larger than a byte
+def _palette_indices(surface: pygame.Surface) -> bytes:
+    pixels = pygame.image.tostring(surface, "RGB")
+    total = (int.from_bytes(pixels[0::3].translate(_RED_TABLE), "little")
+             + int.from_bytes(pixels[1::3].translate(_GREEN_TABLE), "little")
+             + int.from_bytes(pixels[2::3].translate(_BLUE_TABLE), "little"))
+
+    return total.to_bytes(len(pixels) // 3, "little")
+
+
+# compresses palette indices with the variable length LZW code used by GIF images
+# codes are packed into big integers that are converted to bytes at the end
+def _lzw(indices: bytes) -> bytes:
+    clear = 256
+    end = 257
+
+    table: {int: int} = {}
+    next_code = end + 1
+    code_size = 9
+
+    # codes are packed from the lowest bit up and moved into chunks of 4096 bits
+    chunks: [int] = []
+    packed = clear
+    bits = code_size
+
+    prefix = indices[0]
+    for index in indices[1:]:
+        key = prefix << 8 | index
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+
+        packed |= prefix << bits
+        bits += code_size
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+
+            # the decoder is one code behind so it widens the codes one code later
+            if next_code > 1 << code_size and code_size < 12:
+                code_size += 1
+        else:
+            # the code table is full
+            packed |= clear << bits
+            bits += code_size
+            table.clear()
+            next_code = end + 1
+            code_size = 9
+        prefix = index
+
+        # shifting a very large integer is slow so whole bytes are moved into a chunk regularly
+        if bits >= 4096:
+            chunks.append(packed & ((1 << 4096) - 1))
+            packed >>= 4096
+            bits -= 4096
+
+    packed |= prefix << bits
+    bits += code_size
+    packed |= end << bits
+    bits += code_size
+
+    output = b"".join(chunk.to_bytes(512, "little") for chunk in chunks)
+    return output + packed.to_bytes((bits + 7) // 8, "little")
+
+
+class GifWriter:
+    """
+This class streams frames into an animated GIF
+
+Each frame only stores the rectangle that changed since the previous frame and frames that did not change
+extend the time that the previous frame is shown. Colours are reduced to a fixed colour cube.
+
+# adds a frame that is shown for the given number of milliseconds
+self.write(self, surface: pygame.Surface, duration: int):
+
+# writes the last frame and the end of the file
+self.close(self):
+    """
+
+    def __init__(self, path: str, size: (int, int)):
+        self._file = open(path, "wb")
+        self._width, self._height = size
+
+        # palette indices of the last frame that was written and of the frame waiting for its duration
+        self._previous: bytes = None
+        self._pending: (int, int, int, int, bytes) = None
+        self._pending_duration = 0
+
+        self._file.write(b"GIF89a")
+        # global colour table of 256 colours
+        self._file.write(struct.pack("<HHBBB", self._width, self._height, 0xF7, 0, 0))
+        self._file.write(_palette())
+        # loop forever
+        self._file.write(b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+    # adds a frame that is shown for the given number of milliseconds
+    def write(self, surface: pygame.Surface, duration: int):
+        indices = _palette_indices(surface)
+
+        if self._previous is None:
+            changed = (0, 0, self._width, self._height)
+        else:
+            changed = self._changed_rect(indices)
+
+        if changed is None:
+            self._pending_duration += duration
+            return
+
+        self._flush()
+
+        left, top, width, height = changed
+        rows = [indices[row * self._width + left: row * self._width + left + width] for row in range(top, top + height)]
+        self._pending = (left, top, width, height, b"".join(rows))
+        self._pending_duration = duration
+        self._previous = indices
+
+    # writes the last frame and the end of the file
+    def close(self):
+        self._flush()
+        self._file.write(b"\x3B")
+        self._file.close()
+
+    # returns the smallest rectangle that holds every pixel that differs from the previous frame or None
+    def _changed_rect(self, indices: bytes) -> (int, int, int, int):
+        top = -1
+        bottom = -1
+        left = self._width
+        right = -1
+        for row in range(self._height):
+            start = row * self._width
+            old = self._previous[start:start + self._width]
+            new = indices[start:start + self._width]
+            if old == new:
+                continue
+
+            if top == -1:
+                top = row
+            bottom = row
+
+            # the lowest and highest set bits of the difference are the first and last changed pixels
+            difference = int.from_bytes(old, "little") ^ int.from_bytes(new, "little")
+            left = min(left, ((difference & -difference).bit_length() - 1) // 8)
+            right = max(right, (difference.bit_length() - 1) // 8)
+
+        if top == -1:
+            return None
+
+        return left, top, right - left + 1, bottom - top + 1
+
+    # writes the frame that is waiting for its duration
+    def _flush(self):
+        if self._pending is None:
+            return
+
+        left, top, width, height, indices = self._pending
+
+        # graphic control extension with the delay in hundredths of a second, then the image
+        self._file.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 0x04, round(self._pending_duration / 10), 0, 0))
+        self._file.write(struct.pack("<BHHHHB", 0x2C, left, top, width, height, 0))
+        self._file.write(b"\x08")
+
+        data = _lzw(indices)
+        for start in range(0, len(data), 255):
+            block = data[start:start + 255]
+            self._file.write(bytes((len(block),)) + block)
+        self._file.write(b"\x00")
+
+        self._pending = None
+
+
+class RawWriter:
+    """
+This class streams frames into a file as raw RGB24 pixels with no header
+
+# adds a frame that is shown for the given number of milliseconds
+# frames are repeated to fill the duration at the frame rate of the dump
+self.write(self, surface: pygame.Surface, duration: int):
+
+# closes the file
+self.close(self):
+    """
+
+    def __init__(self, path: str, size: (int, int), fps: int):
+        self._file = open(path, "wb")
+        self._frame_time = 1000 / fps
+
+        # number of frames written
+        self.frames = 0
+
+    # adds a frame that is shown for the given number of milliseconds
+    # frames are repeated to fill the duration at the frame rate of the dump
+    def write(self, surface: pygame.Surface, duration: int):
+        pixels = pygame.image.tostring(surface, "RGB")
+        for _ in range(max(1, round(duration / self._frame_time))):
+            self._file.write(pixels)
+            self.frames += 1
+
+    # closes the file
+    def close(self):
+        self._file.close()
+
+
+# yields the moves that the solver makes on a game as (x, y, left) tuples
+# each move must be applied to the game before the next one is asked for
+def solver_moves(g: game.Game, pattern_table: patterns.PatternTable = None):
+    analysis = solver.Solver(g, pattern_table)
+
+    while not g.game_done():
+        batch = [(move.x, move.y, move.left) for move in analysis.next_moves(g)]
+        if len(batch) == 0:
+            return
+
+        for x, y, left in batch:
+            if g.game_done():
+                return
+
+            # skip moves that earlier moves already made
+            if g.get_tile_state(x, y) is tile.State.covered:
+                yield x, y, left
+
+
+# plays moves on the game of a headless gui and writes a frame after every moves_per_frame moves
+# frames are shown for frame_time milliseconds and the last frame for hold milliseconds
+# returns the moves that were played
+def replay(screen: gui.Gui, moves, writer, moves_per_frame: int = 1, frame_time: int = 33,
+           hold: int = 2000, scale: float = 1.0) -> [(int, int, bool)]:
+    # the mouse is kept off the window so that no tile is hovered
+    mouse_pos = (-1, -1)
+    screen.solving = True
+
+    def write_frame(duration: int):
+        screen._draw_screen(mouse_pos)
+        surface = screen.screen
+        if scale != 1.0:
+            surface = pygame.transform.smoothscale(surface, (int(surface.get_width() * scale),
+                                                             int(surface.get_height() * scale)))
+        writer.write(surface, duration)
+
+    played: [(int, int, bool)] = []
+    write_frame(frame_time)
+    for x, y, left in moves:
+        if screen.game.game_done():
+            break
+
+        screen.lastSolvedTile = (x, y)
+        if left:
+            screen.game.left_mouse_button(x, y)
+        else:
+            screen.game.right_mouse_button(x, y)
+        played.append((x, y, left))
+
+        if screen.game.game_done() and not screen.game.victory():
+            screen.failed_tile = (x, y)
+
+        if len(played) % moves_per_frame == 0 and not screen.game.game_done():
+            write_frame(frame_time)
+
+    screen.solving = False
+    write_frame(hold)
+
+    return played
+
+
+# returns a recording read from a json file
+def load_recording(path: str) -> dict:
+    with open(path) as file:
+        recording = json.load(file)
+
+    recording["moves"] = [(x, y, bool(left)) for x, y, left in recording["moves"]]
+    return recording
+
+
+# writes a recording of a game to a json file
+def save_recording(path: str, size: int, mines: int, seed: int, moves: [(int, int, bool)]):
+    with open(path, "w") as file:
+        json.dump({"size": size, "mines": mines, "seed": seed, "moves": [list(move) for move in moves]}, file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a game of mines without a window and save the frames")
+    parser.add_argument("output", help="animated .gif or raw RGB24 frame dump for any other extension")
+    parser.add_argument("--recording", help="json recording to replay. the solver plays a new game if not given")
+    parser.add_argument("--save-recording", help="write the moves that were played to a json recording")
+    parser.add_argument("--size", type=int, default=16, help="width of the board")
+    parser.add_argument("--mines", type=int, default=40, help="number of mines")
+    parser.add_argument("--seed", type=int, default=None, help="seed that places the mines")
+    parser.add_argument("--fps", type=int, default=30, help="frames per second of the animation")
+    parser.add_argument("--moves-per-frame", type=int, default=1, help="moves played between frames")
+    parser.add_argument("--hold", type=int, default=2000, help="milliseconds that the last frame is shown")
+    parser.add_argument("--scale", type=float, default=1.0, help="scale of the frames")
+    args = parser.parse_args()
+
+    if args.recording is not None:
+        recording = load_recording(args.recording)
+        args.size, args.mines, args.seed = recording["size"], recording["mines"], recording["seed"]
+    elif args.seed is None:
+        # a new game is given a seed so that its recording can be replayed
+        args.seed = random.getrandbits(63)
+
+    screen = gui.Gui(headless=True)
+    screen.game.set_seed(args.seed)
+    screen.restart(args.size, args.mines)
+
+    pattern_table = patterns.PatternTable.load()
+    if args.recording is not None:
+        moves = recording["moves"]
+    else:
+        moves = solver_moves(screen.game, pattern_table)
+
+    frame_size = (int(screen.screen.get_width() * args.scale), int(screen.screen.get_height() * args.scale))
+    if args.output.endswith(".gif"):
+        writer = GifWriter(args.output, frame_size)
+    else:
+        writer = RawWriter(args.output, frame_size, args.fps)
+
+    played = replay(screen, moves, writer, args.moves_per_frame, round(1000 / args.fps), args.hold, args.scale)
+    writer.close()
+
+    if args.save_recording is not None:
+        save_recording(args.save_recording, args.size, args.mines, args.seed, played)
+    if pattern_table.dirty:
+        pattern_table.save()
+
+    result = "won" if screen.game.victory() else "lost"
+    print("Replayed " + str(len(played)) + " moves (" + result + ") into " + args.output
+          + " at " + str(frame_size[0]) + "x" + str(frame_size[1]))
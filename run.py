@@ -3,13 +3,44 @@
 # This file plays the mines game in a GUI
 
 """
-Runs a game of miens using a gui and pygame1.9.6
+Runs a game of miens using a gui and pygame2
 """
 
+import time
+
+# start of the startup for --profile-startup
+started = time.perf_counter()
+
+import argparse
 import gui
 
 if __name__ == "__main__":
+    imported = time.perf_counter()
+
+    parser = argparse.ArgumentParser(description="Play mines in a window")
+    parser.add_argument("--frame-stats", action="store_true",
+                        help="print frame rate and frame time statistics when the window is closed")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print the time from the start of the program to the first frame")
+    parser.add_argument("--move-log", default=None, metavar="PATH",
+                        help="append every game played to a move log that movelog.py can replay")
+    args = parser.parse_args()
+
     print("Welcome to Mines! Created by mattlourenco27 on github")
     print("Starting . . .")
     screen = gui.Gui()
-    screen.start()
\ No newline at end of file
+    screen.report_frame_stats = args.frame_stats
+    if args.profile_startup:
+        screen.startup_marks = [("start", started), ("imports", imported), ("window", time.perf_counter())]
+
+    # the move log is only imported when it is used
+    recorder = None
+    if args.move_log is not None:
+        import movelog
+        recorder = movelog.Recorder(screen.game, args.move_log)
+
+    try:
+        screen.start()
+    finally:
+        if recorder is not None:
+            recorder.close()
@@ -0,0 +1,445 @@
+# Created on 18 Oct 2026
+# This file hosts games of mines for many clients at once over a socket
+
+"""
+Hosts games of mines for clients that speak json lines over tcp or a unix socket
+
+Every request is a json object on its own line and gets one json line in reply, in order.
+A request holds an "op", the "session" it acts on and an optional "id" that is copied into the reply.
+A reply holds "ok" and either the result of the operation or an "error".
+
+Operations:
+    * create {size, mines, seed}  -> {session, size, mines, bytes}. seed is optional
+    * click {session, x, y}       -> move result
+    * flag {session, x, y}        -> move result. cycles covered, flag and unknown like a right click
+    * chord {session, x, y}       -> move result
+    * state {session}             -> {version, status, flags, rows}
+    * delta {session, since}      -> {version, status, flags, changes} with the tiles changed after version since
+    * hint {session}              -> {version, x, y, left, stage} with the next move of the solver
+    * close {session}             -> {}
+    * stats {}                    -> {sessions, bytes, created, evicted}
+
+A move result is {version, status, flags, changes}. The version of a board goes up by one for every move
+that changes it. changes holds [x, y, tile] for every tile that the move changed, with the tile written as in
+the rows of an observation.Observation. Status is one of 'ongoing', 'victory' or 'loss'.
+
+Moves are applied on the event loop since they touch at most every tile of one board once. Solver hints run
+in a pool of processes on an observation of the board so that they never hold up other sessions.
+Sessions are shared by every connection. Sessions that are idle for too long are evicted, and new sessions
+are refused once the measured memory of all sessions reaches the limit.
+
+Constants:
+    * server.DEFAULT_PORT = 8765
+    * server.DEFAULT_IDLE_TIMEOUT = 300
+
+Public objects:
+    * Class server.Server
+
+Exceptions:
+    * server.RequestError
+"""
+
+import argparse
+import array
+import asyncio
+import concurrent.futures
+import json
+import secrets
+import time
+import tracemalloc
+import game
+import observation
+import patterns
+import solver
+
+DEFAULT_PORT = 8765
+DEFAULT_IDLE_TIMEOUT = 300
+
+# pattern table of a hint process. loaded once and shared by every hint the process gives
+_hint_patterns: patterns.PatternTable = None
+
+
+# loads the pattern table of a hint process
+def _init_hints(pattern_path: str):
+    global _hint_patterns
+    _hint_patterns = patterns.PatternTable.load(pattern_path)
+
+
+# returns the next move of the solver on an observed board as (x, y, left, stage), or None if it has none
+def _hint(size: int, mines: int, states: bytes, values: bytes) -> (int, int, bool, str):
+    board = observation.Observation(size, mines, states, values)
+    analysis = solver.Solver(board, _hint_patterns)
+    try:
+        x, y, left = analysis.best_click(board)
+    except solver.AnalysisError:
+        return None
+
+    return x, y, left, analysis.last_stage
+
+
+class RequestError(game.Error):
+    """
+Raised when a request cannot be carried out
+
+Attributes:
+    message -- explanation of the error
+    """
+    def __init__(self, message):
+        self.message = message
+
+
+class _Session:
+    # a hosted game and the versions of its tiles
+
+    def __init__(self, size: int, mines: int, seed: int):
+        self.game = game.Game()
+        self.game.set_size(size)
+        self.game.set_mines(mines)
+        self.game.set_seed(seed)
+        self.game.begin()
+
+        # number of moves that changed the board
+        self.version: int = 0
+
+        # version of the last move that changed each tile
+        self.tile_versions = array.array('L', [0]) * (size * size)
+
+        # time of the last request of the session
+        self.last_used: float = time.monotonic()
+
+        # estimated bytes held by the session
+        self.bytes: int = 0
+
+    # returns the status of the game
+    def status(self) -> str:
+        if self.game.victory():
+            return "victory"
+        if self.game.game_done():
+            return "loss"
+        return "ongoing"
+
+    # returns [x, y, tile] for each of the given tile indices
+    def tiles(self, indices) -> [[int, int, str]]:
+        size = self.game.get_size()
+        states = self.game.get_state_view()
+        values = self.game.get_value_view()
+        return [[*divmod(index, size), observation.tile_char(states[index], values[index])] for index in indices]
+
+    # applies a move and returns the indices of the tiles it changed
+    def move(self, apply, x: int, y: int) -> [int]:
+        states = self.game.get_state_view()
+        values = self.game.get_value_view()
+        states_before = states.tobytes()
+        values_before = values.tobytes()
+
+        apply(x, y)
+
+        if states == states_before and values.tobytes() == values_before:
+            return []
+
+        values = values.cast('B')
+        changed = [index for index in range(len(states_before))
+                   if states[index] != states_before[index] or values[index] != values_before[index]]
+
+        self.version += 1
+        for index in changed:
+            self.tile_versions[index] = self.version
+
+        return changed
+
+
+class Server:
+    """
+This class hosts games of mines for clients that send json lines
+
+constructor parameters -> idle_timeout: float = DEFAULT_IDLE_TIMEOUT, max_memory: int = None,
+                          solver_workers: int = None
+max_memory is in bytes. None sets no limit. solver_workers defaults to the cpu count
+
+# returns the reply to a request
+self.handle(self, request: dict) -> dict: (coroutine)
+
+# listens on a tcp port, or on a unix socket if a path is given, until cancelled
+self.serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str = None): (coroutine)
+
+# evicts every session that has been idle for longer than the idle timeout
+# returns the number of sessions that were evicted
+self.evict_idle(self) -> int:
+
+# stops the solver processes
+self.close(self):
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, max_memory: int = None,
+                 solver_workers: int = None):
+        self.idle_timeout = idle_timeout
+        self.max_memory = max_memory
+
+        # hosted sessions by id
+        self._sessions: {str: _Session} = {}
+
+        # estimated bytes of a session on a board of each size
+        self._session_bytes: {int: int} = {}
+
+        # estimated bytes of all sessions
+        self._bytes: int = 0
+
+        self._created: int = 0
+        self._evicted: int = 0
+
+        # processes that give solver hints. started on the first hint
+        self._solver_workers = solver_workers
+        self._executor: concurrent.futures.ProcessPoolExecutor = None
+
+        # hints that have been handed to the processes and not answered yet. cancelled on close
+        self._hints: {concurrent.futures.Future} = set()
+
+        self._operations = {
+            "create": self._create,
+            "click": lambda request: self._move(request, "click"),
+            "flag": lambda request: self._move(request, "flag"),
+            "chord": lambda request: self._move(request, "chord"),
+            "state": self._state,
+            "delta": self._delta,
+            "hint": self._hint,
+            "close": self._close,
+            "stats": self._stats,
+        }
+
+    # returns the reply to a request
+    async def handle(self, request: dict) -> dict:
+        reply = {}
+        if isinstance(request, dict) and "id" in request:
+            reply["id"] = request["id"]
+
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("A request must be a json object")
+
+            operation = self._operations.get(request.get("op"))
+            if operation is None:
+                raise RequestError("Unknown op " + repr(request.get("op")))
+
+            result = operation(request)
+            if asyncio.iscoroutine(result):
+                result = await result
+
+            reply["ok"] = True
+            reply.update(result)
+        except KeyError as err:
+            reply["ok"] = False
+            reply["error"] = "Missing field " + str(err)
+        except (game.Error, ValueError, TypeError) as err:
+            reply["ok"] = False
+            reply["error"] = type(err).__name__ + ": " + str(err)
+
+        return reply
+
+    # listens on a tcp port, or on a unix socket if a path is given, until cancelled
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: str = None):
+        if path is not None:
+            listener = await asyncio.start_unix_server(self._serve_client, path)
+        else:
+            listener = await asyncio.start_server(self._serve_client, host, port)
+
+        evictions = asyncio.create_task(self._evict_periodically())
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            evictions.cancel()
+
+    # evicts every session that has been idle for longer than the idle timeout
+    # returns the number of sessions that were evicted
+    def evict_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [session_id for session_id, session in self._sessions.items() if session.last_used < cutoff]
+        for session_id in idle:
+            self._remove(session_id)
+
+        self._evicted += len(idle)
+        return len(idle)
+
+    # stops the solver processes
+    def close(self):
+        if self._executor is not None:
+            for future in self._hints:
+                future.cancel()
+
+            self._executor.shutdown()
+            self._executor = None
+
+    # answers the requests of one connection in order until it closes
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # the line is longer than the stream limit
+                    writer.write(json.dumps({"ok": False, "error": "Request is too long"}).encode() + b"\n")
+                    break
+
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"ok": False, "error": "Request is not valid json"}
+                else:
+                    reply = await self.handle(request)
+
+                writer.write(json.dumps(reply, separators=(',', ':')).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # evicts idle sessions a few times per idle timeout
+    async def _evict_periodically(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout / 4, 30))
+            self.evict_idle()
+
+    # returns the session named by a request and marks it as used
+    def _session(self, request: dict) -> _Session:
+        session = self._sessions.get(request["session"])
+        if session is None:
+            raise RequestError("Unknown session " + repr(request["session"]))
+
+        session.last_used = time.monotonic()
+        return session
+
+    # forgets a session
+    def _remove(self, session_id: str):
+        session = self._sessions.pop(session_id)
+        self._bytes -= session.bytes
+
+    # returns the bytes taken by a new session on a board of the given size
+    # measured once for each size by tracing the allocations of a session
+    def _measure(self, size: int) -> int:
+        if size not in self._session_bytes:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                session = _Session(size, 1, None)
+                self._session_bytes[size] = tracemalloc.get_traced_memory()[0] - before
+                del session
+            finally:
+                if not was_tracing:
+                    tracemalloc.stop()
+
+        return self._session_bytes[size]
+
+    def _create(self, request: dict) -> dict:
+        size = int(request["size"])
+        mines = int(request["mines"])
+        seed = request.get("seed")
+
+        session = _Session(size, mines, None if seed is None else int(seed))
+        session.bytes = self._measure(size)
+        if self.max_memory is not None and self._bytes + session.bytes > self.max_memory:
+            raise RequestError("The server is full")
+
+        session_id = secrets.token_hex(8)
+        self._sessions[session_id] = session
+        self._bytes += session.bytes
+        self._created += 1
+
+        return {"session": session_id, "size": size, "mines": mines, "bytes": session.bytes}
+
+    def _move(self, request: dict, kind: str) -> dict:
+        session = self._session(request)
+        x = int(request["x"])
+        y = int(request["y"])
+
+        g = session.game
+        apply = {"click": g.left_mouse_button, "flag": g.right_mouse_button, "chord": g.chord}[kind]
+        changed = session.move(apply, x, y)
+
+        return {"version": session.version, "status": session.status(), "flags": g.get_flags(),
+                "changes": session.tiles(changed)}
+
+    def _state(self, request: dict) -> dict:
+        session = self._session(request)
+        return {"version": session.version, "status": session.status(), "flags": session.game.get_flags(),
+                "rows": observation.Observation.of(session.game).to_rows()}
+
+    def _delta(self, request: dict) -> dict:
+        session = self._session(request)
+        since = int(request.get("since", 0))
+
+        versions = session.tile_versions
+        changed = [index for index in range(len(versions)) if versions[index] > since]
+        return {"version": session.version, "status": session.status(), "flags": session.game.get_flags(),
+                "changes": session.tiles(changed)}
+
+    async def _hint(self, request: dict) -> dict:
+        session = self._session(request)
+        g = session.game
+        version = session.version
+        if g.game_done():
+            raise RequestError("The game is over")
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self._solver_workers, initializer=_init_hints, initargs=(patterns.DEFAULT_PATH,))
+
+        try:
+            future = self._executor.submit(_hint, g.get_size(), g.get_mines(),
+                                           g.get_state_view().tobytes(), g.get_value_view().tobytes())
+            self._hints.add(future)
+            try:
+                move = await asyncio.wrap_future(future)
+            finally:
+                self._hints.discard(future)
+        except Exception as err:
+            # processes that died are replaced on the next hint
+            if isinstance(err, concurrent.futures.BrokenExecutor):
+                self.close()
+            raise RequestError("The solver failed. " + type(err).__name__ + ": " + str(err))
+
+        if move is None:
+            raise RequestError("The solver found no move")
+
+        x, y, left, stage = move
+        return {"version": version, "x": x, "y": y, "left": left, "stage": stage}
+
+    def _close(self, request: dict) -> dict:
+        self._session(request)
+        self._remove(request["session"])
+        return {}
+
+    def _stats(self, request: dict) -> dict:
+        return {"sessions": len(self._sessions), "bytes": self._bytes,
+                "created": self._created, "evicted": self._evicted}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host games of mines over json lines")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="tcp port to listen on")
+    parser.add_argument("--unix", default=None, metavar="PATH", help="listen on a unix socket instead of tcp")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="seconds a session may be idle before it is evicted")
+    parser.add_argument("--max-memory", type=float, default=None,
+                        help="megabytes of sessions after which new sessions are refused")
+    parser.add_argument("--solver-workers", type=int, default=None,
+                        help="processes that give solver hints. defaults to the cpu count")
+    args = parser.parse_args()
+
+    max_memory = None if args.max_memory is None else int(args.max_memory * 1024 * 1024)
+    hosted = Server(args.idle_timeout, max_memory, args.solver_workers)
+    try:
+        asyncio.run(hosted.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hosted.close()
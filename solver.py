@@ -7,6 +7,7 @@ Defines the solver class that performs logic and probability analyses to solve a
 
 Public objects:
     * Class solver.Solver
+    * Namedtuple solver.Move
 
 Exceptions:
     * solver.GameObjectError
@@ -14,9 +15,18 @@ Exceptions:
     * solver.AnalysisError
 """
 
+import argparse
+import array
 import collections
 from copy import deepcopy
+import fileinput
+import json
+import multiprocessing
+import sys
+import time
 import game
+import observation
+import patterns
 import tile
 
 
@@ -58,45 +68,131 @@ class AnalysisError(game.Error):
         self.message = message
 
 
-class _AwareTile(tile.Tile):
-    def __init__(self, x: int, y: int, size: int):
-        super().__init__()
+# tile state codes stored in the solver's state array
+_COVERED: int = tile.State.covered.value
+_FLAG: int = tile.State.flag.value
+_UNKNOWN: int = tile.State.unknown.value
+_VISIBLE: int = tile.State.visible.value
 
-        # stores the number of flags that surround the tile
-        self.flags: int = 0
+# neighbour index tables shared by every solver with the same board size
+_neighbour_tables: {int: (((int,),), ((int,),))} = {}
 
-        # stores the adjacent tile coordinates
-        self.adjacent: [(int, int)] = []
 
-        # stores the adjacent covered tiles
-        self.covered: [(int, int)] = []
+# returns the neighbour index tables for a board of the given size
+# tiles are indexed as x * size + y
+# neighbours[i][k] is the k-th neighbour of tile i and back_bits[i][k] is the bit of tile i
+# in the covered mask of that neighbour
+def _neighbour_table(size: int) -> (((int,),), ((int,),)):
+    table = _neighbour_tables.get(size)
+    if table is not None:
+        return table
 
-        # ids of all parent blocks
-        self.parent_ids: [int] = []
+    neighbours: [(int,)] = []
+    for x in range(size):
+        for y in range(size):
+            adjacent: [int] = []
+            for i in range(x - 1, x + 2):
+                for j in range(y - 1, y + 2):
+                    if 0 <= i < size and 0 <= j < size and not (i == x and j == y):
+                        adjacent.append(i * size + j)
+            neighbours.append(tuple(adjacent))
 
-        # true if this tile has been visited in a scan. volatile
-        self.visited = False
+    back_bits: [(int,)] = []
+    for index in range(size * size):
+        back_bits.append(tuple(1 << neighbours[n].index(index) for n in neighbours[index]))
+
+    table = (tuple(neighbours), tuple(back_bits))
+    _neighbour_tables[size] = table
+    return table
+
+
+# translation tables that turn a byte per tile into a 0 or 1 byte per tile
+def _byte_table(predicate) -> bytes:
+    return bytes(1 if predicate(b) else 0 for b in range(256))
+
+
+_IS_COVERED = _byte_table(lambda b: b == _COVERED)
+_IS_FLAG = _byte_table(lambda b: b == _FLAG)
+_IS_VISIBLE = _byte_table(lambda b: b == _VISIBLE)
+_IS_NUMBER = _byte_table(lambda b: b <= 8)
+_IS_NONZERO = _byte_table(lambda b: b != 0)
+
+# translation table that keeps tile numbers and clears visible mines
+_NUMBER_VALUE = bytes(b if b <= 8 else 0 for b in range(256))
+
+# bias added to every byte before subtracting counts so that no byte borrows from its neighbour
+_BIAS: int = 16
+_IS_BIAS = _byte_table(lambda b: b == _BIAS)
+
+# packed board layouts shared by every solver with the same board size
+_packed_layouts: {int: (int, (int,), int, int)} = {}
+
+
+# returns the packed layout of a board of the given size
+# a packed board is an integer with one byte per tile surrounded by a border of zero bytes
+# so that the neighbours of every tile are at the same byte offsets
+# returns the padded width, the neighbour offsets, an integer with every byte set to _BIAS
+# and an integer with every byte set to 0xFF
+def _packed_layout(size: int) -> (int, (int,), int, int):
+    layout = _packed_layouts.get(size)
+    if layout is not None:
+        return layout
 
-        for i in range(x - 1, x + 2):
-            for j in range(y - 1, y + 2):
-                if 0 <= i < size and 0 <= j < size and not (i == x and j == y):
-                    self.adjacent.append((i, j))
-                    self.covered.append((i, j))
+    width = size + 2
+    offsets = tuple(i * width + j for i in (-1, 0, 1) for j in (-1, 0, 1) if not (i == 0 and j == 0))
+    bias = int.from_bytes(bytes([_BIAS]) * (width * width), 'little')
+    full = (1 << (8 * width * width)) - 1
 
-    def is_satisfied(self):
-        return len(self.covered) == 0 and self.state is tile.State.visible
+    layout = (width, offsets, bias, full)
+    _packed_layouts[size] = layout
+    return layout
+
+
+# packs a flat board of one byte per tile, indexed as x * size + y, into an integer
+def _pack(board: bytes, size: int) -> int:
+    border = bytes(size + 2)
+    rows = [border]
+    for x in range(size):
+        rows.append(b'\0' + board[x * size:(x + 1) * size] + b'\0')
+    rows.append(border)
+
+    return int.from_bytes(b''.join(rows), 'little')
+
+
+# applies a translation table to every byte of a packed board
+def _translate(packed: int, table: bytes, size: int) -> int:
+    length = (size + 2) * (size + 2)
+    return int.from_bytes(packed.to_bytes(length, 'little').translate(table), 'little')
+
+
+# sums the 8 neighbours of every tile of a packed board at once
+# every byte must be small enough that the sum of 8 bytes stays below 256
+def _neighbour_sum(packed: int, offsets: (int,), full: int) -> int:
+    total = 0
+    for offset in offsets:
+        if offset > 0:
+            total += packed >> (8 * offset)
+        else:
+            total += packed << (-8 * offset)
+
+    return total & full
+
+
+# a move proposed by the solver
+# left is true for a left click and certainty is the chance (%) that the move is correct
+Move = collections.namedtuple("Move", ["x", "y", "left", "certainty"])
 
 
 class _Block:
     # counter that ensures that block ids are never the same
     num_ids: int = 0
 
-    def __init__(self, mines: int, tiles: [(int, int)] = []):
+    def __init__(self, mines: int, tiles: [int] = []):
         # the exact number of mines in this block of tiles
         self.mines: int = mines
 
-        # list of tile positions
-        self.tiles: [(int, int)] = tiles
+        # list of tile indices
+        self.tiles: [int] = tiles
 
         # id of this instance of a block
         self.id: int = _Block.num_ids
@@ -104,10 +200,95 @@ class _Block:
         _Block.num_ids += 1
 
 
+# methods of the solver timed by each analysis stage while stats are recorded
+# none of them calls another method of its own stage, so the calls of a stage count its passes
+_TIMED_STAGES: {str: (str,)} = {
+    "update": ("_update_grid",),
+    "logic": ("_trivial_deductions", "_do_logic_wave", "_do_logic_scan", "_do_logic_placement"),
+    "pattern": ("_pattern_moves",),
+    "probability": ("_do_prob_wave", "_do_prob_placement"),
+}
+
+
+class _Stats:
+    # counts and times the work of a solver
+    # stage times are exclusive. time spent in a stage called from another stage only counts towards the inner one
+
+    def __init__(self, hook):
+        # called as hook(stage, seconds) after every timed call of a stage
+        self.hook = hook
+
+        # tiles looked at by the logic passes
+        self.logic_tiles_visited: int = 0
+
+        # blocks of a number and its covered neighbours built by the probability analysis
+        self.blocks_generated: int = 0
+
+        # arrangements of mines tried in a block
+        self.arrangements_enumerated: int = 0
+
+        # arrangements dropped because a block could not be satisfied, there were too many mines
+        # or the whole grid was invalid
+        self.arrangements_pruned: int = 0
+
+        # complete arrangements of mines used for the probabilities
+        self.solutions_accepted: int = 0
+
+        # moves without certainty handed out to be played by best_click, next_moves and solve
+        # the ranked guesses of a certain_moves stream are not counted since the caller may never play them
+        self.guesses: int = 0
+
+        self.seconds: {str: float} = dict.fromkeys(_TIMED_STAGES, 0.0)
+        self.calls: {str: int} = dict.fromkeys(_TIMED_STAGES, 0)
+
+        # time spent in nested stages of each timed call in progress
+        self._inner: [float] = []
+
+    # returns the method wrapped so that its calls are counted and timed as the given stage
+    # visited returns the number of tiles the last call looked at when given for a logic pass
+    def timed(self, stage: str, method, visited=None):
+        def timed_method(*args, **kwargs):
+            self._inner.append(0.0)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                own = elapsed - self._inner.pop()
+                if len(self._inner) > 0:
+                    self._inner[-1] += elapsed
+
+                self.seconds[stage] += own
+                self.calls[stage] += 1
+                if visited is not None:
+                    self.logic_tiles_visited += visited()
+                if self.hook is not None:
+                    self.hook(stage, own)
+
+        return timed_method
+
+    # returns the counters and times as a dict
+    def as_dict(self) -> dict:
+        return {
+            "logic_tiles_visited": self.logic_tiles_visited,
+            "blocks_generated": self.blocks_generated,
+            "arrangements_enumerated": self.arrangements_enumerated,
+            "arrangements_pruned": self.arrangements_pruned,
+            "solutions_accepted": self.solutions_accepted,
+            "guesses": self.guesses,
+            "seconds": dict(self.seconds),
+            "calls": dict(self.calls),
+        }
+
+
 # wrapper that raises an exception if the game used in the solver is inconsistent
+# a solver of observations accepts any observation of a board of the same size
 def _consistent_game_check(func):
     def function_wrapper(self, g: game.Game, *args, **kwargs):
-        if id(g) != self._gameID:
+        if self._observed:
+            if not isinstance(g, observation.Observation) or g.get_size() != self._size:
+                raise GameObjectError("The entered observation is not of the same board as the original")
+        elif id(g) != self._gameID:
             raise GameObjectError("The entered game object is not the same as the original")
 
         return func(self, g, *args, **kwargs)
@@ -160,8 +341,10 @@ class Solver:
     """
 This class controls a solving algorithm for a game of mines
 the same game object must be passed into every function else this class throws "GameObjectError"
+an observation.Observation can be given instead of a game to analyse a board without playing it.
+later calls then take any observation of the same board, and the methods that play moves throw "GameObjectError"
 
-constructor parameters -> g: game.Game
+constructor parameters -> g: game.Game or observation.Observation, pattern_table: patterns.PatternTable = None
 
 # will use probability to make the best guess of where to click next
 # returns a tuple of co-ordinates and left(True) or right(False) click
@@ -172,6 +355,15 @@ self.best_click(self, g: game.Game) -> (int, int, bool):
 # returns true if it was able to make a guess
 def guess(self, g: game.Game) -> bool:
 
+# yields every move proven by the current analysis followed by ranked guesses if no stage proves any
+# each move is a solver.Move of (x, y, left, certainty) where certainty is the chance (%) that it is correct
+self.certain_moves(self, g: game.Game) -> Generator[Move]:
+
+# returns every move proven by the first analysis stage that proves any, or the best guess if none is proven
+# falls back to any covered tile if the analysis finds no move
+# the moves are computed from the board as it was when called, so moves made by earlier ones can be skipped
+self.next_moves(self, g: game.Game) -> [Move]:
+
 # return any covered tile
 self.random_tile(self) -> (int, int):
 
@@ -184,20 +376,48 @@ self.solve_next_step(self, g: game.Game) -> bool:
 # solves the game
 # may guess if there is no other choice
 self.solve(self, g:game.Game):
+
+# starts counting and timing the work of each analysis stage. stats cost nothing until this is called
+# hook is called as hook(stage, seconds) after every timed call of 'update', 'logic', 'pattern' or 'probability'
+self.enable_stats(self, hook=None):
+
+# stops counting and timing. the stats recorded so far are dropped
+self.disable_stats(self):
+
+# returns the counters and the seconds and calls of each stage as a dict, or None if stats are not enabled
+# stage times are exclusive. time spent updating the grid from within a logic pass counts as 'update'
+self.stats(self) -> dict:
+
+# analysis stage that produced the last move of best_click or certain_moves
+# one of 'opening', 'logic', 'pattern', 'probability', 'random' or None before the first move
+self.last_stage: str
     """
 
-    def __init__(self, g: game.Game):
+    def __init__(self, g: game.Game, pattern_table: patterns.PatternTable = None):
+        # true if the solver reads observations that cannot be played instead of a game
+        self._observed = isinstance(g, observation.Observation)
+
         # begin the game if it was not already begun
-        g.begin()
+        if not self._observed:
+            g.begin()
 
-        # identifier to check if the same game object is used
-        self._gameID = id(g)
+        # table of local patterns checked before the probability analysis
+        if pattern_table is None:
+            pattern_table = patterns.PatternTable()
+        self.pattern_table = pattern_table
 
-        # grid to store known tile values
-        self._grid: [[_AwareTile]] = []
+        # analysis stage that produced the last move of best_click or certain_moves
+        self.last_stage: str = None
 
-        # list of tiles that were visited and need to be returned to normal
-        self._visited_tiles: [(int, int)] = []
+        # frontier positions and their chance (%) of being a mine found by the last certain_moves stream
+        # None if the stream ended before the probability analysis
+        self._probabilities: ([(int, int)], [float]) = None
+
+        # counters and timers of the analysis stages. None while stats are disabled
+        self._stats: _Stats = None
+
+        # identifier to check if the same game object is used
+        self._gameID = id(g)
 
         # number of mines on the board
         self._mines = g.get_mines()
@@ -205,10 +425,33 @@ self.solve(self, g:game.Game):
         # size of the board
         self._size = g.get_size()
 
-        for x in range(self._size):
-            self._grid.append([])
-            for y in range(self._size):
-                self._grid[x].append(_AwareTile(x, y, self._size))
+        tiles: int = self._size * self._size
+
+        # shared tables of neighbour indices and of the bit each tile holds in its neighbours' covered masks
+        self._neighbours, self._back_bits = _neighbour_table(self._size)
+
+        # known state code and value of every tile, indexed as x * size + y
+        self._state = bytearray([_COVERED]) * tiles
+        self._value = array.array('b', bytes(tiles))
+
+        # number of flags and covered tiles around every tile
+        self._flags = bytearray(tiles)
+        self._covered = bytearray(len(adjacent) for adjacent in self._neighbours)
+
+        # bit k is set when the k-th neighbour of a tile is covered
+        self._covered_mask = bytearray((1 << len(adjacent)) - 1 for adjacent in self._neighbours)
+
+        # total number of flags on the local grid
+        self._flag_total: int = 0
+
+        # true if this tile has been visited in a scan. volatile
+        self._visited = bytearray(tiles)
+
+        # list of tiles that were visited and need to be returned to normal
+        self._visited_tiles: [int] = []
+
+        # ids of all parent blocks of tiles in the current analysis
+        self._parent_ids: {int: [int]} = {}
 
         # initialize grid tile parameters
         self._update_grid(g)
@@ -219,18 +462,59 @@ self.solve(self, g:game.Game):
     # returns true if it changed any of the grid tiles
     @_consistent_game_check
     def solve_next_step(self, g: game.Game) -> bool:
+        self._check_playable()
         self._update_grid(g)
 
-        logic_success: bool = self._do_logic_wave(g, False, (int(self._size * 0.5), int(self._size * 0.5)))
+        logic_success: bool = self._do_logic_batch(g)
         prob_success: bool
 
-        if not logic_success:
-            prob_success = self._do_prob_wave(g)
-        else:
+        if logic_success:
+            return True
+
+        if self._do_pattern_wave(g):
             return True
 
+        prob_success = self._do_prob_wave(g)
+
         return prob_success
 
+    # starts counting and timing the work of each analysis stage
+    # the timed methods are only wrapped on this instance while stats are enabled
+    def enable_stats(self, hook=None):
+        if self._stats is not None:
+            self._stats.hook = hook
+            return
+
+        self._stats = _Stats(hook)
+
+        # the waves look at the tiles they visit and the other logic passes look at every tile
+        visited = {
+            "_trivial_deductions": lambda: len(self._state),
+            "_do_logic_scan": lambda: len(self._state),
+            "_do_logic_wave": lambda: len(self._visited_tiles),
+            "_do_logic_placement": lambda: len(self._visited_tiles),
+        }
+
+        for stage, names in _TIMED_STAGES.items():
+            for name in names:
+                setattr(self, name, self._stats.timed(stage, getattr(self, name), visited.get(name)))
+
+    # stops counting and timing
+    def disable_stats(self):
+        if self._stats is None:
+            return
+
+        for names in _TIMED_STAGES.values():
+            for name in names:
+                delattr(self, name)
+        self._stats = None
+
+    # returns the counters and the seconds and calls of each stage, or None if stats are not enabled
+    def stats(self) -> dict:
+        if self._stats is None:
+            return None
+        return self._stats.as_dict()
+
     # will use probability to make the best guess of where to click next
     # returns a tuple of co-ordinates and left(True) or right(False) click
     # throws AnalysisError upon failure
@@ -242,22 +526,24 @@ self.solve(self, g:game.Game):
         tile_coords = self._do_logic_placement(g, (int(self._size * 0.5), int(self._size * 0.5)), return_tile=True)
 
         if tile_coords != (-1, -1, True):
+            self.last_stage = "logic"
             return tile_coords
 
-        # logic pass failed
+        # check the known local patterns before enumerating
+        tile_coords = self._do_pattern_wave(g, return_tile=True)
+
+        if tile_coords != (-1, -1, True):
+            self.last_stage = "pattern"
+            return tile_coords
+
+        # logic and pattern passes failed
         data = self._do_prob_wave(g, return_data=True)
 
         if len(data[0]) == 0:
             # there is no data to work with
             # check if the board has simply not been clicked yet
-
-            all_covered: bool = True
-            for x in range(self._size):
-                for y in range(self._size):
-                    if self._grid[x][y].state is not tile.State.covered:
-                        all_covered = False
-
-            if all_covered:
+            if self._state.count(_COVERED) == len(self._state):
+                self.last_stage = "opening"
                 return int(self._size * 0.5), int(self._size * 0.5), True
             else:
                 raise AnalysisError("Unable to isolate tiles to compare and evaluate")
@@ -279,12 +565,80 @@ self.solve(self, g:game.Game):
 
         x, y = data[0][max_index]
 
+        if self._stats is not None and max_prob < 100:
+            self._stats.guesses += 1
+
+        self.last_stage = "probability"
         return x, y, max_is_safe
 
+    # yields every move proven by the first analysis stage that proves any, as Move tuples
+    # when only the probability analysis can help, the proven moves are followed by the remaining
+    # frontier tiles ranked from the safest guess to the riskiest
+    # every move is computed from the board as it was when the stream began
+    @_consistent_game_check
+    def certain_moves(self, g: game.Game):
+        self._probabilities = None
+        self._update_grid(g)
+
+        # the two logic rules applied to the whole grid
+        safe, mines = self._trivial_deductions()
+        if len(safe) > 0 or len(mines) > 0:
+            self.last_stage = "logic"
+            for index in safe:
+                yield Move(*divmod(index, self._size), True, 100.0)
+            for index in mines:
+                yield Move(*divmod(index, self._size), False, 100.0)
+            return
+
+        # the local pattern table
+        moves = self._pattern_moves()
+        if len(moves) > 0:
+            self.last_stage = "pattern"
+            for position, is_mine in moves.items():
+                yield Move(position[0], position[1], not is_mine, 100.0)
+            return
+
+        # the probability analysis
+        positions, percentages = self._do_prob_wave(g, return_data=True)
+        self._probabilities = (positions, percentages)
+
+        if len(positions) == 0:
+            covered = self._state.count(_COVERED)
+            if covered == 0:
+                return
+
+            if covered == len(self._state):
+                # the first click of a game is never a mine
+                self.last_stage = "opening"
+                yield Move(int(self._size * 0.5), int(self._size * 0.5), True, 100.0)
+            else:
+                self.last_stage = "random"
+                x, y = self.random_tile()
+                remaining = self._mines - self._flag_total
+                yield Move(x, y, True, max(0.0, 100 - remaining / covered * 100))
+            return
+
+        self.last_stage = "probability"
+        guesses: [Move] = []
+        for position, probability in zip(positions, percentages):
+            if probability == 100:
+                yield Move(position[0], position[1], False, 100.0)
+            elif probability == 0:
+                yield Move(position[0], position[1], True, 100.0)
+            elif probability > 50:
+                guesses.append(Move(position[0], position[1], False, probability))
+            else:
+                guesses.append(Move(position[0], position[1], True, 100 - probability))
+
+        guesses.sort(key=lambda move: move.certainty, reverse=True)
+        for move in guesses:
+            yield move
+
     # will use probability to make the best guess of where to click next
     # returns true if it was able to make a guess
     @_consistent_game_check
     def guess(self, g: game.Game) -> bool:
+        self._check_playable()
         try:
             x, y, left_click = self.best_click(g)
         except AnalysisError:
@@ -297,18 +651,42 @@ self.solve(self, g:game.Game):
 
         return True
 
+    # returns every move proven by the first analysis stage that proves any, or the best guess if none is proven
+    # falls back to any covered tile if the analysis finds no move. returns no moves once no tile is covered
+    # the moves are computed from the board as it was when called, so moves made by earlier ones can be skipped
+    def next_moves(self, g: game.Game) -> [Move]:
+        moves: [Move] = []
+        for move in self.certain_moves(g):
+            if move.certainty < 100:
+                if len(moves) == 0:
+                    moves.append(move)
+                break
+            moves.append(move)
+
+        if len(moves) == 0 and self.random_tile() is not None:
+            # the solver could not find any move
+            x, y = self.random_tile()
+            remaining = self._mines - self._flag_total
+            moves.append(Move(x, y, True, max(0.0, 100 - remaining / self._state.count(_COVERED) * 100)))
+            self.last_stage = "random"
+
+        if self._stats is not None and len(moves) > 0 and moves[0].certainty < 100:
+            self._stats.guesses += 1
+
+        return moves
+
     # return any covered tile
     def random_tile(self) -> (int, int):
         # choose a tile to click
-        for x in range(self._size):
-            for y in range(self._size):
-                if self._grid[x][y].state is tile.State.covered:
-                    return x, y
+        index = self._state.find(_COVERED)
+        if index != -1:
+            return divmod(index, self._size)
 
     # solves the game
     # may guess if there is no other choice
     @_consistent_game_check
     def solve(self, g:game.Game):
+        self._check_playable()
         while not g.game_done():
             success: bool = self.solve_next_step(g)
 
@@ -317,60 +695,111 @@ self.solve(self, g:game.Game):
                 made_guess: bool = self.guess(g)
 
                 if not made_guess:
+                    if self._stats is not None:
+                        self._stats.guesses += 1
                     x, y = self.random_tile()
                     g.left_mouse_button(x, y)
 
+    # raises an exception if the solver reads observations, which cannot be played
+    def _check_playable(self):
+        if self._observed:
+            raise GameObjectError("Moves cannot be played on an observation")
+
+    # returns true if the tile is visible and has no covered tiles around it
+    def _is_satisfied(self, index: int) -> bool:
+        return self._covered[index] == 0 and self._state[index] == _VISIBLE
+
+    # returns the indices of the covered tiles around a tile
+    def _covered_tiles(self, index: int) -> [int]:
+        mask = self._covered_mask[index]
+        adjacent = self._neighbours[index]
+        return [adjacent[k] for k in range(len(adjacent)) if mask >> k & 1]
+
+    # changes the known state of a tile and updates the flag and covered counts around it
+    def _set_state(self, index: int, state: int):
+        old = self._state[index]
+        if old == state:
+            return
+
+        self._state[index] = state
+        adjacent = self._neighbours[index]
+        back_bits = self._back_bits[index]
+
+        if old == _COVERED:
+            for k in range(len(adjacent)):
+                self._covered[adjacent[k]] -= 1
+                self._covered_mask[adjacent[k]] &= ~back_bits[k]
+        elif state == _COVERED:
+            for k in range(len(adjacent)):
+                self._covered[adjacent[k]] += 1
+                self._covered_mask[adjacent[k]] |= back_bits[k]
+
+        if old == _FLAG:
+            self._flag_total -= 1
+            for n in adjacent:
+                self._flags[n] -= 1
+        elif state == _FLAG:
+            self._flag_total += 1
+            for n in adjacent:
+                self._flags[n] += 1
+
+    # places a temporary flag during an analysis without changing the covered counts
+    def _place_flag(self, index: int):
+        self._state[index] = _FLAG
+        self._flag_total += 1
+        for n in self._neighbours[index]:
+            self._flags[n] += 1
+
+    # removes a temporary flag placed by self._place_flag
+    def _remove_flag(self, index: int):
+        self._state[index] = _COVERED
+        self._flag_total -= 1
+        for n in self._neighbours[index]:
+            self._flags[n] -= 1
+
     # update the local state of the tile at the specified position
     @_consistent_game_check
     def _update_tile(self, g: game.Game, x: int, y: int):
-        if g.get_tile_state(x, y) is tile.State.covered:
-            self._grid[x][y].state = tile.State.covered
-        elif g.get_tile_state(x, y) is tile.State.flag:
-            self._grid[x][y].state = tile.State.flag
-
-            # remove this tile from adjacent covered lists
-            for element in self._grid[x][y].adjacent:
-                i, j = element
-
-                try:
-                    self._grid[i][j].covered.remove((x, y))
-                except ValueError:
-                    pass
-        elif g.get_tile_state(x, y) is tile.State.visible:
-            self._grid[x][y].state = tile.State.visible
-            self._grid[x][y].set_value(g.get_tile_value(x, y))
-
-            self._grid[x][y].flags = 0
-            # remove this tile from adjacent covered lists
-            for element in self._grid[x][y].adjacent:
-                i, j = element
-
-                if self._grid[i][j].state is tile.State.flag:
-                    self._grid[x][y].flags += 1
-
-                try:
-                    self._grid[i][j].covered.remove((x, y))
-                except ValueError:
-                    pass
-        elif g.get_tile_state(x, y) is tile.State.unknown:
-            g.right_mouse_button(x, y)
-            self._grid[x][y].state = tile.State.covered
+        index = x * self._size + y
+        state = g.get_state_view()[index]
+
+        if state == _UNKNOWN:
+            if not self._observed:
+                g.right_mouse_button(x, y)
+            state = _COVERED
+        elif state == _VISIBLE:
+            self._value[index] = g.get_value_view()[index]
+            if self._value[index] == tile.MINE:
+                # a visible mine is a known mine, so it is counted like a flag around it
+                state = _FLAG
+
+        self._set_state(index, state)
 
     # update all of the local tiles
     @_consistent_game_check
     def _update_grid(self, g: game.Game):
-        for x in range(self._size):
-            for y in range(self._size):
-                self._update_tile(g, x, y)
-        # update the surrounding flags
-        for x in range(self._size):
-            for y in range(self._size):
-                if g.get_tile_state(x, y) is tile.State.visible:
-                    self._grid[x][y].flags = 0
-                    for element in self._grid[x][y].adjacent:
-                        i, j = element
-                        if self._grid[i][j].state is tile.State.flag:
-                            self._grid[x][y].flags += 1
+        states = g.get_state_view()
+        if states == self._state:
+            return
+
+        values = g.get_value_view()
+        for index in range(len(states)):
+            state = states[index]
+            if state == self._state[index]:
+                continue
+
+            if state == _UNKNOWN:
+                # tiles marked unknown are covered to the solver. they are cycled back on a game
+                if not self._observed:
+                    g.right_mouse_button(*divmod(index, self._size))
+                state = _COVERED
+            elif state == _VISIBLE:
+                self._value[index] = values[index]
+                if values[index] == tile.MINE:
+                    # a visible mine is a known mine, so it is counted like a flag around it
+                    state = _FLAG
+
+            self._set_state(index, state)
 
     # do a single logical placement of a flag or uncovering a valid covered tile
     # the search starts from the hint starting position
@@ -380,24 +809,21 @@ self.solve(self, g:game.Game):
     def _do_logic_placement(self, g: game.Game, hint: (int, int), return_tile=False):
 
         self._reset_visited()
-        wavefront = collections.deque([hint])
+        start = hint[0] * self._size + hint[1]
+        wavefront = collections.deque([start])
+        self._visited[start] = True
+        self._visited_tiles.append(start)
 
         while len(wavefront) > 0:
-            x, y = wavefront.popleft()
-
-            if self._grid[x][y].state is tile.State.visible and not self._grid[x][y].is_satisfied():
-
-                # scan the surrounding tiles
-                flags = 0
+            index = wavefront.popleft()
 
-                for element in self._grid[x][y].adjacent:
-                    i, j = element
-                    if self._grid[i][j].state is tile.State.flag:
-                        flags += 1
+            if self._state[index] == _VISIBLE and not self._is_satisfied(index):
+                flags = self._flags[index]
+                value = self._value[index]
 
                 # first check if there are enough flags to satisfy the tile value
-                if flags == self._grid[x][y].get_value() and len(self._grid[x][y].covered) > 0:
-                    i, j = self._grid[x][y].covered[0]
+                if flags == value and self._covered[index] > 0:
+                    i, j = divmod(self._covered_tiles(index)[0], self._size)
                     if not return_tile:
                         g.left_mouse_button(i, j)
                     else:
@@ -405,14 +831,15 @@ self.solve(self, g:game.Game):
                     self._update_tile(g, i, j)
 
                     # if a blank was hit update the whole board
-                    if self._grid[i][j].is_blank():
+                    index = i * self._size + j
+                    if self._state[index] == _VISIBLE and self._value[index] == tile.BLANK:
                         self._update_grid(g)
 
                     return True
 
                 # next check if the number of covered spaces + number of flags is equal to the tile value
-                elif flags + len(self._grid[x][y].covered) == self._grid[x][y].get_value():
-                    i, j = self._grid[x][y].covered[0]
+                elif flags + self._covered[index] == value:
+                    i, j = divmod(self._covered_tiles(index)[0], self._size)
                     if not return_tile:
                         g.right_mouse_button(i, j)
                     else:
@@ -421,13 +848,11 @@ self.solve(self, g:game.Game):
 
                     return True
 
-            for i in range(x - 1, x + 2):
-                for j in range(y - 1, y + 2):
-                    if 0 <= i < self._size and 0 <= j < self._size:
-                        if not self._grid[i][j].visited:
-                            wavefront.append((i, j))
-                            self._visited_tiles.append((i, j))
-                            self._grid[i][j].visited = True
+            for n in self._neighbours[index]:
+                if not self._visited[n]:
+                    wavefront.append(n)
+                    self._visited_tiles.append(n)
+                    self._visited[n] = True
         if not return_tile:
             return False
         else:
@@ -435,9 +860,8 @@ self.solve(self, g:game.Game):
 
     # reset the visited tiles list
     def _reset_visited(self):
-        for element in self._visited_tiles:
-            x, y = element
-            self._grid[x][y].visited = False
+        for index in self._visited_tiles:
+            self._visited[index] = False
 
         self._visited_tiles.clear()
 
@@ -450,58 +874,52 @@ self.solve(self, g:game.Game):
             self._update_grid(g)
 
         self._reset_visited()
-        wavefront = collections.deque([hint])
-        self._grid[hint[0]][hint[1]].visited = True
+        start = hint[0] * self._size + hint[1]
+        wavefront = collections.deque([start])
+        self._visited[start] = True
+        self._visited_tiles.append(start)
 
         did_action = False
 
         while len(wavefront) > 0:
-            x, y = wavefront.popleft()
-
-            if self._grid[x][y].state is tile.State.visible and not self._grid[x][y].is_satisfied():
+            index = wavefront.popleft()
 
-                # scan the surrounding tiles
-                flags = 0
-
-                for element in self._grid[x][y].adjacent:
-                    i, j = element
-                    if self._grid[i][j].state is tile.State.flag:
-                        flags += 1
+            if self._state[index] == _VISIBLE and not self._is_satisfied(index):
+                flags = self._flags[index]
+                value = self._value[index]
 
                 # first check if there are enough flags to satisfy the tile value
-                if flags == self._grid[x][y].get_value() and len(self._grid[x][y].covered) > 0:
+                if flags == value and self._covered[index] > 0:
                     did_action = True
-                    for element in self._grid[x][y].covered:
-                        i, j = element
+                    for element in self._covered_tiles(index):
+                        i, j = divmod(element, self._size)
                         g.left_mouse_button(i, j)
 
-                    for element in self._grid[x][y].adjacent:
-                        i, j = element
+                    for element in self._neighbours[index]:
+                        i, j = divmod(element, self._size)
                         self._update_tile(g, i, j)
 
                         # if a blank was hit update the whole board
-                        if self._grid[i][j].is_blank():
+                        if self._state[element] == _VISIBLE and self._value[element] == tile.BLANK:
                             self._update_grid(g)
                             break
 
                 # next check if the number of covered spaces + number of flags is equal to the tile value
-                elif flags + len(self._grid[x][y].covered) == self._grid[x][y].get_value():
+                elif flags + self._covered[index] == value:
                     did_action = True
-                    for element in self._grid[x][y].covered:
-                        i, j = element
+                    for element in self._covered_tiles(index):
+                        i, j = divmod(element, self._size)
                         g.right_mouse_button(i, j)
 
-                    for element in self._grid[x][y].adjacent:
-                        i, j = element
+                    for element in self._neighbours[index]:
+                        i, j = divmod(element, self._size)
                         self._update_tile(g, i, j)
 
-            for i in range(x - 1, x + 2):
-                for j in range(y - 1, y + 2):
-                    if 0 <= i < self._size and 0 <= j < self._size:
-                        if not self._grid[i][j].visited:
-                            wavefront.append((i, j))
-                            self._visited_tiles.append((i, j))
-                            self._grid[i][j].visited = True
+            for n in self._neighbours[index]:
+                if not self._visited[n]:
+                    wavefront.append(n)
+                    self._visited_tiles.append(n)
+                    self._visited[n] = True
 
         return did_action
 
@@ -515,40 +933,163 @@ self.solve(self, g:game.Game):
 
         did_action = False
 
-        for x in range(self._size):
-            for y in range(self._size):
-                if self._grid[x][y].state is tile.State.visible and not self._grid[x][y].is_satisfied():
-
-                    # scan the surrounding tiles
-                    flags = 0
-
-                    for element in self._grid[x][y].adjacent:
-                        i, j = element
-                        if self._grid[i][j].state is tile.State.flag:
-                            flags += 1
-
-                    # first check if there are enough flags to satisfy the tile value
-                    if flags == self._grid[x][y].get_value() and len(self._grid[x][y].covered) > 0:
-                        did_action = True
-                        for element in self._grid[x][y].covered:
-                            i, j = element
-                            g.left_mouse_button(i, j)
-                            self._update_tile(g, i, j)
-
-                            # if a blank was hit update the whole board
-                            if self._grid[i][j].is_blank():
-                                self._update_grid(g)
-
-                    # next check if the number of covered spaces + number of flags is equal to the tile value
-                    elif flags + len(self._grid[x][y].covered) == self._grid[x][y].get_value():
-                        did_action = True
-                        for element in self._grid[x][y].covered:
-                            i, j = element
-                            g.right_mouse_button(i, j)
-                            self._update_tile(g, i, j)
+        for index in range(len(self._state)):
+            if self._state[index] == _VISIBLE and not self._is_satisfied(index):
+                flags = self._flags[index]
+                value = self._value[index]
+
+                # first check if there are enough flags to satisfy the tile value
+                if flags == value and self._covered[index] > 0:
+                    did_action = True
+                    for element in self._covered_tiles(index):
+                        i, j = divmod(element, self._size)
+                        g.left_mouse_button(i, j)
+                        self._update_tile(g, i, j)
+
+                        # if a blank was hit update the whole board
+                        if self._state[element] == _VISIBLE and self._value[element] == tile.BLANK:
+                            self._update_grid(g)
+
+                # next check if the number of covered spaces + number of flags is equal to the tile value
+                elif flags + self._covered[index] == value:
+                    did_action = True
+                    for element in self._covered_tiles(index):
+                        i, j = divmod(element, self._size)
+                        g.right_mouse_button(i, j)
+                        self._update_tile(g, i, j)
 
         return did_action
 
+    # applies the two logic rules to every tile of the local grid at once
+    # the board is packed into integers with a byte per tile so that the neighbour counts of
+    # every tile are computed by 8 shifted additions and the rules by bitwise operations
+    # returns the sorted indices of the covered tiles that are certainly safe and certainly mines
+    def _trivial_deductions(self) -> ([int], [int]):
+        size = self._size
+        width, offsets, bias, full = _packed_layout(size)
+
+        values = self._value.tobytes()
+        covered = _pack(self._state.translate(_IS_COVERED), size)
+        flags = _pack(self._state.translate(_IS_FLAG), size)
+        numbers = _pack(self._state.translate(_IS_VISIBLE), size) & _pack(values.translate(_IS_NUMBER), size)
+        values = _pack(values.translate(_NUMBER_VALUE), size)
+
+        flag_count = _neighbour_sum(flags, offsets, full)
+        covered_count = _neighbour_sum(covered, offsets, full)
+
+        # numbers with covered tiles around them that meet each rule
+        candidates = numbers & _translate(covered_count, _IS_NONZERO, size)
+        open_rest = candidates & _translate(values + bias - flag_count, _IS_BIAS, size)
+        flag_rest = candidates & _translate(values + bias - flag_count - covered_count, _IS_BIAS, size)
+
+        # covered tiles next to a number that meets each rule
+        safe_tiles = covered & _translate(_neighbour_sum(open_rest, offsets, full), _IS_NONZERO, size)
+        mine_tiles = covered & _translate(_neighbour_sum(flag_rest, offsets, full), _IS_NONZERO, size)
+
+        # a tile can only be in both on a board with misplaced flags. leave it to the other stages
+        conflicts = safe_tiles & mine_tiles
+        safe_tiles ^= conflicts
+        mine_tiles ^= conflicts
+
+        length = width * width
+        results: ([int], [int]) = ([], [])
+        for packed, result in ((safe_tiles, results[0]), (mine_tiles, results[1])):
+            tiles = packed.to_bytes(length, 'little')
+            position = tiles.find(1)
+            while position != -1:
+                x, y = divmod(position, width)
+                result.append((x - 1) * size + y - 1)
+                position = tiles.find(1, position + 1)
+
+        return results
+
+    # applies the two logic rules to the whole local grid in a single pass
+    # reveals and flags every tile that they prove in one batch of moves
+    # returns true if it made a change to the grid tiles
+    @_consistent_game_check
+    def _do_logic_batch(self, g: game.Game) -> bool:
+        safe, mines = self._trivial_deductions()
+
+        if len(safe) == 0 and len(mines) == 0:
+            return False
+
+        moves = [divmod(index, self._size) + (True,) for index in safe]
+        moves += [divmod(index, self._size) + (False,) for index in mines]
+        g.apply_moves(moves)
+
+        self._update_grid(g)
+        return True
+
+    # encodes the window of the local grid centred on the given tile for the pattern table
+    def _pattern_window(self, x: int, y: int) -> str:
+        half = patterns.WINDOW // 2
+        window: [str] = []
+
+        for i in range(x - half, x + half + 1):
+            for j in range(y - half, y + half + 1):
+                if not (0 <= i < self._size and 0 <= j < self._size):
+                    window.append(patterns.BLOCKED)
+                    continue
+
+                state = self._state[i * self._size + j]
+                if state == _FLAG:
+                    window.append(patterns.FLAG)
+                elif state == _VISIBLE:
+                    if abs(i - x) < half and abs(j - y) < half:
+                        window.append(str(self._value[i * self._size + j]))
+                    else:
+                        window.append(patterns.BLOCKED)
+                else:
+                    window.append(patterns.COVERED)
+
+        return ''.join(window)
+
+    # look up the window around every visible, non-satisfied tile in the pattern table
+    # returns the forced moves keyed by tile position, true for mines
+    # stops at the first forced move if first_only = True
+    def _pattern_moves(self, first_only=False) -> {(int, int): bool}:
+        half = patterns.WINDOW // 2
+
+        moves: {(int, int): bool} = {}
+
+        for index in range(len(self._state)):
+            if self._state[index] != _VISIBLE or self._is_satisfied(index):
+                continue
+
+            x, y = divmod(index, self._size)
+            for window_index, is_mine in self.pattern_table.lookup(self._pattern_window(x, y)):
+                i = x - half + window_index // patterns.WINDOW
+                j = y - half + window_index % patterns.WINDOW
+
+                moves[(i, j)] = is_mine
+                if first_only:
+                    return moves
+
+        return moves
+
+    # flags or reveals every tile that a pattern in the pattern table forces
+    # returns true if it made a change to the grid tiles
+    # if return_tile = True, returns coordinates and bool representing left or right click
+    @_consistent_game_check
+    def _do_pattern_wave(self, g: game.Game, return_tile=False):
+        moves = self._pattern_moves(first_only=return_tile)
+
+        if return_tile:
+            for position, is_mine in moves.items():
+                return position[0], position[1], not is_mine
+            return -1, -1, True
+
+        for position, is_mine in moves.items():
+            i, j = position
+            if is_mine:
+                g.right_mouse_button(i, j)
+            else:
+                g.left_mouse_button(i, j)
+
+        if len(moves) > 0:
+            self._update_grid(g)
+        return len(moves) > 0
+
     # do a single placement of a flag or reveal of a covered tile using probability
     # takes a hint of where to start the search
     # returns true if it was able to make a change to the board
@@ -556,21 +1097,22 @@ self.solve(self, g:game.Game):
     def _do_prob_placement(self, g: game.Game, hint: (int, int)) -> bool:
         self._update_grid(g)
         self._reset_visited()
-        wavefront = collections.deque([hint])
+        start = hint[0] * self._size + hint[1]
+        wavefront = collections.deque([start])
+        self._visited[start] = True
+        self._visited_tiles.append(start)
 
         while len(wavefront) > 0:
-            x, y = wavefront.popleft()
+            index = wavefront.popleft()
 
-            if self._grid[x][y].state is tile.State.visible and not self._grid[x][y].is_satisfied():
-                return self._prob_placement_helper(g, x, y)
+            if self._state[index] == _VISIBLE and not self._is_satisfied(index):
+                return self._prob_placement_helper(g, *divmod(index, self._size))
 
-            for i in range(x - 1, x + 2):
-                for j in range(y - 1, y + 2):
-                    if 0 <= i < self._size and 0 <= j < self._size:
-                        if not self._grid[i][j].visited:
-                            wavefront.append((i, j))
-                            self._visited_tiles.append((i, j))
-                            self._grid[i][j].visited = True
+            for n in self._neighbours[index]:
+                if not self._visited[n]:
+                    wavefront.append(n)
+                    self._visited_tiles.append(n)
+                    self._visited[n] = True
 
         return False
 
@@ -579,21 +1121,18 @@ self.solve(self, g:game.Game):
     @_consistent_game_check
     def _prob_placement_helper(self, g: game.Game, x_root: int, y_root: int) -> bool:
         # generate the main block of this analysis
-        main_block: _Block = self._gen_block_at_tile((x_root, y_root))
+        main_block: _Block = self._gen_block_at_tile(x_root * self._size + y_root)
 
         # find all non_satisfied, visible tiles that interact with this block. these will the roots for blocks
         all_blocks: [_Block] = [main_block]
         for covered_tile in main_block.tiles:
-            x, y = covered_tile
-            for adjacent_tile in self._grid[x][y].adjacent:
-                i, j = adjacent_tile
-
-                if self._grid[i][j].state is tile.State.visible and not self._grid[i][j].is_satisfied():
+            for adjacent_tile in self._neighbours[covered_tile]:
+                if self._state[adjacent_tile] == _VISIBLE and not self._is_satisfied(adjacent_tile):
                     all_blocks.append(self._gen_block_at_tile(adjacent_tile))
 
         # list of all tiles in these blocks
         # this list should not be modified after initialization
-        all_tiles: [(int, int)] = []
+        all_tiles: [int] = []
         for block in all_blocks:
             for working_tile in block.tiles:
                 if working_tile not in all_tiles:
@@ -612,30 +1151,30 @@ self.solve(self, g:game.Game):
             current: _Block = all_blocks[index]
 
             # return if this block cannot be satisfied
-            if current.mines < 0:
-                return
-            if current.mines > len(current.tiles):
+            if current.mines < 0 or current.mines > len(current.tiles):
+                if self._stats is not None:
+                    self._stats.arrangements_pruned += 1
                 return
 
             possibilities = collections.deque(_permute(current.mines, len(current.tiles)))
+            if self._stats is not None:
+                self._stats.arrangements_enumerated += len(possibilities)
 
             for arrangement in possibilities:
                 # set flags
                 for i in range(len(current.tiles)):
                     if arrangement[i]:
-                        x, y = current.tiles[i]
-                        self._grid[x][y].state = tile.State.flag
+                        self._state[current.tiles[i]] = _FLAG
 
                 # update blocks
                 for i in range(len(current.tiles)):
-                    x, y = current.tiles[i]
                     if arrangement[i]:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].mines -= 1
                                 all_blocks[block_id].tiles.remove(current.tiles[i])
                     else:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].tiles.remove(current.tiles[i])
 
@@ -644,50 +1183,37 @@ self.solve(self, g:game.Game):
                     permute_blocks(index + 1)
                 else:
                     # scan all tiles and generate a solution
-                    solution: bool = []
-                    for item in all_tiles:
-                        x, y = item
-                        if self._grid[x][y].state is tile.State.flag:
-                            solution.append(True)
-                        else:
-                            solution.append(False)
-                    solutions.append(solution)
+                    solutions.append([self._state[item] == _FLAG for item in all_tiles])
 
                 # reset changed blocks
                 for i in range(len(current.tiles)):
-                    x, y = current.tiles[i]
                     if arrangement[i]:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].mines += 1
                                 all_blocks[block_id].tiles.append(current.tiles[i])
                     else:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].tiles.append(current.tiles[i])
 
                 # remove placed flags
                 for i in range(len(current.tiles)):
                     if arrangement[i]:
-                        x, y = current.tiles[i]
-                        self._grid[x][y].state = tile.State.covered
+                        self._state[current.tiles[i]] = _COVERED
 
         permute_blocks(0)
 
         # check solutions against the entire grid, saving the data from the valid ones
         # the data vector stores the number of solutions in which any given tile is a mine
-        data: [int] = []
+        data: [int] = [0] * len(all_tiles)
         num_valid_soln: int = 0
-        for _ in range(len(all_tiles)):
-            # initialization of data list
-            data.append(0)
         for arrangement in solutions:
 
             # place flags at true markers
             for item in range(len(arrangement)):
                 if arrangement[item]:
-                    i, j = all_tiles[item]
-                    self._grid[i][j].state = tile.State.flag
+                    self._place_flag(all_tiles[item])
 
             # check that no tiles on the grid are over-burdened with flags
             valid = self._lt_valid_grid(g)
@@ -701,8 +1227,11 @@ self.solve(self, g:game.Game):
             # reset placed flags
             for item in range(len(arrangement)):
                 if arrangement[item]:
-                    i, j = all_tiles[item]
-                    self._grid[i][j].state = tile.State.covered
+                    self._remove_flag(all_tiles[item])
+
+        if self._stats is not None:
+            self._stats.solutions_accepted += num_valid_soln
+            self._stats.arrangements_pruned += len(solutions) - num_valid_soln
 
         if num_valid_soln == 0:
             self._clean_blocks(all_blocks)
@@ -714,12 +1243,12 @@ self.solve(self, g:game.Game):
             if data[item] == num_valid_soln:
                 # flag tiles that are always mines
                 did_action = True
-                i, j = all_tiles[item]
+                i, j = divmod(all_tiles[item], self._size)
                 g.right_mouse_button(i, j)
             elif data[item] == 0:
                 # click tiles that are never mines
                 did_action = True
-                i, j = all_tiles[item]
+                i, j = divmod(all_tiles[item], self._size)
                 g.left_mouse_button(i, j)
 
         self._clean_blocks(all_blocks)
@@ -737,19 +1266,17 @@ self.solve(self, g:game.Game):
 
         # list of all tiles in these blocks
         # this list should not be modified after initialization
-        all_tiles: [(int, int)] = []
-
-        for x in range(self._size):
-            for y in range(self._size):
-                if self._grid[x][y].state is tile.State.visible and not self._grid[x][y].is_satisfied():
-                    all_blocks.append(self._gen_block_at_tile((x, y)))
-                elif self._grid[x][y].state is tile.State.covered:
-                    # add this covered tile to all_tiles if there are viable tiles beside it
-                    for adjacent_tile in self._grid[x][y].adjacent:
-                        i, j = adjacent_tile
-                        if self._grid[i][j].state is tile.State.visible and not self._grid[i][j].is_satisfied():
-                            all_tiles.append((x, y))
-                            break
+        all_tiles: [int] = []
+
+        for index in range(len(self._state)):
+            if self._state[index] == _VISIBLE and not self._is_satisfied(index):
+                all_blocks.append(self._gen_block_at_tile(index))
+            elif self._state[index] == _COVERED:
+                # add this covered tile to all_tiles if there are viable tiles beside it
+                for adjacent_tile in self._neighbours[index]:
+                    if self._state[adjacent_tile] == _VISIBLE and not self._is_satisfied(adjacent_tile):
+                        all_tiles.append(index)
+                        break
 
         # return if there are no blocks that can be generated
         if len(all_blocks) == 0:
@@ -757,8 +1284,11 @@ self.solve(self, g:game.Game):
                 return [[], []]
             return False
 
-        # total flags on the grid during permutation
-        total_flags: int = g.get_flags()
+        # total flags and visible mines on the grid during permutation
+        total_flags: int = self._flag_total
+
+        # tiles holding a mine in the arrangement being built
+        placed = bytearray(len(self._state))
 
         # iterate to generate every possible placement of mines
         solutions = collections.deque([])
@@ -774,31 +1304,31 @@ self.solve(self, g:game.Game):
             current: _Block = all_blocks[index]
 
             # return if this block cannot be satisfied
-            if current.mines < 0:
-                return
-            if current.mines > len(current.tiles):
+            if current.mines < 0 or current.mines > len(current.tiles):
+                if self._stats is not None:
+                    self._stats.arrangements_pruned += 1
                 return
 
             possibilities = collections.deque(_permute(current.mines, len(current.tiles)))
+            if self._stats is not None:
+                self._stats.arrangements_enumerated += len(possibilities)
 
             for arrangement in possibilities:
                 # set flags
                 for i in range(len(current.tiles)):
                     if arrangement[i]:
-                        x, y = current.tiles[i]
-                        self._grid[x][y].state = tile.State.flag
+                        placed[current.tiles[i]] = True
                         total_flags += 1
 
                 # update blocks
                 for i in range(len(current.tiles)):
-                    x, y = current.tiles[i]
                     if arrangement[i]:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].mines -= 1
                                 all_blocks[block_id].tiles.remove(current.tiles[i])
                     else:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].tiles.remove(current.tiles[i])
 
@@ -807,33 +1337,26 @@ self.solve(self, g:game.Game):
                     permute_blocks(index + 1)
                 elif total_flags <= self._mines:
                     # scan all tiles and generate a solution
-                    solution: [bool] = []
-                    for item in all_tiles:
-                        x, y = item
-                        if self._grid[x][y].state is tile.State.flag:
-                            solution.append(True)
-                        else:
-                            solution.append(False)
-                    solutions.append(solution)
+                    solutions.append([placed[item] == 1 for item in all_tiles])
+                elif self._stats is not None:
+                    self._stats.arrangements_pruned += 1
 
                 # reset changed blocks
                 for i in range(len(current.tiles)):
-                    x, y = current.tiles[i]
                     if arrangement[i]:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].mines += 1
                                 all_blocks[block_id].tiles.append(current.tiles[i])
                     else:
-                        for block_id in self._grid[x][y].parent_ids:
+                        for block_id in self._parent_ids[current.tiles[i]]:
                             if block_id != current.id:
                                 all_blocks[block_id].tiles.append(current.tiles[i])
 
                 # remove placed flags
                 for i in range(len(current.tiles)):
                     if arrangement[i]:
-                        x, y = current.tiles[i]
-                        self._grid[x][y].state = tile.State.covered
+                        placed[current.tiles[i]] = False
                         total_flags -= 1
 
         permute_blocks(0)
@@ -842,16 +1365,16 @@ self.solve(self, g:game.Game):
         self._clean_blocks(all_blocks)
 
         num_valid_soln: int = len(solutions)
+        if self._stats is not None:
+            self._stats.solutions_accepted += num_valid_soln
+
         if num_valid_soln == 0:
             if return_data:
                 return [[], []]
             return False
 
         # the data vector stores the number of solutions in which any given tile is a mine
-        data: [int] = []
-        for _ in range(len(all_tiles)):
-            # initialization of data list
-            data.append(0)
+        data: [int] = [0] * len(all_tiles)
 
         for arrangement in solutions:
             for item in range(len(all_tiles)):
@@ -860,7 +1383,7 @@ self.solve(self, g:game.Game):
 
         if return_data:
             # convert data to percent probability
-            result_data = [all_tiles]
+            result_data = [[divmod(item, self._size) for item in all_tiles]]
             percentages: [float] = []
             for item in range(len(data)):
                 percentages.append(data[item] / num_valid_soln * 100)
@@ -874,12 +1397,12 @@ self.solve(self, g:game.Game):
             if data[item] == num_valid_soln:
                 # flag tiles that are always mines
                 did_action = True
-                i, j = all_tiles[item]
+                i, j = divmod(all_tiles[item], self._size)
                 g.right_mouse_button(i, j)
             elif data[item] == 0:
                 # click tiles that are never mines
                 did_action = True
-                i, j = all_tiles[item]
+                i, j = divmod(all_tiles[item], self._size)
                 g.left_mouse_button(i, j)
 
         if did_action:
@@ -887,20 +1410,22 @@ self.solve(self, g:game.Game):
         return did_action
 
     # generates a block at a given visible, non-satisfied tile
-    def _gen_block_at_tile(self, tile_position: (int, int)) -> _Block:
-        x, y = tile_position
-        if self._grid[x][y].state is not tile.State.visible or self._grid[x][y].is_satisfied():
-            raise BlockGenerationError("Given tile is not a valid candidate to generate a block", tile_position)
+    # visible mines are known to the solver as flags, so a block never has a mine as its centre
+    def _gen_block_at_tile(self, index: int) -> _Block:
+        if self._state[index] != _VISIBLE or self._value[index] < 0 or self._is_satisfied(index):
+            raise BlockGenerationError("Given tile is not a valid candidate to generate a block",
+                                       divmod(index, self._size))
 
         # number of mines in this block
-        mines: int = self._grid[x][y].get_value() - self._grid[x][y].flags
+        mines: int = self._value[index] - self._flags[index]
 
-        new_block: _Block = _Block(mines, deepcopy(self._grid[x][y].covered))
+        new_block: _Block = _Block(mines, self._covered_tiles(index))
+        if self._stats is not None:
+            self._stats.blocks_generated += 1
 
         # update the child tiles
-        for element in self._grid[x][y].covered:
-            i, j = element
-            self._grid[i][j].parent_ids.append(new_block.id)
+        for element in new_block.tiles:
+            self._parent_ids.setdefault(element, []).append(new_block.id)
 
         return new_block
 
@@ -908,59 +1433,171 @@ self.solve(self, g:game.Game):
     def _clean_blocks(self, blocks: [_Block]):
         _Block.num_ids = 0
 
-        for block in blocks:
-            for item in block.tiles:
-                x, y = item
-                self._grid[x][y].parent_ids.clear()
+        self._parent_ids.clear()
 
     # returns true if the tile has a valid number of flags around it
-    def _valid_tile(self, x: int, y: int) -> bool:
-        value = self._grid[x][y].get_value()
-
-        for item in self._grid[x][y].adjacent:
-            i, j = item
-            if self._grid[i][j].state is tile.State.flag:
-                value -= 1
-
-        return value == 0
+    def _valid_tile(self, index: int) -> bool:
+        return self._value[index] == self._flags[index]
 
     # returns true if all visible tiles are valid and the max flags are placed exactly
     @_consistent_game_check
     def _valid_grid(self, g: game.Game) -> bool:
-        flags: int = 0
+        for index in range(len(self._state)):
+            if self._state[index] == _VISIBLE and not self._valid_tile(index):
+                return False
 
-        for x in range(self._size):
-            for y in range(self._size):
-                if self._grid[x][y].state is tile.State.flag:
-                    flags += 1
-                elif self._grid[x][y].state is tile.State.visible and not self._valid_tile(x, y):
-                    return False
-
-        return flags == g.get_mines()
+        return self._flag_total == g.get_mines()
 
     # returns true if no tiles are invalid
     def _lt_valid_grid(self, g: game.Game) -> bool:
-        flags: int = 0
+        for index in range(len(self._state)):
+            if self._state[index] == _VISIBLE and self._flags[index] > self._value[index]:
+                return False
+
+        return self._flag_total <= g.get_mines()
+
+
+# pattern table of a batch process. loaded once and shared by every board the process handles
+_batch_patterns: patterns.PatternTable = None
+
+
+# loads the pattern table of a batch process
+def _init_batch(pattern_path: str):
+    global _batch_patterns
+    _batch_patterns = patterns.PatternTable.load(pattern_path)
 
-        for x in range(self._size):
-            for y in range(self._size):
-                if self._grid[x][y].state is tile.State.flag:
-                    flags += 1
-                elif self._grid[x][y].state is tile.State.visible:
-                    value = self._grid[x][y].get_value()
 
-                    for item in self._grid[x][y].adjacent:
-                        i, j = item
-                        if self._grid[i][j].state is tile.State.flag:
-                            value -= 1
+# returns the game described by a board of the batch input with the moves it lists already played
+# a board holds a size and either a number of mines with an optional seed or a layout of mine positions
+def _batch_game(board: dict) -> game.Game:
+    g = game.Game()
+    g.set_size(board["size"])
+    if "layout" in board:
+        g.set_layout([tuple(position) for position in board["layout"]])
+    else:
+        g.set_mines(board["mines"])
+        g.set_seed(board.get("seed"))
+    g.begin()
+
+    for x, y, left in board.get("moves", []):
+        if left:
+            g.left_mouse_button(x, y)
+        else:
+            g.right_mouse_button(x, y)
 
-                    if value < 0:
-                        return False
+    return g
 
-        return flags <= g.get_mines()
+
+# plays the game to the end, making every proven move and the best guess when nothing is proven
+# returns the result of the board without its id
+def _batch_solve(g: game.Game, analysis: Solver) -> dict:
+    moves: [Move] = []
+    guesses = 0
+    while not g.game_done():
+        batch = analysis.next_moves(g)
+        if len(batch) == 0:
+            break
+        if batch[0].certainty < 100:
+            guesses += 1
+
+        for move in batch:
+            if g.game_done():
+                break
+
+            # skip moves that earlier moves already made
+            if g.get_tile_state(move.x, move.y) is not tile.State.covered:
+                continue
+
+            if move.left:
+                g.left_mouse_button(move.x, move.y)
+            else:
+                g.right_mouse_button(move.x, move.y)
+            moves.append(move)
+
+    return {"won": g.victory(), "guesses": guesses, "moves": [list(move) for move in moves]}
+
+
+# analyses the board without changing it
+# returns the moves the solver would make with their certainty and the chance (%) that each frontier tile is a mine
+def _batch_analyse(g: game.Game, analysis: Solver) -> dict:
+    moves = list(analysis.certain_moves(g))
+
+    # the probabilities are only found again if an earlier stage ended the stream
+    probabilities = analysis._probabilities
+    if probabilities is None:
+        probabilities = analysis._do_prob_wave(g, return_data=True)
+    positions, percentages = probabilities
+
+    return {"stage": analysis.last_stage, "moves": [list(move) for move in moves],
+            "probabilities": [[x, y, percentage] for (x, y), percentage in zip(positions, percentages)]}
+
+
+# solves or analyses a numbered line of the batch input
+# returns the json line of its result. boards that cannot be read give a line with an error instead
+def _batch_line(task: (int, str, str)) -> str:
+    number, line, mode = task
+
+    board = None
+    try:
+        board = json.loads(line)
+        start = time.perf_counter()
+
+        # boards given as rows are observations without a game behind them, so they can only be analysed
+        if "rows" in board:
+            g = observation.Observation.from_rows(board["rows"], board["mines"])
+            mode = board.get("mode", "analyse")
+            if mode == "solve":
+                raise ValueError("Boards given as rows can only be analysed")
+        else:
+            g = _batch_game(board)
+            mode = board.get("mode", mode)
+        analysis = Solver(g, _batch_patterns)
+
+        if mode == "solve":
+            result = _batch_solve(g, analysis)
+        elif mode == "analyse":
+            result = _batch_analyse(g, analysis)
+        else:
+            raise ValueError("Unknown mode " + str(mode))
+
+        result = {"id": board.get("id", number), "mode": mode, **result, "seconds": time.perf_counter() - start}
+    except (game.Error, ValueError, KeyError, TypeError) as err:
+        board_id = board.get("id", number) if isinstance(board, dict) else number
+        result = {"id": board_id, "error": type(err).__name__ + ": " + str(err)}
+
+    return json.dumps(result)
+
+
+# reads boards as json lines from the given files, or stdin if there are none, and prints a json line for each
+# results are printed in the order of the input as soon as they are ready
+def _run_batch(paths: [str], mode: str, workers: int):
+    lines = fileinput.input(paths)
+    tasks = ((number, line, mode) for number, line in enumerate(lines, 1) if line.strip())
+
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_batch, initargs=(patterns.DEFAULT_PATH,)) as pool:
+            for result in pool.imap(_batch_line, tasks):
+                print(result, flush=True)
+    else:
+        _init_batch(patterns.DEFAULT_PATH)
+        for task in tasks:
+            print(_batch_line(task), flush=True)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play mines with the help of the solver, or run it on many boards")
+    parser.add_argument("--batch", nargs="*", metavar="FILE",
+                        help="read boards as json lines from the files, or stdin if none are given, and print "
+                             "a json line of results for each instead of playing")
+    parser.add_argument("--mode", choices=("solve", "analyse"), default="solve",
+                        help="solve each batch board to the end or only analyse it. a board can set its own mode")
+    parser.add_argument("--workers", type=int, default=1, help="processes that handle batch boards")
+    args = parser.parse_args()
+
+    if args.batch is not None:
+        _run_batch(args.batch, args.mode, args.workers)
+        sys.exit()
+
     g = game.Game()
 
     print("Welcome to mines! Created by mattlourenco27 on github")
@@ -997,7 +1634,8 @@ if __name__ == "__main__":
     print("Type 'best' to have the solver use probability to determine what the next best step is")
     print("Type 'Solve' to have the solver complete the game to the best of its abilities")
 
-    solver = Solver(g)
+    pattern_table = patterns.PatternTable.load()
+    solver = Solver(g, pattern_table)
 
     while not g.game_done():
         # print the grid
@@ -1015,6 +1653,8 @@ if __name__ == "__main__":
 
                 if values[0].capitalize() == 'Q':
                     print("Exiting...")
+                    if pattern_table.dirty:
+                        pattern_table.save()
                     quit()
 
                 elif values[0].upper() == 'SOLVE':
@@ -1069,3 +1709,6 @@ if __name__ == "__main__":
 
     # final print of the grid
     g.print()
+
+    if pattern_table.dirty:
+        pattern_table.save()
@@ -0,0 +1,376 @@
+# Created on 18 Oct 2026
+# This file streams the changes of a game of mines to spectators
+
+"""
+Streams a game of mines to any number of spectators as compact deltas with occasional keyframes
+
+A Feed compares the board of a game to the board it last published and publishes only the tiles that
+changed, so the bytes sent grow with the changes instead of the size of the board. Every few messages it
+publishes a keyframe with the whole board instead. A Channel hands the messages of a feed to every
+Subscription in order. Subscribers that join late, or fall too far behind, are given the latest keyframe and
+the deltas after it. A Spectator rebuilds the board exactly from the messages.
+
+Message format (little endian):
+    * keyframe: 'K', version u32, size u8, mines u16, flags u16, status u8, then the state code and the signed
+      value of every tile indexed as x * size + y
+    * delta: 'D', version u32, flags u16, status u8, count u16, then count entries of tile index u16,
+      state code u8 and signed value i8
+
+Status is 0 while the game is going on, 1 after a victory and 2 after a loss.
+
+Public objects:
+    * Class spectate.Feed
+    * Class spectate.Channel
+    * Class spectate.Subscription
+    * Class spectate.Spectator
+
+Exceptions:
+    * spectate.FeedError
+"""
+
+import array
+import collections
+import struct
+import threading
+import game
+import observation
+
+_KEYFRAME_HEADER = struct.Struct("<cIBHHB")
+_DELTA_HEADER = struct.Struct("<cIHBH")
+_CHANGE = struct.Struct("<HBb")
+
+_ONGOING = 0
+_VICTORY = 1
+_LOSS = 2
+
+
+class FeedError(game.Error):
+    """
+Raised when a message of a feed cannot be read
+
+Attributes:
+    message -- explanation of the error
+    """
+    def __init__(self, message):
+        self.message = message
+
+
+# returns the status code of a game
+def _status(g: game.Game) -> int:
+    if g.victory():
+        return _VICTORY
+    if g.game_done():
+        return _LOSS
+    return _ONGOING
+
+
+class Subscription:
+    """
+This class receives the messages of a channel in order
+
+# returns the next message, waiting up to timeout seconds for one. returns None if none arrived
+# None waits for as long as it takes
+self.get(self, timeout: float = None) -> bytes:
+
+# returns every message that has arrived without waiting
+self.drain(self) -> [bytes]:
+
+# number of times this subscription fell behind and was given a keyframe instead of its backlog
+self.resyncs: int
+    """
+
+    def __init__(self, backlog: int):
+        self._backlog = backlog
+        self._messages = collections.deque()
+        self._ready = threading.Condition()
+
+        # number of times this subscription fell behind and was given a keyframe instead of its backlog
+        self.resyncs: int = 0
+
+    # returns the next message, waiting up to timeout seconds for one. returns None if none arrived
+    def get(self, timeout: float = None) -> bytes:
+        with self._ready:
+            if not self._ready.wait_for(lambda: len(self._messages) > 0, timeout):
+                return None
+            return self._messages.popleft()
+
+    # returns every message that has arrived without waiting
+    def drain(self) -> [bytes]:
+        with self._ready:
+            messages = list(self._messages)
+            self._messages.clear()
+            return messages
+
+    # adds a message, or replaces the backlog with the catch up messages if the backlog is full
+    def _put(self, message: bytes, catch_up: [bytes]):
+        with self._ready:
+            if len(self._messages) >= self._backlog:
+                self._messages.clear()
+                self._messages.extend(catch_up)
+                self.resyncs += 1
+            else:
+                self._messages.append(message)
+            self._ready.notify()
+
+    # adds the catch up messages of a late subscriber
+    def _start(self, catch_up: [bytes]):
+        with self._ready:
+            self._messages.extend(catch_up)
+            self._ready.notify()
+
+
+class Channel:
+    """
+This class hands published messages to every subscription. it can be shared between threads
+
+# returns a new subscription that starts from the latest keyframe
+# a subscription with more than backlog messages waiting is given the latest keyframe and the deltas after it instead
+self.subscribe(self, backlog: int = 256) -> Subscription:
+
+# stops handing messages to a subscription
+self.unsubscribe(self, subscription: Subscription):
+
+# hands a message to every subscription
+self.publish(self, message: bytes):
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: [Subscription] = []
+
+        # latest keyframe and the deltas published after it
+        self._catch_up: [bytes] = []
+
+    # returns a new subscription that starts from the latest keyframe
+    def subscribe(self, backlog: int = 256) -> Subscription:
+        subscription = Subscription(backlog)
+        with self._lock:
+            subscription._start(self._catch_up)
+            self._subscriptions.append(subscription)
+
+        return subscription
+
+    # stops handing messages to a subscription
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    # hands a message to every subscription
+    def publish(self, message: bytes):
+        with self._lock:
+            if message[:1] == b'K':
+                self._catch_up = [message]
+            elif len(self._catch_up) > 0:
+                self._catch_up.append(message)
+
+            for subscription in self._subscriptions:
+                subscription._put(message, self._catch_up)
+
+
+class Feed:
+    """
+This class publishes the changes of a game as messages
+
+constructor parameters -> g: game.Game, channel: Channel = None, keyframe_interval: int = 64
+
+# publishes the tiles that changed since the last message, or a keyframe every keyframe_interval messages
+# returns the message, or None if nothing changed
+self.publish(self) -> bytes:
+
+# returns a keyframe of the board as it is now without publishing it
+self.keyframe(self) -> bytes:
+
+# number of messages published
+self.version: int
+    """
+
+    def __init__(self, g: game.Game, channel: Channel = None, keyframe_interval: int = 64):
+        self.game = g
+        self.channel = channel
+        self.keyframe_interval = keyframe_interval
+
+        # number of messages published
+        self.version: int = 0
+
+        # board, flags and status as they were last published
+        self._states: bytes = None
+        self._values: bytes = None
+        self._flags: int = 0
+        self._status: int = _ONGOING
+
+    # publishes the tiles that changed since the last message, or a keyframe every keyframe_interval messages
+    # returns the message, or None if nothing changed
+    def publish(self) -> bytes:
+        g = self.game
+        states = g.get_state_view()
+        values = g.get_value_view().cast('B')
+        flags = g.get_flags()
+        status = _status(g)
+
+        # a new board size starts over with a keyframe
+        resized = self._states is None or len(self._states) != len(states)
+        if not resized and states == self._states and values == self._values \
+                and flags == self._flags and status == self._status:
+            return None
+
+        self.version += 1
+        if resized or self.version % self.keyframe_interval == 0:
+            message = self.keyframe()
+        else:
+            changed = [index for index in range(len(states))
+                       if states[index] != self._states[index] or values[index] != self._values[index]]
+
+            signed = g.get_value_view()
+            parts = [_DELTA_HEADER.pack(b'D', self.version, flags, status, len(changed))]
+            parts += [_CHANGE.pack(index, states[index], signed[index]) for index in changed]
+            message = b''.join(parts)
+
+        self._states = states.tobytes()
+        self._values = values.tobytes()
+        self._flags = flags
+        self._status = status
+
+        if self.channel is not None:
+            self.channel.publish(message)
+        return message
+
+    # returns a keyframe of the board as it is now without publishing it
+    def keyframe(self) -> bytes:
+        g = self.game
+        return (_KEYFRAME_HEADER.pack(b'K', self.version, g.get_size(), g.get_mines(), g.get_flags(), _status(g))
+                + g.get_state_view().tobytes() + g.get_value_view().tobytes())
+
+
+class Spectator:
+    """
+This class rebuilds a board from the messages of a feed
+
+# applies a message. deltas are ignored until the first keyframe and after a missed message
+# returns true if the board is in sync with the feed
+self.apply(self, message: bytes) -> bool:
+
+# returns an observation of the rebuilt board
+self.observation(self) -> observation.Observation:
+
+# true while the board matches the feed
+self.in_sync: bool
+
+# version, size, mines, flags and status ('ongoing', 'victory' or 'loss') of the rebuilt board
+self.version: int
+self.size: int
+self.mines: int
+self.flags: int
+self.status: str
+    """
+
+    def __init__(self):
+        self.in_sync: bool = False
+        self.version: int = 0
+        self.size: int = 0
+        self.mines: int = 0
+        self.flags: int = 0
+        self.status: str = "ongoing"
+
+        # state code and signed value of every tile
+        self._states = bytearray()
+        self._values = array.array('b')
+
+    # applies a message. deltas are ignored until the first keyframe and after a missed message
+    # returns true if the board is in sync with the feed
+    def apply(self, message: bytes) -> bool:
+        kind = message[:1]
+        if kind == b'K':
+            _, self.version, self.size, self.mines, self.flags, status = _KEYFRAME_HEADER.unpack_from(message)
+
+            tiles = self.size * self.size
+            body = message[_KEYFRAME_HEADER.size:]
+            if len(body) != 2 * tiles:
+                raise FeedError("Keyframe of a board of size " + str(self.size) + " has the wrong length")
+
+            self._states = bytearray(body[:tiles])
+            self._values = array.array('b', body[tiles:])
+            self.status = ("ongoing", "victory", "loss")[status]
+            self.in_sync = True
+            return True
+
+        if kind != b'D':
+            raise FeedError("Unknown message " + repr(kind))
+
+        _, version, flags, status, count = _DELTA_HEADER.unpack_from(message)
+        if not self.in_sync or version != self.version + 1:
+            # a message was missed. wait for the next keyframe
+            self.in_sync = False
+            return False
+
+        if len(message) != _DELTA_HEADER.size + count * _CHANGE.size:
+            raise FeedError("Delta with " + str(count) + " changes has the wrong length")
+
+        for index, state, value in _CHANGE.iter_unpack(message[_DELTA_HEADER.size:]):
+            self._states[index] = state
+            self._values[index] = value
+
+        self.version = version
+        self.flags = flags
+        self.status = ("ongoing", "victory", "loss")[status]
+        return True
+
+    # returns an observation of the rebuilt board
+    def observation(self) -> observation.Observation:
+        return observation.Observation(self.size, self.mines, self._states, self._values.tobytes())
+
+
+if __name__ == "__main__":
+    import argparse
+    import solver
+
+    parser = argparse.ArgumentParser(description="Stream a solver game to spectators and check what they rebuild")
+    parser.add_argument("--size", type=int, default=30, help="size of the board")
+    parser.add_argument("--mines", type=int, default=150, help="mines on the board")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the game")
+    parser.add_argument("--spectators", type=int, default=8, help="spectators watching the game")
+    args = parser.parse_args()
+
+    g = game.Game()
+    g.set_size(args.size)
+    g.set_mines(args.mines)
+    g.set_seed(args.seed)
+    g.begin()
+
+    channel = Channel()
+    feed = Feed(g, channel)
+    feed.publish()
+
+    watchers = [(Spectator(), channel.subscribe()) for _ in range(args.spectators)]
+
+    analysis = solver.Solver(g)
+    sent = 0
+    messages = 0
+    while not g.game_done():
+        moves = analysis.next_moves(g)
+        if len(moves) == 0:
+            break
+
+        for move in moves:
+            if g.game_done():
+                break
+            if move.left:
+                g.left_mouse_button(move.x, move.y)
+            else:
+                g.right_mouse_button(move.x, move.y)
+
+            message = feed.publish()
+            if message is not None:
+                sent += len(message)
+                messages += 1
+
+    expected = observation.Observation.of(g).to_rows()
+    matched = 0
+    for spectator, subscription in watchers:
+        for message in subscription.drain():
+            spectator.apply(message)
+        matched += spectator.in_sync and spectator.observation().to_rows() == expected
+
+    print(str(messages) + " messages, " + str(sent) + " bytes, " + str(round(sent / max(1, messages), 1))
+          + " bytes per message. a keyframe is " + str(len(feed.keyframe())) + " bytes")
+    print(str(matched) + " of " + str(len(watchers)) + " spectators rebuilt the board exactly")
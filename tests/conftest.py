@@ -0,0 +1,7 @@
+# Created on 18 Oct 2026
+# This file lets the tests import the modules at the root of the repository
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,338 @@
+# Created on 18 Oct 2026
+# This file tests the requests of the game server without opening a socket
+
+import asyncio
+import multiprocessing
+import pytest
+import server
+import solver
+
+
+@pytest.fixture
+def host():
+    s = server.Server(solver_workers=1)
+    yield s
+    s.close()
+
+
+# returns the reply of a server to each request, made in order on one event loop
+def _requests(s: server.Server, *requests) -> [dict]:
+    async def handle_all():
+        return [await s.handle(request) for request in requests]
+
+    return asyncio.run(handle_all())
+
+
+# returns the reply of a server to one request
+def _request(s: server.Server, request) -> dict:
+    return _requests(s, request)[0]
+
+
+# returns the id of a new seeded session on a board of the given size
+def _create(s: server.Server, size: int = 8, mines: int = 10, seed: int = 1) -> str:
+    reply = _request(s, {"op": "create", "size": size, "mines": mines, "seed": seed})
+    assert reply["ok"], reply
+    return reply["session"]
+
+
+# returns the rows of a session
+def _rows(s: server.Server, session: str) -> [str]:
+    return _request(s, {"op": "state", "session": session})["rows"]
+
+
+# returns [x, y, tile] of every tile that differs between two sets of rows in the order a move result lists them
+def _row_changes(before: [str], after: [str]) -> [[int, int, str]]:
+    size = len(before)
+    return [[x, y, after[y][x]] for x in range(size) for y in range(size) if before[y][x] != after[y][x]]
+
+
+# returns the positions of the mines of a session, read from its game
+def _mines(s: server.Server, session: str) -> {(int, int)}:
+    g = s._sessions[session].game
+    size = g.get_size()
+    return {(x, y) for x in range(size) for y in range(size) if g._grid[x][y].is_mine()}
+
+
+def test_create(host):
+    reply = _request(host, {"op": "create", "size": 9, "mines": 10, "seed": 3, "id": 7})
+
+    assert reply["ok"] and reply["id"] == 7
+    assert (reply["size"], reply["mines"]) == (9, 10) and reply["bytes"] > 0
+
+    state = _request(host, {"op": "state", "session": reply["session"]})
+    assert state["version"] == 0 and state["status"] == "ongoing" and state["flags"] == 0
+    assert state["rows"] == ["#" * 9] * 9
+
+
+def test_seeded_sessions_match(host):
+    first, second = _create(host, seed=5), _create(host, seed=5)
+    assert first != second
+
+    replies = _requests(host, {"op": "click", "session": first, "x": 4, "y": 4},
+                        {"op": "click", "session": second, "x": 4, "y": 4})
+    assert replies[0]["changes"] == replies[1]["changes"]
+
+
+def test_click(host):
+    session = _create(host)
+    before = _rows(host, session)
+    reply = _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+
+    assert reply["ok"] and reply["version"] == 1 and reply["status"] == "ongoing"
+    assert reply["changes"] == _row_changes(before, _rows(host, session))
+    assert [4, 4] in [change[:2] for change in reply["changes"]]
+
+    # clicking a visible tile changes nothing and keeps the version
+    again = _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    assert again["version"] == 1 and again["changes"] == []
+
+
+def test_click_mine_loses(host):
+    session = _create(host)
+    _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    x, y = min(_mines(host, session))
+
+    reply = _request(host, {"op": "click", "session": session, "x": x, "y": y})
+    assert reply["status"] == "loss" and [x, y, "*"] in reply["changes"]
+
+
+def test_flag_cycles(host):
+    session = _create(host)
+    _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    x, y = min(_mines(host, session))
+
+    replies = _requests(host, *[{"op": "flag", "session": session, "x": x, "y": y}] * 3)
+    assert [reply["changes"] for reply in replies] == [[[x, y, "F"]], [[x, y, "?"]], [[x, y, "#"]]]
+    assert [reply["flags"] for reply in replies] == [1, 0, 0]
+    assert [reply["version"] for reply in replies] == [2, 3, 4]
+
+
+def test_chord(host):
+    session = _create(host)
+    _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    mines = _mines(host, session)
+    rows = _rows(host, session)
+
+    def around(x, y):
+        return [(i, j) for i in range(x - 1, x + 2) for j in range(y - 1, y + 2)
+                if 0 <= i < 8 and 0 <= j < 8 and (i, j) != (x, y)]
+
+    # a number with a covered tile around it that is not a mine
+    x, y = next((x, y) for x in range(8) for y in range(8) if rows[y][x] in "12345678"
+                and any(rows[j][i] == "#" and (i, j) not in mines for i, j in around(x, y)))
+
+    # a number without its flags is not chorded
+    unflagged = _request(host, {"op": "chord", "session": session, "x": x, "y": y})
+    assert unflagged["ok"] and unflagged["changes"] == [] and unflagged["version"] == 1
+
+    for i, j in around(x, y):
+        if (i, j) in mines:
+            _request(host, {"op": "flag", "session": session, "x": i, "y": j})
+
+    before = _rows(host, session)
+    version = _request(host, {"op": "state", "session": session})["version"]
+    reply = _request(host, {"op": "chord", "session": session, "x": x, "y": y})
+
+    assert reply["version"] == version + 1 and reply["status"] != "loss"
+    assert reply["changes"] == _row_changes(before, _rows(host, session))
+    after = _rows(host, session)
+    assert all(after[j][i] not in "#?" for i, j in around(x, y) if (i, j) not in mines)
+
+
+def test_delta(host):
+    session = _create(host)
+    start = _rows(host, session)
+    assert _request(host, {"op": "delta", "session": session})["changes"] == []
+
+    click = _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    x, y = min(_mines(host, session))
+    flag = _request(host, {"op": "flag", "session": session, "x": x, "y": y})
+
+    since_start = _request(host, {"op": "delta", "session": session, "since": 0})
+    assert since_start["version"] == 2 and since_start["flags"] == 1
+    assert since_start["changes"] == _row_changes(start, _rows(host, session))
+
+    assert _request(host, {"op": "delta", "session": session, "since": 1})["changes"] == flag["changes"]
+    assert _request(host, {"op": "delta", "session": session, "since": 2})["changes"] == []
+
+    # a tile changed twice is listed once with its latest tile
+    _request(host, {"op": "flag", "session": session, "x": x, "y": y})
+    since_click = _request(host, {"op": "delta", "session": session, "since": click["version"]})
+    assert since_click["changes"] == [[x, y, "?"]]
+
+
+def test_hint(host):
+    session = _create(host)
+    _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    rows = _rows(host, session)
+
+    reply = _request(host, {"op": "hint", "session": session, "id": "h"})
+    assert reply["ok"] and reply["id"] == "h" and reply["version"] == 1
+    assert rows[reply["y"]][reply["x"]] == "#"
+    assert isinstance(reply["left"], bool) and isinstance(reply["stage"], str)
+
+    # a proven hint never clicks a mine or flags a safe tile
+    if reply["stage"] == "logic":
+        assert ((reply["x"], reply["y"]) in _mines(host, session)) != reply["left"]
+
+
+def test_hint_after_game_over(host):
+    session = _create(host)
+    _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    x, y = min(_mines(host, session))
+    _request(host, {"op": "click", "session": session, "x": x, "y": y})
+
+    reply = _request(host, {"op": "hint", "session": session})
+    assert not reply["ok"] and reply["error"] == "RequestError: The game is over"
+
+
+def test_close_and_stats(host):
+    first, second = _create(host), _create(host, size=16, mines=40)
+    stats = _request(host, {"op": "stats"})
+    assert (stats["sessions"], stats["created"], stats["evicted"]) == (2, 2, 0)
+    assert stats["bytes"] == host._sessions[first].bytes + host._sessions[second].bytes
+
+    assert _request(host, {"op": "close", "session": first}) == {"ok": True}
+    stats = _request(host, {"op": "stats"})
+    assert stats["sessions"] == 1 and stats["bytes"] == host._sessions[second].bytes
+
+    reply = _request(host, {"op": "click", "session": first, "x": 0, "y": 0})
+    assert reply == {"ok": False, "error": "RequestError: Unknown session " + repr(first)}
+
+
+def test_hint_with_broken_processes(host):
+    session = _create(host)
+    _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+    assert _request(host, {"op": "hint", "session": session})["ok"]
+
+    for process in list(host._executor._processes.values()):
+        process.kill()
+        process.join()
+
+    reply = _request(host, {"op": "hint", "session": session, "id": 5})
+    assert reply["id"] == 5 and not reply["ok"]
+    assert reply["error"].startswith("RequestError: The solver failed. BrokenProcessPool: ")
+
+    # the next hint starts new processes
+    assert _request(host, {"op": "hint", "session": session})["ok"]
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="the hint processes only see the failing solver when they are forked")
+def test_hint_that_raises(host, monkeypatch):
+    def fail(self, g):
+        raise RuntimeError("no hint")
+
+    monkeypatch.setattr(solver.Solver, "best_click", fail)
+    session = _create(host)
+    _request(host, {"op": "click", "session": session, "x": 4, "y": 4})
+
+    reply = _request(host, {"op": "hint", "session": session})
+    assert reply == {"ok": False, "error": "RequestError: The solver failed. RuntimeError: no hint"}
+    assert _request(host, {"op": "state", "session": session})["ok"]
+
+
+def test_close_cancels_pending_hints(host):
+    session = _create(host, size=25, mines=99)
+    _request(host, {"op": "click", "session": session, "x": 12, "y": 12})
+
+    async def hint_then_close():
+        hints = [asyncio.ensure_future(host.handle({"op": "hint", "session": session})) for _ in range(8)]
+        await asyncio.sleep(0)
+        assert len(host._hints) == 8
+
+        host.close()
+        return await asyncio.gather(*hints, return_exceptions=True)
+
+    replies = asyncio.run(hint_then_close())
+    assert host._hints == set() and host._executor is None
+    assert all(isinstance(reply, asyncio.CancelledError) or reply["ok"] for reply in replies)
+    assert any(isinstance(reply, asyncio.CancelledError) for reply in replies)
+
+    # the next hint starts the processes again
+    assert _request(host, {"op": "hint", "session": session})["ok"]
+
+
+def test_evict_idle():
+    s = server.Server(idle_timeout=60)
+    try:
+        idle, busy = _create(s), _create(s)
+        kept_bytes = s._sessions[busy].bytes
+        s._sessions[idle].last_used -= 120
+
+        assert s.evict_idle() == 1
+        assert s.evict_idle() == 0
+
+        stats = _request(s, {"op": "stats"})
+        assert (stats["sessions"], stats["evicted"], stats["bytes"]) == (1, 1, kept_bytes)
+        assert not _request(s, {"op": "state", "session": idle})["ok"]
+
+        # a request keeps a session from being evicted
+        s._sessions[busy].last_used -= 120
+        _request(s, {"op": "state", "session": busy})
+        assert s.evict_idle() == 0
+    finally:
+        s.close()
+
+
+def test_memory_limit():
+    session_bytes = server.Server()._measure(8)
+    s = server.Server(max_memory=session_bytes * 2)
+    try:
+        first, second = _create(s), _create(s)
+        full = _request(s, {"op": "create", "size": 8, "mines": 10})
+        assert full == {"ok": False, "error": "RequestError: The server is full"}
+        assert _request(s, {"op": "stats"})["sessions"] == 2
+
+        # a larger board does not fit either, and closing a session makes room again
+        assert not _request(s, {"op": "create", "size": 9, "mines": 10})["ok"]
+        _request(s, {"op": "close", "session": first})
+        assert _request(s, {"op": "create", "size": 8, "mines": 10})["ok"]
+        assert _request(s, {"op": "stats"})["bytes"] == session_bytes * 2
+    finally:
+        s.close()
+
+
+@pytest.mark.parametrize("request_, error", [
+    ({"op": "create", "size": 4, "mines": 1}, "SizeError: "),
+    ({"op": "create", "size": 8, "mines": 0}, "MineError: "),
+    ({"op": "create", "size": 8, "mines": 64}, "MineError: "),
+    ({"op": "create", "size": "eight", "mines": 10}, "ValueError: "),
+    ({"op": "create", "size": 8}, "Missing field 'mines'"),
+    ({"op": "launch"}, "RequestError: Unknown op 'launch'"),
+    ({"size": 8}, "RequestError: Unknown op None"),
+    ([{"op": "stats"}], "RequestError: A request must be a json object"),
+    ("stats", "RequestError: A request must be a json object"),
+])
+def test_bad_requests(host, request_, error):
+    reply = _request(host, request_)
+    assert not reply["ok"] and reply["error"].startswith(error)
+    assert _request(host, {"op": "stats"})["sessions"] == 0
+
+
+@pytest.mark.parametrize("move", [
+    {"op": "click", "x": 8, "y": 0},
+    {"op": "click", "x": 0, "y": -1},
+    {"op": "flag", "x": 3, "y": 8},
+    {"op": "chord", "x": -1, "y": 3},
+])
+def test_move_out_of_range(host, move):
+    session = _create(host)
+    reply = _request(host, {**move, "session": session})
+
+    assert not reply["ok"] and reply["error"].startswith("TilePositionError: ")
+    assert _request(host, {"op": "state", "session": session})["version"] == 0
+
+
+@pytest.mark.parametrize("since, error", [("last", "ValueError: "), (None, "TypeError: "), ([1], "TypeError: ")])
+def test_delta_bad_since(host, since, error):
+    session = _create(host)
+    reply = _request(host, {"op": "delta", "session": session, "since": since})
+    assert not reply["ok"] and reply["error"].startswith(error)
+
+
+def test_request_id_is_kept_on_errors(host):
+    assert _request(host, {"op": "click", "session": "none", "x": 0, "y": 0, "id": 12}) == {
+        "id": 12, "ok": False, "error": "RequestError: Unknown session 'none'"}
+    assert _request(host, {"op": "click", "x": 0, "y": 0, "id": 13}) == {
+        "id": 13, "ok": False, "error": "Missing field 'session'"}
@@ -0,0 +1,251 @@
+# Created on 18 Oct 2026
+# This file tests the solver's flat board state, its neighbour tables and the games it plays
+
+import random
+import pytest
+import bench
+import game
+import observation
+import solver
+import tile
+
+_COVERED = tile.State.covered.value
+_FLAG = tile.State.flag.value
+_VISIBLE = tile.State.visible.value
+
+# seeds that the solver loses, total moves and total guesses of seeds 0 to games - 1 of each configuration
+# played the way Solver.solve does with bench.play
+_OUTCOMES = [
+    # size, mines, games, lost seeds, moves, guesses
+    (8, 10, 30, [0, 2, 5, 8, 14], 322, 39),
+    (16, 40, 60, [3, 6, 15, 17, 18, 19, 24, 25, 28, 43, 44, 59], 1255, 77),
+    (25, 99, 15, [5, 6, 12], 571, 20),
+]
+
+
+# returns the indices of the tiles around a tile found from its coordinates
+def _adjacent(index: int, size: int) -> {int}:
+    x, y = divmod(index, size)
+    return {i * size + j
+            for i in range(x - 1, x + 2) for j in range(y - 1, y + 2)
+            if 0 <= i < size and 0 <= j < size and (i, j) != (x, y)}
+
+
+# returns a solver of a new game of the given size
+def _new_solver(size: int) -> solver.Solver:
+    g = game.Game()
+    g.set_size(size)
+    g.set_mines(10)
+    return solver.Solver(g)
+
+
+# checks the flag and covered counts, covered masks and flag total of a solver against its state
+def _check_bookkeeping(analysis: solver.Solver):
+    size = analysis._size
+    for index in range(size * size):
+        adjacent = analysis._neighbours[index]
+        assert analysis._flags[index] == sum(analysis._state[n] == _FLAG for n in adjacent)
+        assert analysis._covered[index] == sum(analysis._state[n] == _COVERED for n in adjacent)
+
+        mask = sum(1 << k for k in range(len(adjacent)) if analysis._state[adjacent[k]] == _COVERED)
+        assert analysis._covered_mask[index] == mask
+        assert analysis._covered_tiles(index) == [n for n in adjacent if analysis._state[n] == _COVERED]
+
+    assert analysis._flag_total == analysis._state.count(_FLAG)
+
+
+@pytest.mark.parametrize("size", [8, 13, 50])
+def test_neighbour_table_matches_coordinates(size):
+    neighbours, back_bits = solver._neighbour_table(size)
+
+    assert len(neighbours) == size * size
+    for index in range(size * size):
+        assert set(neighbours[index]) == _adjacent(index, size)
+        assert list(neighbours[index]) == sorted(neighbours[index])
+
+        for k, n in enumerate(neighbours[index]):
+            assert back_bits[index][k] == 1 << neighbours[n].index(index)
+
+    last = size - 1
+    assert [len(neighbours[x * size + y]) for x, y in ((0, 0), (0, last), (last, 0), (last, last))] == [3] * 4
+    assert len(neighbours[1]) == 5 and len(neighbours[size + 1]) == 8
+
+
+def test_neighbour_table_is_shared():
+    assert solver._neighbour_table(16) is solver._neighbour_table(16)
+    assert _new_solver(16)._neighbours is _new_solver(16)._neighbours
+
+
+def test_new_solver_bookkeeping():
+    _check_bookkeeping(_new_solver(8))
+
+
+@pytest.mark.parametrize("size", [8, 11])
+def test_set_state_bookkeeping(size):
+    analysis = _new_solver(size)
+    rng = random.Random(size)
+
+    for _ in range(2000):
+        index = rng.randrange(size * size)
+        analysis._set_state(index, rng.choice((_COVERED, _FLAG, _VISIBLE)))
+
+    _check_bookkeeping(analysis)
+
+
+def test_set_state_changes_neighbours_only():
+    analysis = _new_solver(8)
+
+    analysis._set_state(0, _FLAG)
+    assert analysis._flag_total == 1
+    assert [analysis._flags[n] for n in (1, 8, 9)] == [1, 1, 1]
+    assert analysis._flags[0] == 0 and analysis._flags[2] == 0
+    assert analysis._covered[9] == 7
+
+    # a flag that becomes visible no longer counts as a flag or as covered
+    analysis._set_state(0, _VISIBLE)
+    assert analysis._flag_total == 0
+    assert analysis._flags[9] == 0 and analysis._covered[9] == 7
+
+    # setting the same state twice changes nothing
+    analysis._set_state(0, _VISIBLE)
+    assert analysis._covered[9] == 7
+
+    analysis._set_state(0, _COVERED)
+    assert analysis._covered[9] == 8
+    _check_bookkeeping(analysis)
+
+
+def test_update_grid_bookkeeping():
+    g = game.Game()
+    g.set_size(16)
+    g.set_mines(40)
+    g.set_seed(7)
+    g.begin()
+    analysis = solver.Solver(g)
+
+    while not g.game_done():
+        moves = analysis.next_moves(g)
+        g.apply_moves([(move.x, move.y, move.left) for move in moves])
+        analysis._update_grid(g)
+        _check_bookkeeping(analysis)
+
+
+# applies the two logic rules to every visible number one tile at a time
+# returns the covered tiles proven safe and proven mines, leaving out tiles that both rules claim
+def _reference_deductions(analysis: solver.Solver) -> ([int], [int]):
+    size = analysis._size
+    safe = set()
+    mines = set()
+    for index in range(size * size):
+        value = analysis._value[index]
+        if analysis._state[index] != _VISIBLE or not 0 <= value <= 8:
+            continue
+
+        adjacent = _adjacent(index, size)
+        covered = {n for n in adjacent if analysis._state[n] == _COVERED}
+        flags = sum(analysis._state[n] == _FLAG for n in adjacent)
+        if len(covered) == 0:
+            continue
+
+        if value == flags:
+            safe |= covered
+        if value - flags == len(covered):
+            mines |= covered
+
+    both = safe & mines
+    return sorted(safe - both), sorted(mines - both)
+
+
+# returns the rows of a seeded game after a few solver steps with flags placed by a player
+# some of the flags are misplaced and some of the solver's flags are taken away again
+def _played_rows(size: int, mines: int, seed: int) -> [str]:
+    rng = random.Random(seed)
+    g = game.Game()
+    g.set_size(size)
+    g.set_mines(mines)
+    g.set_seed(seed)
+    g.begin()
+
+    analysis = solver.Solver(g)
+    for _ in range(rng.randrange(1, 8)):
+        if g.game_done():
+            break
+        moves = analysis.next_moves(g)
+        g.apply_moves([(move.x, move.y, move.left) for move in moves])
+
+    rows = [list(row) for row in observation.Observation.of(g).to_rows()]
+    for _ in range(rng.randrange(0, size)):
+        x, y = rng.randrange(size), rng.randrange(size)
+        if rows[y][x] == '#':
+            rows[y][x] = 'F'
+        elif rows[y][x] == 'F':
+            rows[y][x] = '#'
+
+    return [''.join(row) for row in rows]
+
+
+@pytest.mark.parametrize("size, mines", [(8, 10), (9, 20), (16, 40), (30, 150)])
+def test_trivial_deductions_match_reference(size, mines):
+    for seed in range(75):
+        rows = _played_rows(size, mines, seed)
+        board = observation.Observation.from_rows(rows, mines)
+        analysis = solver.Solver(board)
+
+        assert analysis._trivial_deductions() == _reference_deductions(analysis), rows
+
+
+def test_trivial_deductions_edges_and_corners():
+    rows = ["1F1..1#F",
+            "#11..111",
+            "........",
+            "........",
+            "........",
+            "........",
+            "......11",
+            "......1#"]
+    board = observation.Observation.from_rows(rows, 2)
+    analysis = solver.Solver(board)
+    safe, mines = analysis._trivial_deductions()
+
+    # the corner 1 and the 1 beside it already have their flag, so the tile on the left edge is safe
+    assert safe == [0 * 8 + 1]
+    # the three 1s around the bottom right corner each have only the corner left
+    assert mines == [7 * 8 + 7]
+    # the flag in the top right corner is misplaced, so the 1s disagree about the tile beside it
+    assert 6 * 8 + 0 not in safe + mines
+    assert (safe, mines) == _reference_deductions(analysis)
+
+
+def test_stage_calls_count_passes():
+    g = game.Game()
+    g.set_size(16)
+    g.set_mines(40)
+    g.set_seed(7)
+    g.begin()
+    analysis = solver.Solver(g)
+    analysis.enable_stats()
+    g.left_mouse_button(8, 8)
+
+    batches = 0
+    logic_batch = analysis._do_logic_batch
+
+    def counted_batch(board):
+        nonlocal batches
+        batches += 1
+        return logic_batch(board)
+
+    analysis._do_logic_batch = counted_batch
+    while not g.game_done() and analysis.solve_next_step(g):
+        pass
+
+    # one logic pass for every logic batch, even though the batch finds its moves with _trivial_deductions
+    assert analysis.stats()["calls"]["logic"] == batches > 1
+
+
+@pytest.mark.parametrize("size, mines, games, lost, moves, guesses", _OUTCOMES)
+def test_seeded_outcomes(size, mines, games, lost, moves, guesses):
+    results = [bench.play(size, mines, seed) for seed in range(games)]
+
+    assert [seed for seed in range(games) if not results[seed]["won"]] == lost
+    assert sum(result["moves"] for result in results) == moves
+    assert sum(result["guesses"] for result in results) == guesses